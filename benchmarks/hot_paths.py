@@ -0,0 +1,346 @@
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+"""
+Times the viewer's import, load, zoom and compositing paths on a synthetic
+dataset, e.g.
+
+    python benchmarks/hot_paths.py --rows 2000 --repeat 5
+    python benchmarks/hot_paths.py --baseline benchmarks/results/<old>.json
+
+Each case is run once untimed under tracemalloc to record its peak Python and
+numpy allocations (pixmaps allocated by Qt aren't traced), then --repeat times
+for timing. The first timed run is reported separately as it is the only one
+that doesn't hit caches. Results are saved as json in benchmarks/results so
+runs can be compared with --baseline.
+"""
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+RESULTS_DIR = Path(__file__).resolve().parent.joinpath("results")
+
+sys.path.insert(0, str(REPO_DIR))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QCoreApplication, QEvent  # noqa: E402
+from PySide6.QtWidgets import QApplication  # noqa: E402
+
+from benchmarks.synthetic import generate_dataset  # noqa: E402
+
+# the panels import the hsu_viewer package, which imports the dashboard, so
+# it must be loaded before the components
+from hsu_viewer.hsu_config import HSUConfig  # noqa: E402
+from components.dashboard import (  # noqa: E402
+    MAX_RESOLUTION,
+    MIN_RESOLUTION,
+    create_data_panel,
+)
+from components.meter import Meter  # noqa: E402
+from components.mineral_legend import MineralLegend  # noqa: E402
+from data.dataset import Dataset  # noqa: E402
+
+# resolutions panels are loaded at and zoomed to (px/m)
+LOAD_RESOLUTION = MIN_RESOLUTION
+ZOOM_RESOLUTION = MAX_RESOLUTION
+
+# height of the meter's display area (px)
+METER_VIEW_HEIGHT = 750
+
+
+def max_rss_mb() -> float | None:
+    """Returns the peak resident memory of the process so far in MB."""
+    if resource is None:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # bytes on macOS, kilobytes elsewhere
+    if sys.platform == "darwin":
+        return max_rss / 2**20
+    return max_rss / 2**10
+
+
+def flush_deletes() -> None:
+    """Deletes widgets scheduled with deleteLater outside an event loop."""
+    QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+
+
+def measure(name: str, fn, repeat: int, setup=None) -> dict:
+    """Times a benchmark case and records its peak memory.
+
+    Args:
+        name(str): The name of the case.
+        fn(function): Runs the case once. Called with the value returned by
+            setup.
+        repeat(int): The number of timed runs.
+        setup(None/function): Called before each run, untimed.
+    """
+    gc.collect()
+    tracemalloc.start()
+    fn(setup() if setup else None)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    flush_deletes()
+
+    timings = []
+    for _ in range(repeat):
+        arg = setup() if setup else None
+        gc.collect()
+        start = time.perf_counter()
+        fn(arg)
+        timings.append(time.perf_counter() - start)
+        flush_deletes()
+
+    result = {
+        "name": name,
+        "repeat": repeat,
+        "first_s": timings[0],
+        "median_s": statistics.median(timings),
+        "min_s": min(timings),
+        "peak_traced_mb": peak / 2**20,
+        "max_rss_mb": max_rss_mb(),
+    }
+    print(
+        f"{name:<40} median {result['median_s'] * 1000:9.1f} ms"
+        f"  peak {result['peak_traced_mb']:8.1f} MB"
+    )
+    return result
+
+
+def panel_specs(names: dict) -> list:
+    """Returns (label, data type, subtype, name) of each panel benchmarked.
+
+    Args:
+        names(dict): The names of the synthetic dataset's data.
+    """
+    minerals = names["minerals"]
+    return [
+        ("mineral image", "Spectral Images", "Mineral", minerals[0]),
+        ("core box image", "Corebox Images", "Box", "Box"),
+        (
+            "composite image",
+            "Spectral Images",
+            "Composite Images",
+            minerals,
+        ),
+        ("mineral plot", "Spectral Data", "Mineral Percent", minerals[0]),
+        ("composite plot", "Spectral Data", "Composite Plot", minerals),
+        (
+            "geochemistry plot",
+            "Additional Data",
+            "Geochemistry",
+            names["elements"][0],
+        ),
+    ]
+
+
+def run_benchmarks(dataset_dir: Path, names: dict, repeat: int) -> list:
+    """Runs every benchmark case on a synthetic dataset.
+
+    Args:
+        dataset_dir(Path): The synthetic dataset.
+        names(dict): The names of the dataset's data.
+        repeat(int): The number of timed runs of each case.
+    """
+    results = []
+    config_path = dataset_dir.parent.joinpath("hsu_datasets.cfg")
+    geochem_path = dataset_dir.joinpath(f"{names['name']}_Geochemistry.xlsx")
+
+    def import_config() -> HSUConfig:
+        config_path.unlink(missing_ok=True)
+        hsu_config = HSUConfig(config_path)
+        hsu_config.add_geochem(geochem_path.as_posix())
+        return hsu_config
+
+    results.append(
+        measure(
+            "HSUConfig.add_dataset",
+            lambda hsu_config: hsu_config.add_dataset(dataset_dir),
+            repeat,
+            setup=import_config,
+        )
+    )
+
+    hsu_config = HSUConfig(config_path)
+    dataset = Dataset(hsu_config.dataset_path(names["name"]))
+
+    results.append(
+        measure(
+            "Dataset.get_row_meter",
+            lambda _: dataset.get_row_meter(),
+            repeat,
+        )
+    )
+    results.append(
+        measure(
+            "Dataset.get_box_meter",
+            lambda _: dataset.get_box_meter(),
+            repeat,
+        )
+    )
+
+    legend = MineralLegend()
+    panels = {}
+    for label, data_type, data_subtype, data_name in panel_specs(names):
+        legend.add_minerals(data_name)
+        dataset_args = {
+            "config": dataset,
+            "dataset_name": names["name"],
+            "data_type": data_type,
+            "data_subtype": data_subtype,
+            "data_name": data_name,
+        }
+
+        def load_panel(_, args=dataset_args, colors=legend.color(data_name)):
+            previous = panels.get(args["data_subtype"])
+            if previous is not None:
+                previous.deleteLater()
+            panels[args["data_subtype"]] = create_data_panel(
+                None, None, LOAD_RESOLUTION, colors, args
+            )
+
+        results.append(measure(f"load {label}", load_panel, repeat))
+
+        # alternates between zooming in and back out. Plots are redrawn
+        # once control returns to the event loop, so it's run until they are
+        def zoom_panel(_, panel=panels[data_subtype]):
+            if panel.resolution == LOAD_RESOLUTION:
+                panel.zoom_changed(ZOOM_RESOLUTION)
+            else:
+                panel.zoom_changed(LOAD_RESOLUTION)
+            QApplication.processEvents()
+
+        results.append(measure(f"zoom {label}", zoom_panel, repeat * 2))
+
+    for resolution in [LOAD_RESOLUTION, ZOOM_RESOLUTION]:
+        meter = Meter(None, resolution, METER_VIEW_HEIGHT, dataset.meter_end())
+        results.append(
+            measure(
+                f"Meter._draw_meter_pixmaps {resolution}px/m",
+                lambda _, meter=meter: meter._draw_meter_pixmaps(),
+                repeat,
+            )
+        )
+
+    composite = panels["Composite Images"]
+    colors = legend.color(names["minerals"])
+    n_rows = len(composite.row_shapes)
+    results.append(
+        measure(
+            f"composite {n_rows} rows",
+            lambda _: [
+                composite._composite_row(
+                    composite.mineral_masks, row_idx, colors
+                )
+                for row_idx in range(n_rows)
+            ],
+            repeat,
+        )
+    )
+    renderer = composite.renderer()
+    height = renderer.height(LOAD_RESOLUTION)
+    results.append(
+        measure(
+            f"composite render {LOAD_RESOLUTION}px/m",
+            lambda _: renderer.render(0, height, LOAD_RESOLUTION),
+            repeat,
+        )
+    )
+
+    return results
+
+
+def compare(results: list, baseline_path: Path) -> None:
+    """Prints the change in median time of each case since a previous run.
+
+    Args:
+        results(list): The results of this run.
+        baseline_path(Path): The json saved by a previous run.
+    """
+    with open(baseline_path, "r") as f:
+        baseline = {case["name"]: case for case in json.load(f)["cases"]}
+
+    print(f"\nchange since {baseline_path.name}")
+    for case in results:
+        previous = baseline.get(case["name"])
+        if previous is None:
+            continue
+        change = case["median_s"] / previous["median_s"] - 1
+        print(f"{case['name']:<40} {change * 100:+7.1f} %")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Time the viewer's hot paths on a synthetic dataset."
+    )
+    parser.add_argument("--rows", type=int, default=500)
+    parser.add_argument("--minerals", type=int, default=4)
+    parser.add_argument(
+        "--row-image-size", type=int, nargs=2, default=[20, 400]
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--output",
+        help="Saves the results to this json file instead of "
+        "benchmarks/results.",
+    )
+    parser.add_argument(
+        "--baseline", help="Compares the results with a previous run."
+    )
+    args = parser.parse_args()
+
+    # PySide keeps the application alive without a reference to it
+    QApplication(sys.argv)
+
+    dataset_params = {
+        "n_rows": args.rows,
+        "n_minerals": args.minerals,
+        "row_image_size": tuple(args.row_image_size),
+    }
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        dataset_dir = Path(tmp_dir).joinpath("BENCH")
+        names = generate_dataset(dataset_dir, **dataset_params)
+        cases = run_benchmarks(dataset_dir, names, args.repeat)
+
+    created = datetime.now(timezone.utc)
+    results = {
+        "benchmark": "hot_paths",
+        "created": created.isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "dataset": dataset_params,
+        "cases": cases,
+    }
+
+    if args.output:
+        output_path = Path(args.output)
+    else:
+        RESULTS_DIR.mkdir(exist_ok=True)
+        output_path = RESULTS_DIR.joinpath(
+            f"hot_paths_{created.strftime('%Y%m%dT%H%M%S')}.json"
+        )
+    with open(output_path, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nresults saved to {output_path}")
+
+    if args.baseline:
+        compare(cases, Path(args.baseline))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,122 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+"""
+Measures the time from launching the viewer to its first paint, e.g.
+
+    python benchmarks/startup.py --runs 10 --output startup.json
+
+Each run starts a fresh interpreter so imports aren't cached between runs. The
+modules that are deliberately loaded on first use (matplotlib, openpyxl and
+PIL) are reported if they were imported before the first paint.
+"""
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+
+# modules that shouldn't be needed to show the empty viewer
+DEFERRED_MODULES = ["matplotlib", "openpyxl", "PIL"]
+
+CHILD_SCRIPT = """
+import json
+import sys
+
+from PySide6.QtCore import QEvent, QObject, QTimer
+from PySide6.QtWidgets import QApplication
+
+from hsu_viewer import HSUViewer
+
+
+class FirstPaint(QObject):
+    def eventFilter(self, watched, event):
+        if event.type() == QEvent.Paint:
+            print(
+                json.dumps(
+                    [m for m in {deferred} if m in sys.modules]
+                ),
+                flush=True,
+            )
+            QTimer.singleShot(0, QApplication.quit)
+            watched.removeEventFilter(self)
+        return False
+
+
+app = QApplication(sys.argv)
+viewer = HSUViewer()
+first_paint = FirstPaint()
+viewer.installEventFilter(first_paint)
+app.exec()
+"""
+
+
+def time_startup(env: dict) -> tuple:
+    """Launches the viewer once and returns the seconds until it was first
+    painted and the deferred modules it had imported by then.
+
+    Args:
+        env(dict): The environment of the viewer's process.
+    """
+    script = CHILD_SCRIPT.format(deferred=DEFERRED_MODULES)
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-c", script],
+        cwd=REPO_DIR,
+        env=env,
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    line = process.stdout.readline()
+    elapsed = time.perf_counter() - start
+    process.wait()
+    if not line:
+        raise RuntimeError("The viewer exited before it was painted")
+    return elapsed, json.loads(line)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Time from launching the viewer to its first paint."
+    )
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument(
+        "--output", help="Saves the results to this json file."
+    )
+    parser.add_argument(
+        "--platform",
+        default="offscreen",
+        help="The Qt platform plugin, offscreen by default.",
+    )
+    args = parser.parse_args()
+
+    env = dict(os.environ, QT_QPA_PLATFORM=args.platform)
+
+    timings = []
+    loaded = set()
+    for _ in range(args.runs):
+        elapsed, modules = time_startup(env)
+        timings.append(elapsed)
+        loaded.update(modules)
+
+    results = {
+        "benchmark": "startup",
+        "runs": args.runs,
+        "median_s": statistics.median(timings),
+        "min_s": min(timings),
+        "max_s": max(timings),
+        "deferred_modules_loaded": sorted(loaded),
+    }
+    print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
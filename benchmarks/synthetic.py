@@ -0,0 +1,274 @@
+import argparse
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+"""
+Generates synthetic datasets laid out like the HSU exports the viewer imports,
+e.g.
+
+    python benchmarks/synthetic.py /tmp/datasets/BENCH --rows 2000
+
+A dataset directory contains a {name}_DATA.csv, a Core folder with a folder of
+row images for each mineral, a Photo folder of core box images and a
+{name}_Geochemistry.xlsx.
+"""
+
+MINERALS = [
+    "Chlorite",
+    "Muscovite",
+    "Kaolinite",
+    "Epidote",
+    "Calcite",
+    "Biotite",
+    "Hematite",
+    "Gypsum",
+]
+
+ELEMENTS = ["Cu", "Zn", "Pb", "Fe", "S", "As", "Au", "Ag"]
+
+# the rows above the data in an HSU csv: info, headers, units, min and max
+CSV_HEADER_ROWS = 5
+
+ROW_LENGTH = 0.5  # depth covered by a core tray row (m)
+START_DEPTH = 10  # depth of the first row (m)
+
+
+def generate_dataset(
+    dataset_dir: Path | str,
+    n_rows: int = 500,
+    n_minerals: int = 4,
+    n_chemistry: int = 2,
+    row_image_size: tuple = (20, 400),
+    rows_per_box: int = 4,
+    box_image_size: tuple = (300, 600),
+    n_elements: int = 4,
+    coverage: float = 0.5,
+    seed: int = 0,
+) -> dict:
+    """Writes a synthetic dataset and returns the names of its data.
+
+    Args:
+        dataset_dir(Path | str): The dataset directory, its name is used as
+            the hole id.
+        n_rows(int): The number of core tray rows.
+        n_minerals(int): The number of minerals with percentages and images.
+        n_chemistry(int): The number of chemistry columns in the csv.
+        row_image_size(tuple): The (height, width) of each row image.
+        rows_per_box(int): The number of rows in each core box.
+        box_image_size(tuple): The (height, width) of each core box image.
+        n_elements(int): The number of elements in the geochemistry.
+        coverage(float): The fraction of row images containing the mineral,
+            the rest are empty (black).
+        seed(int): The random seed.
+    """
+    dataset_dir = Path(dataset_dir)
+    dataset_dir.mkdir(parents=True, exist_ok=True)
+    name = dataset_dir.name
+    rng = np.random.default_rng(seed)
+
+    minerals = MINERALS[:n_minerals]
+    elements = ELEMENTS[:n_elements]
+    chemistry = [f"Feature{idx}" for idx in range(n_chemistry)]
+
+    write_csv(
+        dataset_dir.joinpath(f"{name}_DATA.csv"),
+        n_rows,
+        rows_per_box,
+        minerals,
+        chemistry,
+        rng,
+    )
+    for mineral in minerals:
+        write_row_images(
+            dataset_dir.joinpath("Core", f"Mineral_{mineral.lower()}"),
+            n_rows,
+            row_image_size,
+            coverage,
+            rng,
+        )
+    write_box_images(
+        dataset_dir.joinpath("Photo", "Box"),
+        int(np.ceil(n_rows / rows_per_box)),
+        box_image_size,
+        rng,
+    )
+    write_geochemistry(
+        dataset_dir.joinpath(f"{name}_Geochemistry.xlsx"),
+        n_rows,
+        elements,
+        rng,
+    )
+
+    return {
+        "name": name,
+        "minerals": minerals,
+        "chemistry": chemistry,
+        "elements": elements,
+    }
+
+
+def write_csv(
+    path: Path,
+    n_rows: int,
+    rows_per_box: int,
+    minerals: list,
+    chemistry: list,
+    rng: np.random.Generator,
+) -> None:
+    """Writes the row depths and spectral data of a dataset."""
+    columns = [
+        "filename",
+        "box_number",
+        "row_number",
+        "meter_from",
+        "meter_to",
+        *[f"mineral_per_{mineral}" for mineral in minerals],
+        *[f"chemistry_{feature}_wl" for feature in chemistry],
+    ]
+    n_index = 5
+    lines = [
+        ",".join(["info"] * len(columns)),
+        ",".join(columns),
+        ",".join(
+            [""] * n_index
+            + ["percent"] * len(minerals)
+            + ["nanometer"] * len(chemistry)
+        ),
+        ",".join([""] * n_index + ["0"] * len(minerals + chemistry)),
+        ",".join(
+            [""] * n_index + ["1"] * len(minerals) + ["2250"] * len(chemistry)
+        ),
+    ]
+
+    percents = rng.random((n_rows, len(minerals)))
+    wavelengths = 2180 + rng.random((n_rows, len(chemistry))) * 70
+    for idx in range(n_rows):
+        meter_from = START_DEPTH + idx * ROW_LENGTH
+        lines.append(
+            ",".join(
+                [
+                    f"row{idx}.png",
+                    str(idx // rows_per_box),
+                    str(idx),
+                    f"{meter_from:.2f}",
+                    f"{meter_from + ROW_LENGTH:.2f}",
+                    *[f"{value:.3f}" for value in percents[idx]],
+                    *[f"{value:.1f}" for value in wavelengths[idx]],
+                ]
+            )
+        )
+
+    path.write_text("\n".join(lines) + "\n")
+
+
+def write_row_images(
+    image_dir: Path,
+    n_rows: int,
+    image_size: tuple,
+    coverage: float,
+    rng: np.random.Generator,
+) -> None:
+    """Writes a mineral's row images, mostly black with a bright patch."""
+    image_dir.mkdir(parents=True, exist_ok=True)
+    height, width = image_size
+    for idx in range(n_rows):
+        image = np.zeros((height, width, 3), np.uint8)
+        if rng.random() < coverage:
+            start = rng.integers(0, width // 2)
+            end = rng.integers(start + 1, width)
+            image[height // 4 : 3 * height // 4, start:end] = rng.integers(
+                64, 256
+            )
+        Image.fromarray(image).save(image_dir.joinpath(f"row{idx}.png"))
+
+
+def write_box_images(
+    image_dir: Path,
+    n_boxes: int,
+    image_size: tuple,
+    rng: np.random.Generator,
+) -> None:
+    """Writes noisy core box photos."""
+    image_dir.mkdir(parents=True, exist_ok=True)
+    for idx in range(n_boxes):
+        image = rng.integers(0, 256, (*image_size, 3), np.uint8)
+        Image.fromarray(image).save(image_dir.joinpath(f"box{idx}.png"))
+
+
+def write_geochemistry(
+    path: Path,
+    n_rows: int,
+    elements: list,
+    rng: np.random.Generator,
+) -> None:
+    """Writes assays over two metre intervals to a Geochemistry sheet."""
+    from openpyxl import Workbook
+
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.title = "Geochemistry"
+
+    # headers are on the second row and values start in the second column
+    sheet.append(["Assays"])
+    sheet.append(
+        [
+            "sample",
+            "depth_start",
+            "depth_end",
+            *[f"{element}_ppm" for element in elements],
+        ]
+    )
+    depth = START_DEPTH
+    end_depth = START_DEPTH + n_rows * ROW_LENGTH
+    idx = 0
+    while depth < end_depth:
+        sheet.append(
+            [
+                f"S{idx}",
+                depth,
+                min(depth + 2, end_depth),
+                *[float(value) for value in rng.random(len(elements)) * 1000],
+            ]
+        )
+        depth = depth + 2
+        idx = idx + 1
+
+    workbook.save(path)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Generate a synthetic HSU dataset."
+    )
+    parser.add_argument("dataset_dir", help="The dataset directory to write.")
+    parser.add_argument("--rows", type=int, default=500)
+    parser.add_argument("--minerals", type=int, default=4)
+    parser.add_argument("--chemistry", type=int, default=2)
+    parser.add_argument(
+        "--row-image-size", type=int, nargs=2, default=[20, 400]
+    )
+    parser.add_argument("--rows-per-box", type=int, default=4)
+    parser.add_argument(
+        "--box-image-size", type=int, nargs=2, default=[300, 600]
+    )
+    parser.add_argument("--elements", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    generate_dataset(
+        args.dataset_dir,
+        n_rows=args.rows,
+        n_minerals=args.minerals,
+        n_chemistry=args.chemistry,
+        row_image_size=tuple(args.row_image_size),
+        rows_per_box=args.rows_per_box,
+        box_image_size=tuple(args.box_image_size),
+        n_elements=args.elements,
+        seed=args.seed,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,16 @@
-from pathlib import Path
-
 import numpy as np
-from natsort import os_sorted
-from PIL import Image, ImageEnhance, ImageQt
 from PySide6.QtCore import Slot
-from PySide6.QtWidgets import QLabel, QWidget, QVBoxLayout
-from PySide6.QtGui import QColor, QPainter, QPixmap
+from PySide6.QtGui import QImage
 
 from components.data_panel import DataPanel
+from components.panel_renderer import RowImageRenderer
+from components.tile_canvas import TileCanvas
+from data import products
 from data.dataset import Dataset
+from data.image_stack import pyramid_level
+from data.render_cache import RenderCache
+from hsu_viewer.memory_budget import array_bytes
+from hsu_viewer.profiler import profiler
 from hsu_viewer.worker import Worker
 
 
@@ -19,11 +21,14 @@ class CompositeImagePanel(DataPanel):
     images.
     """
 
+    load_cost = "composite"
+    memory_kind = "Composites"
+
     def __init__(
         self,
         parent=None,
-        threadpool=None,
-        resolution: int = 0,
+        scheduler=None,
+        resolution: float = 0,
         dataset: Dataset = None,
         plot_colors: dict = None,
         **kwargs,
@@ -32,9 +37,9 @@ class CompositeImagePanel(DataPanel):
 
         Args:
             parent(None/QWidget): The parent widget.
-            threadpool(None/QThreadpool): The threadpool used to handle async
+            scheduler(None/PanelScheduler): The scheduler used to handle async
                 operations.
-            resolution(int): The curently selected resolution (px/m)
+            resolution(float): The curently selected resolution (px/m)
             dataset(Dataset): The dataset object for the selected mineral data.
             plot_colors(dict): A dictionary of colors to be assigned to each
                 mineral.
@@ -43,7 +48,7 @@ class CompositeImagePanel(DataPanel):
             parent=parent,
             resolution=resolution,
             dataset=dataset,
-            threadpool=threadpool,
+            scheduler=scheduler,
             **kwargs,
         )
 
@@ -53,9 +58,19 @@ class CompositeImagePanel(DataPanel):
 
         self.plot_colors = plot_colors
 
-        self.image_frame = QWidget(self)
+        # intensity of each mineral in every row (a memory mapped ImageStack,
+        # or a list with None for empty rows) and the shape of each row
+        # image, kept so recolouring and zooming don't reopen the images
+        self.mineral_masks = {}
+        self.row_shapes = []
+        self.row_meter = None
+
+        self.render_cache = RenderCache(
+            dataset.cache_dir().joinpath("renders")
+        )
+
+        self.image_frame = TileCanvas(self, resolution)
         self.image_frame.setToolTip(self.composite_tooltip(self.plot_colors))
-        self.image_frame_layout = QVBoxLayout(self.image_frame)
 
         self.layout.addWidget(self.image_frame)
         self.layout.addStretch()
@@ -65,144 +80,224 @@ class CompositeImagePanel(DataPanel):
 
     def get_plot(self) -> None:
         """Handles the process of loading and displying images in the widget.
-        Can be run asynchronously if a theadpool was assigned.
+        Can be run asynchronously if a scheduler was assigned, in which case
+        rows are displayed in batches starting at the visible depth.
         """
-        if self.threadpool:
-            worker = Worker(self._load_core_images)
-            worker.signals.result.connect(self._display_core_images)
-            worker.signals.finished.connect(self._on_finish)
-            self.threadpool.start(worker)
+        if self.released:
+            # loaded once the panel is scrolled back into view
+            return
+
+        if self.scheduler:
+            worker = Worker(self._load_core_images, self.visible_depth())
+            self.stream_rows(worker)
+            self.scheduler.schedule(worker, self)
         else:
             result = self._load_core_images()
             self._display_core_images(result)
             self.loading.emit(False)
 
-    def _load_core_images(self) -> tuple:
+    def _load_core_images(
+        self, start_depth: float = 0, partial_callback=None
+    ) -> tuple:
         """Loads each image to needed then stacks images from each row into a
         composite row.
-        """
-        pixmaps = []
-        pixmap_width = 0
-
-        self.meter = self.dataset.get_row_meter()
-
-        if self.meter.max() >= 9999:
-            self.meter[:, 0] = np.arange(0, self.meter.shape[0], 1)
-            self.meter[:, 1] = np.arange(1, self.meter.shape[0] + 1, 1)
-
-        image_paths = {
-            mineral: os_sorted(Path(self.dataset_info[mineral]).glob("*.png"))
-            for mineral in self.data_name
-        }
-        total_image_height = 0
-        for row_idx in range(self.dataset.n_rows()):
-            row_image = np.array([0])
-            n_ims = 0
-            for min_idx, mineral in enumerate(self.data_name):
-                image = Image.open(image_paths[mineral][row_idx])
-                image_array = np.asarray(image) / 255
-                if image_array.shape[2] > 3:
-                    image_array = image_array[:, :, :3]
-                min_color = self.hex_to_rgb(
-                    self.plot_colors.get(self.data_name[min_idx])[1:]
-                )
-                colored_image = min_color * image_array
 
-                if np.any(colored_image):
-                    row_image = row_image + colored_image
-                    n_ims = n_ims + 1
-
-            if n_ims > 0:
-                comp_image = Image.fromarray(
-                    (row_image / n_ims).astype(np.uint8), "RGB"
-                )
-            else:
-                comp_image = Image.fromarray(
-                    (image_array * 0).astype(np.uint8), "RGB"
-                )
-            enhancer = ImageEnhance.Brightness(comp_image)
-            comp_image = enhancer.enhance(5)
-            pixmap = QPixmap(ImageQt.ImageQt(comp_image))
-            pixmap_height = np.rint(
-                (self.meter[row_idx][1] - self.meter[row_idx][0])
-                * self.resolution
-            )
-            pixmap = pixmap.scaledToHeight(pixmap_height)
-            total_image_height = total_image_height + pixmap.height()
-            if pixmap.width() > pixmap_width:
-                pixmap_width = pixmap.width()
+        Args:
+            start_depth(float): The depth (m) of the first rows to load.
+            partial_callback(None/function): Called with each batch of
+                loaded rows before all rows have been loaded.
+        """
+        image_width = 0
 
-            pixmaps.append(pixmap)
+        with profiler.span("parse"):
+            meter = products.composite_meter(self.dataset)
 
-        if self.meter[0, 0] != 0:
-            self.meter = np.insert(
-                self.meter.astype(float), 0, [0, self.meter[0, 0]], axis=0
-            )
+        # the row shapes are read from the manifest so cached renders are
+        # used without opening the mineral images
+        mineral_masks = None
+        row_shapes = self.row_shapes or products.row_shapes(
+            self.dataset, self.data_name[0]
+        )
+        if row_shapes:
+            self.row_shapes = row_shapes
+        else:
+            mineral_masks = self._load_mineral_masks(self.mineral_masks)
+
+        # tiles are offset by one when the meter doesn't start at 0
+        top_offset = int(meter[0, 0] != 0)
+        top_height = np.ceil(meter[0, 0] * self.resolution)
+        row_heights = np.rint((meter[:, 1] - meter[:, 0]) * self.resolution)
+        tile_meter = meter.astype(float)
+        if top_offset:
+            tile_meter = np.insert(tile_meter, 0, [0, meter[0, 0]], axis=0)
+
+        # colours can change while loading, render with those at the start
+        plot_colors = dict(self.plot_colors)
+        level = pyramid_level(
+            np.median([shape[0] for shape in self.row_shapes]),
+            np.median(row_heights),
+        )
+        source_dirs = [
+            self.dataset_info[mineral] for mineral in self.data_name
+        ]
+        cache_key = self.render_cache.key(self.data_name, plot_colors, level)
+        cached_rows = self.render_cache.get(cache_key, source_dirs)
+        if cached_rows is None and mineral_masks is None:
+            mineral_masks = self._load_mineral_masks(self.mineral_masks)
+        rendered_rows = [None] * self.dataset.n_rows()
+
+        images = [None] * self.dataset.n_rows()
+        for batch_rows in self.row_batches(meter, start_depth):
+            batch = []
+            with profiler.span("composite"):
+                for row_idx in batch_rows:
+                    if cached_rows is not None:
+                        rendered_rows[row_idx] = cached_rows[row_idx]
+                    else:
+                        rendered_rows[row_idx] = self._composite_row(
+                            mineral_masks, row_idx, plot_colors, level
+                        )
+            with profiler.span("scale"):
+                for row_idx in batch_rows:
+                    image = self.scaled_row_image(
+                        rendered_rows[row_idx], row_heights[row_idx]
+                    )
+                    image_width = max(image_width, image.width())
+
+                    images[row_idx] = image
+                    batch.append((row_idx + top_offset, image))
+
+            if partial_callback:
+                partial_callback((tile_meter, batch))
+
+        if cached_rows is None:
+            self.render_cache.put(cache_key, source_dirs, rendered_rows)
+
+        self.row_meter = meter
+        self.meter = tile_meter
+
+        if top_offset:
+            images.insert(0, self.blank_row_image(image_width, top_height))
+
+        return tile_meter, images
+
+    @profiler.phase("decode")
+    def _load_mineral_masks(self, mineral_masks: dict) -> dict:
+        """Opens the images of any minerals that aren't already in
+        mineral_masks and adds them to it. See data.products.mineral_masks.
 
-            pixmap_height = np.ceil(
-                (self.meter[0][1] - self.meter[0][0]) * self.resolution
-            )
+        Args:
+            mineral_masks(dict): The intensity of each mineral in every row
+                that has already been loaded.
 
-            pixmap = QPixmap(pixmap_width, pixmap_height)
+        Returns:
+            dict: mineral_masks. Loads keep their own reference as the
+                panel's masks can be evicted by the memory budget while they
+                run.
+        """
+        for mineral in self.data_name:
+            if mineral not in mineral_masks:
+                masks, row_shapes = products.mineral_masks(
+                    self.dataset, mineral
+                )
+                mineral_masks[mineral] = masks
+                self.row_shapes = row_shapes
+        return mineral_masks
 
-            qp = QPainter(pixmap)  # initiate painter
-            qp.setBrush(QColor(0, 0, 0))  # paint meter background black
-            qp.drawRect(0, 0, pixmap_width, pixmap_height)
+    def _composite_row(
+        self,
+        mineral_masks: dict,
+        row_idx: int,
+        plot_colors: dict,
+        level: int = 0,
+    ) -> np.ndarray:
+        """Stacks the mineral images of a single row into a composite image.
 
-            total_image_height = total_image_height + pixmap_height
-            pixmaps.insert(0, pixmap)
+        Args:
+            mineral_masks(dict): The intensity of each mineral in every row.
+            row_idx(int): The index of the row.
+            plot_colors(dict): The colour assigned to each mineral.
+            level(int): The pyramid level the composite is reduced to.
+        """
+        masks, bboxes = zip(
+            *[
+                products.row_mask(mineral_masks[mineral], row_idx)
+                for mineral in self.data_name
+            ]
+        )
+        return products.composite_row(
+            masks,
+            [plot_colors.get(mineral) for mineral in self.data_name],
+            self.row_shapes[row_idx],
+            level,
+            bboxes,
+        )
 
-        return pixmaps, pixmap_width, total_image_height
+    def renderer(self) -> RowImageRenderer | None:
+        """Returns a renderer that draws the composite rows at any resolution
+        with the current mineral colours.
+        """
+        if self.row_meter is None:
+            return None
+
+        plot_colors = dict(self.plot_colors)
+        row_shapes = list(self.row_shapes)
+        # masks evicted by the memory budget are opened again, but aren't
+        # kept as they aren't counted by it
+        mineral_masks = self._load_mineral_masks(dict(self.mineral_masks))
+
+        def load_row(row_idx: int, height: int) -> QImage:
+            level = pyramid_level(row_shapes[row_idx][0], height)
+            return self.array_to_image(
+                self._composite_row(mineral_masks, row_idx, plot_colors, level)
+            )
 
-    def _display_core_images(self, result: tuple) -> None:
-        """Scales the images and adds them to the image_frame object.
+        return RowImageRenderer(
+            self.row_meter,
+            [(width, height) for height, width, _ in row_shapes],
+            load_row,
+        )
 
-        Args:
-            result(tuple): A tuple containing image data and size parameters.
+    def image_bytes(self) -> int:
+        return self.image_frame.pixmap_bytes()
 
-        """
-        pixmaps, pixmap_width, total_image_height = result
+    def overview(self, width: int, height: int, depth: float) -> QImage | None:
+        return self.image_frame.overview(width, height, depth)
 
-        self.clear_image_tiles()
+    def data_bytes(self) -> int:
+        # packed image stacks are memory mapped and aren't counted
+        return array_bytes(self.mineral_masks)
 
-        for pixmap in pixmaps:
-            image = QLabel()
-            image.setScaledContents(True)
-            image.setPixmap(pixmap)
-            self.insert_row(image)
+    def _evict_data(self) -> None:
+        # loads that are running keep the masks they opened
+        self.mineral_masks = {}
 
-        self.image_frame_layout.setSpacing(0)
-        self.image_frame_layout.setContentsMargins(0, 0, 0, 0)
+    def _release_images(self) -> None:
+        self.image_frame.release()
 
-        frame_height = (self.meter[-1][1] - self.meter[0][0]) * self.resolution
-        frame_width = int(pixmap_width * frame_height / total_image_height)
-        self.image_frame.setFixedSize(frame_width, frame_height)
-        self.width = frame_width
-        self.setFixedWidth(self.width)
+    def _restore_images(self) -> None:
+        self.loading.emit(True)
+        self.get_plot()
 
-    def insert_row(self, tile: QLabel) -> None:
-        """Inserts each row image into the image_fram object.
+    @Slot(float)
+    def preview_zoom(self, resolution: float) -> None:
+        """Scales the current images to a new resolution until they're
+        replaced by images loaded at it.
 
         Args:
-            tile(QLabel): A QLabel object containing the image to be displayed.
-
+            resolution(float): The new resolution (px/m).
         """
-        if self.image_frame_layout.count() == 0:
-            self.image_frame_layout.addWidget(tile)
-            self.image_frame_layout.addStretch()
-        else:
-            self.image_frame_layout.insertWidget(
-                self.image_frame_layout.count() - 1, tile
-            )
+        self.image_frame.set_resolution(resolution)
 
-    @Slot(int)
-    def zoom_changed(self, resolution: int) -> None:
+    @Slot(float)
+    def zoom_changed(self, resolution: float) -> None:
         """Updates the image sizes when the resolution is changed.
 
         Args:
-            resolution(int): The new resoltuion (px/m).
+            resolution(float): The new resoltuion (px/m).
 
         """
         self.loading.emit(True)
         self.resolution = resolution
+        self.image_frame.set_resolution(resolution)
         self.get_plot()
@@ -1,14 +1,9 @@
-from pathlib import Path
-
 import numpy as np
-from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg
-from matplotlib.figure import Figure
-from matplotlib.ticker import NullFormatter
-from PySide6.QtCore import Signal, Slot
+from PySide6.QtCore import Signal
 
-from components.data_panel import DataPanel
+from components.plot_panel import PlotPanel
 from data.dataset import Dataset
-from hsu_viewer.worker import Worker
+from hsu_viewer.profiler import profiler
 
 """
 TODO:
@@ -16,7 +11,7 @@ TODO:
 """
 
 
-class CompositePlotPanel(DataPanel):
+class CompositePlotPanel(PlotPanel):
     """Component for Composite Plot Images
 
     Handles production, manipulation, and display of stacked (composite) plot
@@ -33,8 +28,8 @@ class CompositePlotPanel(DataPanel):
     def __init__(
         self,
         parent=None,
-        threadpool=None,
-        resolution: int = 0,
+        scheduler=None,
+        resolution: float = 0,
         dataset: Dataset = None,
         plot_colors: dict = None,
         **kwargs,
@@ -43,9 +38,9 @@ class CompositePlotPanel(DataPanel):
 
         Args:
             parent(None/QWidget): The parent widget.
-            threadpool(None/QThreadpool): The threadpool used to handle async
+            scheduler(None/PanelScheduler): The scheduler used to handle async
                 operations.
-            resolution(int): The curently selected resolution (px/m)
+            resolution(float): The curently selected resolution (px/m)
             dataset(Dataset): The dataset object for the selected mineral data.
             plot_colors(dict): A dictionary of colors to be assigned to each
                 mineral.
@@ -54,17 +49,11 @@ class CompositePlotPanel(DataPanel):
             parent=parent,
             resolution=resolution,
             dataset=dataset,
-            threadpool=threadpool,
+            scheduler=scheduler,
+            plot_colors=plot_colors,
             **kwargs,
         )
 
-        self.width = 180
-        self.setFixedWidth(self.width)
-        self.image_resolution = resolution
-        self.depth = dataset.meter_end()
-
-        self.plot_colors = plot_colors
-
         self.axis_limits = [0, 1]
 
         self.setToolTip(self.composite_tooltip(self.plot_colors))
@@ -72,59 +61,7 @@ class CompositePlotPanel(DataPanel):
         self.loading.emit(True)
         self.get_plot()
 
-    def get_plot(self) -> None:
-        """Handles the process of loading data and displying the resulting
-        plot. Can be run asynchronously if a theadpool was assigned.
-        """
-        if self.threadpool:
-            worker = Worker(self._load_spectral_data)
-            worker.signals.result.connect(self._plot_spectral_data)
-            worker.signals.finished.connect(self._on_finish)
-            self.threadpool.start(worker)
-        else:
-            result = self._load_spectral_data()
-            self._plot_spectral_data(result)
-            self.loading.emit(False)
-
-    def _load_spectral_data(self) -> None:
-        """Loads spectral data from csv and shifts as needed to produce
-        stacked plot.
-        """
-        mineral_columns = [min["column"] for min in self.dataset_info.values()]
-        meter_from_column = self.dataset_info[self.data_name[0]]["meter_from"]
-        meter_to_column = self.dataset_info[self.data_name[0]]["meter_to"]
-
-        data = np.genfromtxt(
-            Path(self.csv_data["path"]),
-            delimiter=",",
-            dtype="float",
-            comments=None,
-            skip_header=5,
-            usecols=[
-                meter_from_column,
-                meter_to_column,
-                *mineral_columns,
-            ],
-        )
-
-        if data[-1, 1] >= 9999:
-            data[:, 0] = np.arange(0, data.shape[0], 1)
-            data[:, 1] = np.arange(1, data.shape[0] + 1, 1)
-
-        if data[0, 0] != 0:
-            top_row = np.full([1, data.shape[1]], np.nan)
-            top_row[0, 0] = 0
-            top_row[0, 1] = data[0, 0]
-            data = np.insert(data.astype(float), 0, top_row, axis=0)
-
-        bar_widths = data[:, 1] - data[:, 0]
-        bar_centers = (data[:, 0] + data[:, 1]) / 2
-        meter_start = data[0, 0]
-        meter_end = data[-1, 1]
-        spectral_data = data[:, 2:]
-
-        return bar_widths, bar_centers, meter_start, meter_end, spectral_data
-
+    @profiler.phase("widget build")
     def _plot_spectral_data(self, result: tuple) -> None:
         """Plots the data in a horiztonal bar plot.
 
@@ -133,11 +70,16 @@ class CompositePlotPanel(DataPanel):
                 parameters.
 
         """
+        # matplotlib is slow to import so it isn't loaded until the first
+        # plot is drawn
+        from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg
+        from matplotlib.figure import Figure
+        from matplotlib.ticker import NullFormatter
+
         # create plot figure and canvas
         bar_widths, bar_centers, meter_start, meter_end, spectral_data = result
 
-        if self.layout.count() > 0:
-            self.layout.itemAt(0).widget().deleteLater()
+        self._remove_plot()
 
         height = (meter_end - meter_start) * self.resolution
         plot_fig = Figure(
@@ -176,6 +118,8 @@ class CompositePlotPanel(DataPanel):
             )
             left = left + spec
         axis_max = np.nanmax(left)
+        self.plot_data = result
+        self.axis_limits = [0, axis_max]
         self.update_axis_limits.emit([0, axis_max])
         plot.set_xticks([0, axis_max / 2, axis_max])
         plot.set_ylim(meter_end, meter_start)
@@ -187,27 +131,7 @@ class CompositePlotPanel(DataPanel):
         plotCanvas.draw()
 
         self.insert_plot(plotCanvas)
+        self._update_memory()
 
-    @Slot(int)
-    def zoom_changed(self, resolution: int) -> None:
-        """Updates the image sizes when the resolution is changed.
-        Args:
-            resolution(int): The new resoltuion (px/m).
-
-        """
-        self.loading.emit(True)
-        self.resolution = resolution
-        self.get_plot()
-
-    def insert_plot(self, plot: FigureCanvasQTAgg) -> None:
-        """Inserts the plot into the component layout.
-
-        Args:
-            plot(FigureCanvasQTAgg): The plot objects.
-
-        """
-        if self.layout.count() == 0:
-            self.layout.addWidget(plot)
-            self.layout.addStretch()
-        else:
-            self.layout.insertWidget(self.layout.count() - 1, plot)
+    def bar_colors(self) -> list:
+        return [self.plot_colors.get(mineral) for mineral in self.data_name]
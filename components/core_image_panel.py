@@ -1,13 +1,14 @@
-from pathlib import Path
-
 import numpy as np
-from natsort import os_sorted
 from PySide6.QtCore import Slot
-from PySide6.QtWidgets import QLabel, QWidget, QVBoxLayout
-from PySide6.QtGui import QColor, QPainter, QPixmap
+from PySide6.QtGui import QImage
 
 from components.data_panel import DataPanel
+from components.panel_renderer import RowImageRenderer
+from components.tile_canvas import TileCanvas
+from data import products
 from data.dataset import Dataset
+from data.image_manifest import manifest_is_current, manifest_sizes
+from hsu_viewer.profiler import profiler
 from hsu_viewer.worker import Worker
 
 
@@ -17,11 +18,14 @@ class CoreImagePanel(DataPanel):
     Handles production, manipulation, and display of core images.
     """
 
+    load_cost = "image"
+    memory_kind = "Images"
+
     def __init__(
         self,
         parent=None,
-        threadpool=None,
-        resolution: int = 0,
+        scheduler=None,
+        resolution: float = 0,
         dataset: Dataset = None,
         **kwargs,
     ) -> None:
@@ -29,9 +33,9 @@ class CoreImagePanel(DataPanel):
 
         Args:
             parent(None/QWidget): The parent widget.
-            threadpool(None/QThreadpool): The threadpool used to handle async
+            scheduler(None/PanelScheduler): The scheduler used to handle async
                 operations.
-            resolution(int): The curently selected resolution (px/m)
+            resolution(float): The curently selected resolution (px/m)
             dataset(Dataset): The dataset object for the selected mineral data.
             plot_colors(dict): A dictionary of colors to be assigned to each
                 mineral.
@@ -40,7 +44,7 @@ class CoreImagePanel(DataPanel):
             parent=parent,
             resolution=resolution,
             dataset=dataset,
-            threadpool=threadpool,
+            scheduler=scheduler,
             **kwargs,
         )
 
@@ -48,8 +52,11 @@ class CoreImagePanel(DataPanel):
         self.image_resolution = resolution
         self.depth = dataset.meter_end()
 
-        self.image_frame = QWidget(self)
-        self.image_frame_layout = QVBoxLayout(self.image_frame)
+        # depth range and path of each row image once they have been loaded
+        self.row_meter = None
+        self.image_paths = []
+
+        self.image_frame = TileCanvas(self, resolution)
         # tooltip displays min name when hovering mouse over widget
         self.image_frame.setToolTip(f"{self.dataset_name} {self.data_name}")
 
@@ -61,122 +68,138 @@ class CoreImagePanel(DataPanel):
 
     def get_images(self) -> None:
         """Handles the process of loading and displying images in the widget.
-        Can be run asynchronously if a theadpool was assigned.
+        Can be run asynchronously if a scheduler was assigned, in which case
+        rows are displayed in batches starting at the visible depth.
         """
-        if self.threadpool:
-            worker = Worker(self._load_core_images)
-            worker.signals.result.connect(self._display_core_images)
-            worker.signals.finished.connect(self._on_finish)
-            self.threadpool.start(worker)
+        if self.released:
+            # loaded once the panel is scrolled back into view
+            return
+
+        if self.scheduler:
+            worker = Worker(self._load_core_images, self.visible_depth())
+            self.stream_rows(worker)
+            self.scheduler.schedule(worker, self)
         else:
             result = self._load_core_images()
             self._display_core_images(result)
             self.loading.emit(False)
 
-    def _load_core_images(self) -> QWidget:
-        """Loads each image to needed for selected mineral."""
-        pixmaps = []
-        pixmap_width = 0
-
-        match self.data_type:
-            case "Spectral Images":
-                self.meter = self.dataset.get_row_meter()
-            case "Corebox Images":
-                self.meter = self.dataset.get_box_meter()
-
-        if self.meter.max() >= 9999:
-            depth = self.dataset.n_rows() * 2
-            step = depth / (self.meter.shape[0])
-            self.meter[:, 0] = np.linspace(0, depth-step, self.meter.shape[0])
-            self.meter[:, 1] = np.linspace(step, depth, self.meter.shape[0])
-
-        image_paths = os_sorted(
-            Path(self.dataset_info.get("path")).glob("*.png")
-        )
-        total_image_height = 0
-
-        for row_idx, path in enumerate(image_paths):
-            pixmap = QPixmap(path)
-            pixmap_height = np.rint(
-                (self.meter[row_idx][1] - self.meter[row_idx][0])
-                * self.resolution
-            )
-            pixmap = pixmap.scaledToHeight(pixmap_height)
-            total_image_height = total_image_height + pixmap.height()
-            if pixmap.width() > pixmap_width:
-                pixmap_width = pixmap.width()
+    def _load_core_images(
+        self, start_depth: float = 0, partial_callback=None
+    ) -> tuple:
+        """Loads each image to needed for selected mineral.
 
-            pixmaps.append(pixmap)
-
-        if self.meter[0, 0] != 0:
-            self.meter = np.insert(
-                self.meter.astype(float), 0, [0, self.meter[0, 0]], axis=0
-            )
+        Args:
+            start_depth(float): The depth (m) of the first rows to load.
+            partial_callback(None/function): Called with each batch of
+                loaded rows before all rows have been loaded.
+        """
+        image_width = 0
 
-            pixmap_height = np.ceil(
-                (self.meter[0][1] - self.meter[0][0]) * self.resolution
+        with profiler.span("parse"):
+            meter = products.image_meter(self.dataset, self.data_type)
+            image_paths = products.image_paths(
+                self.dataset_info.get("path"),
+                self.dataset_info.get("manifest"),
             )
+        meter = meter[: len(image_paths)]
+
+        # tiles are offset by one when the meter doesn't start at 0
+        top_offset = int(meter[0, 0] != 0)
+        top_height = np.ceil(meter[0, 0] * self.resolution)
+        row_heights = np.rint((meter[:, 1] - meter[:, 0]) * self.resolution)
+        tile_meter = meter.astype(float)
+        if top_offset:
+            tile_meter = np.insert(tile_meter, 0, [0, meter[0, 0]], axis=0)
+
+        images = [None] * len(image_paths)
+        for batch_rows in self.row_batches(meter, start_depth):
+            batch = []
+            with profiler.span("decode"):
+                row_arrays = [
+                    products.load_image(image_paths[idx], row_heights[idx])
+                    for idx in batch_rows
+                ]
+            with profiler.span("scale"):
+                for row_idx, row_array in zip(batch_rows, row_arrays):
+                    image = self.scaled_row_image(
+                        row_array, row_heights[row_idx]
+                    )
+                    image_width = max(image_width, image.width())
+
+                    images[row_idx] = image
+                    batch.append((row_idx + top_offset, image))
+
+            if partial_callback:
+                partial_callback((tile_meter, batch))
+
+        self.row_meter = meter
+        self.image_paths = image_paths
+        self.meter = tile_meter
+
+        if top_offset:
+            images.insert(0, self.blank_row_image(image_width, top_height))
+
+        return tile_meter, images
+
+    def renderer(self) -> RowImageRenderer | None:
+        """Returns a renderer that draws the row images at any resolution."""
+        if self.row_meter is None:
+            return None
+
+        manifest = self.dataset_info.get("manifest")
+        if manifest_is_current(manifest, self.dataset_info.get("path")):
+            row_sizes = manifest_sizes(manifest)
+        else:
+            row_sizes = products.image_sizes(self.image_paths)
 
-            pixmap = QPixmap(pixmap_width, pixmap_height)
-
-            qp = QPainter(pixmap)  # initiate painter
-            qp.setBrush(QColor(0, 0, 0))  # paint meter background black
-            qp.drawRect(0, 0, pixmap_width, pixmap_height)
-
-            total_image_height = total_image_height + pixmap_height
-            pixmaps.insert(0, pixmap)
-
-        return pixmaps, pixmap_width, total_image_height
+        image_paths = list(self.image_paths)
 
-    def _display_core_images(self, result: tuple) -> None:
-        """Scales the images and adds them to the image_frame object.
+        def load_row(row_idx: int, height: int) -> QImage:
+            # decoded at a reduced size when exported below full resolution
+            return self.array_to_image(
+                products.load_image(image_paths[row_idx], height)
+            )
 
-        Args:
-            result(tuple): A tuple containing image data and size parameters.
+        return RowImageRenderer(self.row_meter, row_sizes, load_row)
 
+    def update_plot_colors(self, mineral: str, color: str) -> None:
+        """Core images aren't coloured by mineral so there is nothing to
+        update.
         """
-        pixmaps, pixmap_width, total_image_height = result
 
-        self.clear_image_tiles()
+    def image_bytes(self) -> int:
+        return self.image_frame.pixmap_bytes()
 
-        for pixmap in pixmaps:
-            image = QLabel()
-            image.setScaledContents(True)
-            image.setPixmap(pixmap)
-            self.insert_row(image)
+    def overview(self, width: int, height: int, depth: float) -> QImage | None:
+        return self.image_frame.overview(width, height, depth)
 
-        self.image_frame_layout.setSpacing(0)
-        self.image_frame_layout.setContentsMargins(0, 0, 0, 0)
+    def _release_images(self) -> None:
+        self.image_frame.release()
 
-        frame_height = (self.meter[-1][1] - self.meter[0][0]) * self.resolution
-        frame_width = int(pixmap_width * frame_height / total_image_height)
-        self.image_frame.setFixedSize(frame_width, frame_height)
-        self.width = frame_width
-        self.setFixedWidth(self.width)
+    def _restore_images(self) -> None:
+        self.loading.emit(True)
+        self.get_images()
 
-    def insert_row(self, tile: QLabel) -> None:
-        """Inserts each row image into the image_fram object.
+    @Slot(float)
+    def preview_zoom(self, resolution: float) -> None:
+        """Scales the current images to a new resolution until they're
+        replaced by images loaded at it.
 
         Args:
-            tile(QLabel): A QLabel object containing the image to be displayed.
-
+            resolution(float): The new resolution (px/m).
         """
-        if self.image_frame_layout.count() == 0:
-            self.image_frame_layout.addWidget(tile)
-            self.image_frame_layout.addStretch()
-        else:
-            self.image_frame_layout.insertWidget(
-                self.image_frame_layout.count() - 1, tile
-            )
+        self.image_frame.set_resolution(resolution)
 
-    @Slot(int)
-    def zoom_changed(self, resolution: int) -> None:
+    @Slot(float)
+    def zoom_changed(self, resolution: float) -> None:
         """Updates the image sizes when the resolution is changed.
 
         Args:
-            resolution(int): The new resoltuion (px/m).
+            resolution(float): The new resoltuion (px/m).
 
         """
         self.loading.emit(True)
         self.resolution = resolution
+        self.image_frame.set_resolution(resolution)
         self.get_images()
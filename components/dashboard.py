@@ -1,9 +1,18 @@
-from PySide6.QtCore import QPoint, QRect, Qt, Signal, Slot, QThreadPool
+from PySide6.QtCore import (
+    QElapsedTimer,
+    QEvent,
+    QObject,
+    Qt,
+    QTimer,
+    Signal,
+    Slot,
+)
 from PySide6.QtGui import QResizeEvent, QPixmap, QIcon
 from PySide6.QtWidgets import (
     QWidget,
     QHBoxLayout,
     QGridLayout,
+    QLabel,
     QPushButton,
     QScrollArea,
 )
@@ -15,34 +24,184 @@ from components.core_image_panel import CoreImagePanel
 from components.data_panel import DataPanel
 from components.draggable_container import DraggableContainer
 from components.meter import Meter
+from components.minimap import COLUMN_WIDTH, MAX_COLUMNS, Minimap
+from components.modal import Modal
+from components.panel_renderer import MeterRenderer
 from components.save_panel_window import SavePanelWindow
+from components.save_strip_log_window import SaveStripLogWindow
+from components.strip_log import LegendRenderer
 from components.spectral_plot_panel import SpectralPlotPanel
+from hsu_viewer.memory_budget import memory_budget
+from hsu_viewer.render_coordinator import RenderCoordinator
+from hsu_viewer.scheduler import PanelScheduler
+
+# range of resolutions (px/m) the dashboard can be zoomed between
+MIN_RESOLUTION = 5
+MAX_RESOLUTION = 50
+
+# factor the resolution is multiplied or divided by on each zoom step
+ZOOM_STEP = 1.25
+
+# wheel rotation (1/8ths of a degree) of a single step of most mouse wheels
+WHEEL_STEP = 120
+
+# panels further than this (px) to the left or right of the data area's
+# viewport release their rendered images
+RELEASE_MARGIN = 1000
+
+# while scrolling, panels load the rows this far (s at the current scroll
+# speed) ahead of the viewport first
+PREFETCH_LEAD = 0.5
+
+# weight of the latest scroll step in the smoothed scroll velocity
+VELOCITY_SMOOTHING = 0.5
+
+# time without scrolling (ms) after which scrolling has stopped
+SCROLL_SETTLE_INTERVAL = 150
+
+# time after panels stop loading (ms) before the minimap is redrawn
+MINIMAP_INTERVAL = 500
+
+
+def create_data_panel(
+    parent: QWidget,
+    scheduler: PanelScheduler,
+    resolution: float,
+    plot_colors: dict,
+    dataset_args: dict,
+) -> DataPanel:
+    """Creates the type of data panel needed to display the selected data.
+
+    Args:
+        parent(None/QWidget): The parent widget.
+        scheduler(None/PanelScheduler): The scheduler used to handle async
+            operations. Panels load synchronously without one.
+        resolution(float): The resolution of the panel (px/m).
+        plot_colors(dict): The colour assigned to each mineral.
+        dataset_args(dict): Parameters for the new panel.
+    """
+    dataset_config = dataset_args.get("config")
+
+    match dataset_args.get("data_type"):
+        case "Spectral Images":
+            if dataset_args.get("data_subtype") == "Composite Images":
+                panel = CompositeImagePanel(
+                    parent,
+                    scheduler,
+                    resolution,
+                    dataset_config,
+                    plot_colors,
+                    **dataset_args,
+                )
+            else:
+                panel = CoreImagePanel(
+                    parent,
+                    scheduler,
+                    resolution,
+                    dataset_config,
+                    **dataset_args,
+                )
+        case "Corebox Images":
+            panel = CoreImagePanel(
+                parent,
+                scheduler,
+                resolution,
+                dataset_config,
+                **dataset_args,
+            )
+        case "Spectral Data":
+            if dataset_args.get("data_subtype") == "Composite Plot":
+                panel = CompositePlotPanel(
+                    parent,
+                    scheduler,
+                    resolution,
+                    dataset_config,
+                    plot_colors,
+                    **dataset_args,
+                )
+            else:
+                panel = SpectralPlotPanel(
+                    parent,
+                    scheduler,
+                    resolution,
+                    dataset_config,
+                    plot_colors,
+                    **dataset_args,
+                )
+        case "Additional Data":
+            panel = SpectralPlotPanel(
+                parent,
+                scheduler,
+                resolution,
+                dataset_config,
+                plot_colors,
+                **dataset_args,
+            )
+
+    return panel
+
+
+def data_depth_range(dataset_args: dict) -> tuple:
+    """Returns the start and end depth (m) of the selected data.
+
+    Args:
+        dataset_args(dict): Parameters of the panel.
+    """
+    dataset_config = dataset_args.get("config")
+    if dataset_args["data_subtype"] == "Geochemistry":
+        geochem_info = dataset_config.data(
+            dataset_args["data_type"],
+            dataset_args["data_subtype"],
+            dataset_args["data_name"],
+        )
+        return geochem_info["meter_start"], geochem_info["meter_end"]
+
+    return dataset_config.meter_start(), dataset_config.meter_end()
 
-METER_RES_LEVELS = {
-    0: 5,
-    1: 10,
-    2: 15,
-    3: 20,
-    4: 25,
-    5: 30,
-    6: 35,
-    7: 40,
-    8: 45,
-    9: 50,
-}
+
+def panel_image_name(dataset_args: dict) -> str:
+    """Returns the default file name used when exporting a panel image.
+
+    Args:
+        dataset_args(dict): Parameters of the panel.
+    """
+    if dataset_args.get("data_subtype") not in [
+        "Composite Images",
+        "Composite Plot",
+    ]:
+        return (
+            f"{dataset_args.get('dataset_name')}_"
+            + f"{dataset_args.get('data_subtype')}_"
+            + f"{dataset_args.get('data_name')}.png"
+        )
+
+    return (
+        "_".join(
+            [
+                dataset_args.get("dataset_name"),
+                dataset_args.get("data_subtype"),
+                *dataset_args.get("data_name"),
+            ]
+        ).replace(" ", "_")
+        + ".png"
+    )
 
 
 class Dashboard(QScrollArea):
     """Main display area for spectral image and data
 
     Signals:
-        zoom_changed(int): Resizes panels on zoom in/out actions.
+        zoom_previewed(float): Previews panels at a new resolution (px/m)
+            while zooming.
+        zoom_changed(float): Renders panels at a new resolution (px/m) once
+            zooming has stopped.
         meter_changed(float, int): Updates panels when the meter is updated
             i.e. the app is resized or someone loads data that extends
             beyond the curent meter.
     """
 
-    zoom_changed = Signal(int)
+    zoom_previewed = Signal(float)
+    zoom_changed = Signal(float)
     meter_changed = Signal(float, int)
 
     def __init__(self, parent=None, mineral_legend: QWidget = None) -> None:
@@ -55,20 +214,27 @@ class Dashboard(QScrollArea):
         """
         super().__init__(parent)
 
-        self.threadpool = QThreadPool()
+        self.scheduler = PanelScheduler(self)
 
-        self.zoom_level = 0
+        self.resolution = MIN_RESOLUTION
         self.mineral_legend = mineral_legend
         self.colormap = {}
 
+        # zooming and resizing are merged into one update per frame
+        self.render_coordinator = RenderCoordinator(self, self.resolution)
+        self.render_coordinator.zoom_previewed.connect(self._preview_zoom)
+        self.render_coordinator.zoom_settled.connect(self.zoom_changed)
+        self.render_coordinator.meter_changed.connect(self.meter_changed)
+        # position (px) in the viewport whose depth is kept in place by zooms
+        self._zoom_anchor_y = 0
+
         layout = QGridLayout(self)
 
-        resolution = METER_RES_LEVELS[self.zoom_level]
         self.meter_height = 0
 
-        self.meter = Meter(self, resolution, self.meter_height, 0)
+        self.meter = Meter(self, self.resolution, self.meter_height, 0)
         self.meter.setFixedWidth(60)
-        self.zoom_changed.connect(self.meter.zoom_changed)
+        self.zoom_previewed.connect(self.meter.zoom_changed)
         self.meter_changed.connect(self.meter.update_size)
 
         meter_scroll = QScrollArea(self)
@@ -78,6 +244,18 @@ class Dashboard(QScrollArea):
         meter_scroll.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
         meter_scroll.setFixedWidth(60)
 
+        self.minimap = Minimap(self)
+        self.minimap.depth_selected.connect(self.jump_to_depth)
+        # panels finish loading in bursts, the minimap is redrawn once
+        # they've settled
+        self._minimap_timer = QTimer(self)
+        self._minimap_timer.setSingleShot(True)
+        self._minimap_timer.setInterval(MINIMAP_INTERVAL)
+        self._minimap_timer.timeout.connect(self.update_minimap)
+        # the overview of each panel in the minimap, kept for panels that
+        # have released their images
+        self._minimap_columns = {}
+
         header_content = QWidget()
         header_content.setFixedHeight(80)
 
@@ -113,6 +291,15 @@ class Dashboard(QScrollArea):
             self.data_container.insert_dragged_widget
         )
 
+        # scroll and drag events arrive in bursts, panels are only released
+        # and restored once they settle
+        self._release_timer = QTimer(self)
+        self._release_timer.setSingleShot(True)
+        self._release_timer.setInterval(100)
+        self._release_timer.timeout.connect(self.release_offscreen_panels)
+        self.header_container.widget_dragged.connect(self._release_timer.start)
+        self.header_container.widget_dragged.connect(self._minimap_timer.start)
+
         data_content_layout.addWidget(self.data_container)
 
         data_content_scroll = QScrollArea(self)
@@ -125,6 +312,38 @@ class Dashboard(QScrollArea):
             header_scroll.horizontalScrollBar().setValue
         )
 
+        # panels scrolled into view should load before those out of view
+        data_content_scroll.horizontalScrollBar().valueChanged.connect(
+            self.scheduler.request_reprioritise
+        )
+        data_content_scroll.horizontalScrollBar().valueChanged.connect(
+            self._release_timer.start
+        )
+
+        # velocity (px/s, positive downwards) and direction (1 down, -1 up)
+        # of vertical scrolling, used to load the rows being scrolled towards
+        # first
+        self.scroll_velocity = 0.0
+        self.scroll_direction = 1
+        self._scroll_value = 0
+        self._scroll_clock = QElapsedTimer()
+        self._scroll_clock.start()
+        self._scroll_settle_timer = QTimer(self)
+        self._scroll_settle_timer.setSingleShot(True)
+        self._scroll_settle_timer.setInterval(SCROLL_SETTLE_INTERVAL)
+        self._scroll_settle_timer.timeout.connect(self._settle_scroll)
+        data_content_scroll.verticalScrollBar().valueChanged.connect(
+            self._track_scroll
+        )
+        data_content_scroll.verticalScrollBar().valueChanged.connect(
+            self.update_minimap_view
+        )
+        # panels in view whose images were evicted by the memory budget are
+        # restored once scrolling settles
+        data_content_scroll.verticalScrollBar().valueChanged.connect(
+            self._release_timer.start
+        )
+
         # sync scrollbars for various QScrollAreas
         data_content_scroll.verticalScrollBar().valueChanged.connect(
             meter_scroll.verticalScrollBar().setValue
@@ -154,11 +373,15 @@ class Dashboard(QScrollArea):
             border: 2px solid white"""
         )
 
+        self.data_content_scroll = data_content_scroll
         self.viewport = data_content_scroll.viewport()
+        # ctrl + scrolling zooms instead of scrolling
+        self.viewport.installEventFilter(self)
 
-        layout.addWidget(meter_scroll, 1, 0)
-        layout.addWidget(header_content, 0, 1)
-        layout.addWidget(data_content_scroll, 1, 1)
+        layout.addWidget(self.minimap, 1, 0)
+        layout.addWidget(meter_scroll, 1, 1)
+        layout.addWidget(header_content, 0, 2)
+        layout.addWidget(data_content_scroll, 1, 2)
         layout.setSpacing(0)
         layout.setContentsMargins(0, 0, 0, 0)
 
@@ -172,81 +395,22 @@ class Dashboard(QScrollArea):
             dataset_args (dict): Parameters for the new dataset.
         """
         dataset_config = dataset_args.get("config")
-        if dataset_args["data_subtype"] == "Geochemistry":
-            geochem_info = dataset_config.data(
-                dataset_args["data_type"],
-                dataset_args["data_subtype"],
-                dataset_args["data_name"],
-            )
-            meter_end = geochem_info["meter_end"]
-            meter_start = geochem_info["meter_start"]
-
-        else:
-            meter_end = dataset_config.meter_end()
-            meter_start = dataset_config.meter_start()
+        _, meter_end = data_depth_range(dataset_args)
 
         self.mineral_legend.add_minerals(dataset_args.get("data_name"))
         plot_colors = self.mineral_legend.color(dataset_args.get("data_name"))
 
         if meter_end > self.data_container.max_panel_depth():
             meter_height = self.viewport.height()
-            self.meter_changed.emit(meter_end, meter_height)
-
-        match dataset_args.get("data_type"):
-            case "Spectral Images":
-                if dataset_args.get("data_subtype") == "Composite Images":
-                    panel = CompositeImagePanel(
-                        self.data_container,
-                        self.threadpool,
-                        METER_RES_LEVELS[self.zoom_level],
-                        dataset_config,
-                        plot_colors,
-                        **dataset_args,
-                    )
-                else:
-                    panel = CoreImagePanel(
-                        self.data_container,
-                        self.threadpool,
-                        METER_RES_LEVELS[self.zoom_level],
-                        dataset_config,
-                        **dataset_args,
-                    )
-            case "Corebox Images":
-                panel = CoreImagePanel(
-                    self.data_container,
-                    self.threadpool,
-                    METER_RES_LEVELS[self.zoom_level],
-                    dataset_config,
-                    **dataset_args,
-                )
-            case "Spectral Data":
-                if dataset_args.get("data_subtype") == "Composite Plot":
-                    panel = CompositePlotPanel(
-                        self.data_container,
-                        self.threadpool,
-                        METER_RES_LEVELS[self.zoom_level],
-                        dataset_config,
-                        plot_colors,
-                        **dataset_args,
-                    )
-                else:
-                    panel = SpectralPlotPanel(
-                        self.data_container,
-                        self.threadpool,
-                        METER_RES_LEVELS[self.zoom_level],
-                        dataset_config,
-                        plot_colors,
-                        **dataset_args,
-                    )
-            case "Additional Data":
-                panel = SpectralPlotPanel(
-                    self.data_container,
-                    self.threadpool,
-                    METER_RES_LEVELS[self.zoom_level],
-                    dataset_config,
-                    plot_colors,
-                    **dataset_args,
-                )
+            self.render_coordinator.request_meter(meter_end, meter_height)
+
+        panel = create_data_panel(
+            self.data_container,
+            self.scheduler,
+            self.resolution,
+            plot_colors,
+            dataset_args,
+        )
 
         header = DataHeader(
             self.header_container,
@@ -256,60 +420,106 @@ class Dashboard(QScrollArea):
             **dataset_args,
         )
 
-        image_height = int(
-            (meter_end - meter_start) * METER_RES_LEVELS[self.zoom_level]
-        )
-
+        self.zoom_previewed.connect(panel.preview_zoom)
         self.zoom_changed.connect(panel.zoom_changed)
         panel.resize_header.connect(header.resize_header)
+        # panels change width as their images load, which moves the panels
+        # in view
+        panel.resize_header.connect(lambda _: self._release_timer.start())
         if dataset_args.get("data_subtype") == "Composite Plot":
             panel.update_axis_limits.connect(header.update_axis_limits)
         header.close_panel.connect(panel.close_panel)
+        header.close_panel.connect(self._minimap_timer.start)
+        panel.loading.connect(lambda _: self._minimap_timer.start())
         header.close_panel.connect(
             lambda: self.remove_legend_mineral(dataset_args["data_name"])
         )
 
-        if dataset_args.get("data_subtype") not in [
-            "Composite Images",
-            "Composite Plot",
-        ]:
-            image_name = (
-                f"{dataset_args.get('dataset_name')}_"
-                + f"{dataset_args.get('data_subtype')}_"
-                + f"{dataset_args.get('data_name')}.png"
-            )
-        else:
-            image_name = (
-                "_".join(
-                    [
-                        dataset_args.get("dataset_name"),
-                        dataset_args.get("data_subtype"),
-                        *dataset_args.get("data_name"),
-                    ]
-                ).replace(" ", "_")
-                + ".png"
-            )
+        image_name = panel_image_name(dataset_args)
         header.save_image.connect(
-            lambda panel=panel, img_name=image_name, img_height=image_height:
-                self.save_panel_image(
-                    panel, img_name, img_height
-                )
+            lambda panel=panel, img_name=image_name: self.save_panel_image(
+                panel, img_name
+            )
         )
 
         self.header_container.insert_panel(header)
         self.data_container.insert_panel(panel)
 
+        # the new panel's visibility is only known once it has been laid out
+        QTimer.singleShot(0, self.scheduler.reprioritise)
+        self._release_timer.start()
+
     def zoom_in(self) -> None:
         """Increases the resolution of the spectral data (px/m)."""
-        if self.zoom_level < 9:
-            self.zoom_level += 1
-            self.zoom_changed.emit(METER_RES_LEVELS[self.zoom_level])
+        self.zoom(ZOOM_STEP)
 
     def zoom_out(self) -> None:
         """Decreases the resolution of the spectral data (px/m)."""
-        if self.zoom_level > 0:
-            self.zoom_level -= 1
-            self.zoom_changed.emit(METER_RES_LEVELS[self.zoom_level])
+        self.zoom(1 / ZOOM_STEP)
+
+    def zoom(self, factor: float, anchor_y: int = None) -> None:
+        """Scales the resolution of the spectral data, keeping the depth at
+        a point in the viewport in place.
+
+        Args:
+            factor(float): The factor the resolution is multiplied by.
+            anchor_y(int): The position (px) in the viewport whose depth is
+                kept in place. Defaults to the middle of the viewport.
+        """
+        resolution = min(
+            max(self.resolution * factor, MIN_RESOLUTION), MAX_RESOLUTION
+        )
+        if resolution == self.resolution:
+            return
+
+        if anchor_y is None:
+            anchor_y = self.viewport.height() // 2
+        self._zoom_anchor_y = anchor_y
+
+        self.resolution = resolution
+        self.render_coordinator.request_zoom(resolution)
+
+    @Slot(float)
+    def _preview_zoom(self, resolution: float) -> None:
+        """Previews the panels and redraws the meter at the latest requested
+        resolution, keeping the depth at the zoom's anchor in place.
+
+        Args:
+            resolution(float): The new resolution (px/m).
+        """
+        anchor_y = self._zoom_anchor_y
+        scroll_bar = self.data_content_scroll.verticalScrollBar()
+        anchor_depth = (scroll_bar.value() + anchor_y) / self.meter.resolution
+
+        self.zoom_previewed.emit(resolution)
+        # image panels change width with the resolution
+        self._release_timer.start()
+        self.update_minimap_view()
+
+        # the scroll range is only updated once the panels have been laid out
+        QTimer.singleShot(
+            0,
+            lambda: scroll_bar.setValue(
+                int(anchor_depth * resolution - anchor_y)
+            ),
+        )
+
+    def eventFilter(self, watched: QObject, event: QEvent) -> bool:
+        """Zooms in or out when the data area is scrolled with ctrl held.
+
+        Args:
+            watched(QObject): The data area's viewport.
+            event(QEvent): The event sent to the viewport.
+        """
+        if (
+            event.type() == QEvent.Wheel
+            and event.modifiers() & Qt.ControlModifier
+        ):
+            steps = event.angleDelta().y() / WHEEL_STEP
+            if steps:
+                self.zoom(ZOOM_STEP**steps, int(event.position().y()))
+            return True
+        return super().eventFilter(watched, event)
 
     def resizeEvent(self, event: QResizeEvent) -> None:
         """Handles resizing of displayed components when the application is
@@ -322,8 +532,140 @@ class Dashboard(QScrollArea):
         if self.meter_height < 669:
             self.meter_height = 669
         max_depth = self.data_container.max_panel_depth()
-        self.meter_changed.emit(max_depth, self.meter_height)
+        self.render_coordinator.request_meter(max_depth, self.meter_height)
         self.add_dataset_button.move(self.width() - 85, self.height() - 85)
+        self._release_timer.start()
+        self._minimap_timer.start()
+        self.update_minimap_view()
+
+    @Slot()
+    def release_offscreen_panels(self) -> None:
+        """Releases the rendered images of panels scrolled more than
+        RELEASE_MARGIN out of view, and restores those scrolled back in,
+        including panels whose images were evicted by the memory budget.
+        Released panels keep their loaded data and width so the layout
+        doesn't change.
+
+        Panels in view are pinned in the memory budget so they're never
+        evicted.
+        """
+        view_left = self.data_content_scroll.horizontalScrollBar().value()
+        view_right = view_left + self.viewport.width()
+        left = view_left - RELEASE_MARGIN
+        right = view_right + RELEASE_MARGIN
+        in_view = []
+        for i in range(self.data_container.layout.count() - 2):
+            panel = self.data_container.layout.itemAt(i).widget()
+            geometry = panel.geometry()
+            panel.set_released(
+                geometry.right() < left or geometry.left() > right
+            )
+            if geometry.right() >= view_left and geometry.left() <= view_right:
+                in_view.append(panel)
+        memory_budget.set_pinned(in_view)
+
+    @Slot(int)
+    def _track_scroll(self, value: int) -> None:
+        """Updates the scroll velocity and direction when the data area is
+        scrolled vertically and points the panels' loads ahead of it.
+
+        Args:
+            value(int): The position (px) of the vertical scroll bar.
+        """
+        step = value - self._scroll_value
+        self._scroll_value = value
+        elapsed = self._scroll_clock.restart()
+        if step == 0:
+            return
+
+        direction = 1 if step > 0 else -1
+        velocity = step * 1000 / max(elapsed, 1)
+        if (
+            direction != self.scroll_direction
+            or elapsed > SCROLL_SETTLE_INTERVAL
+        ):
+            # the velocity isn't smoothed across reversals and pauses
+            self.scroll_velocity = velocity
+        else:
+            self.scroll_velocity = (
+                VELOCITY_SMOOTHING * velocity
+                + (1 - VELOCITY_SMOOTHING) * self.scroll_velocity
+            )
+        self.scroll_direction = direction
+
+        self.prefetch_ahead()
+        self._scroll_settle_timer.start()
+
+    @Slot()
+    def _settle_scroll(self) -> None:
+        """Points the panels' loads at the viewport once scrolling stops."""
+        self.scroll_velocity = 0.0
+        self.prefetch_ahead()
+
+    def prefetch_ahead(self) -> None:
+        """Points the loads of panels in view at the rows the data area is
+        being scrolled towards. Rows are loaded from the edge of the viewport
+        behind the scroll, or from PREFETCH_LEAD ahead of it at the current
+        scroll speed, in the direction of scrolling.
+        """
+        top = self._scroll_value
+        bottom = top + self.viewport.height()
+        lead = self.scroll_velocity * PREFETCH_LEAD
+        if self.scroll_direction > 0:
+            start = min(top + max(lead, 0), bottom)
+        else:
+            start = max(bottom + min(lead, 0), top)
+        # panels are drawn at the meter's resolution while zooming
+        start_depth = start / self.meter.resolution
+
+        for i in range(self.data_container.layout.count() - 2):
+            panel = self.data_container.layout.itemAt(i).widget()
+            if not panel.released:
+                panel.set_scroll_hint(start_depth, self.scroll_direction)
+
+    @Slot()
+    def update_minimap(self) -> None:
+        """Redraws the minimap's overview of the leftmost panels from the
+        images and data they hold.
+        """
+        depth = self.data_container.max_panel_depth()
+        height = self.minimap.height()
+        n_panels = self.data_container.layout.count() - 2
+        columns = {}
+        for i in range(min(n_panels, MAX_COLUMNS)):
+            panel = self.data_container.layout.itemAt(i).widget()
+            column = panel.overview(COLUMN_WIDTH, height, depth)
+            if column is None:
+                column = self._minimap_columns.get(panel)
+            columns[panel] = column
+        self._minimap_columns = columns
+        self.minimap.set_columns(depth, list(columns.values()))
+        self.update_minimap_view()
+
+    @Slot()
+    def update_minimap_view(self) -> None:
+        """Outlines the depths in view on the minimap."""
+        top = self.data_content_scroll.verticalScrollBar().value()
+        self.minimap.set_view(
+            top / self.meter.resolution,
+            (top + self.viewport.height()) / self.meter.resolution,
+        )
+
+    @Slot(float)
+    def jump_to_depth(self, depth: float) -> None:
+        """Scrolls straight to a depth, centring it in the viewport. Panels
+        load the rows at the new depth first, rather than every row in
+        between.
+
+        Args:
+            depth(float): The depth (m) to jump to.
+        """
+        self.data_content_scroll.verticalScrollBar().setValue(
+            int(depth * self.meter.resolution - self.viewport.height() / 2)
+        )
+        # a jump isn't scrolling, rows aren't prefetched past the viewport
+        self._scroll_settle_timer.stop()
+        self._settle_scroll()
 
     def remove_legend_mineral(self, closed_minerals: str | list) -> None:
         """Removes minerals from the legend when a panel is closed.
@@ -341,24 +683,57 @@ class Dashboard(QScrollArea):
             if mineral_list.count(mineral) == 1:
                 self.mineral_legend.remove_mineral(mineral)
 
-    def save_panel_image(
-        self, panel: DataPanel, image_name: str, image_height: int
-    ) -> None:
+    def save_panel_image(self, panel: DataPanel, image_name: str) -> None:
         """Allows the user to export the selected panel as a png image.
 
         Args:
-            panel_image(QPixmap): The pixmap of the selected panel.
+            panel(DataPanel): The selected panel.
             image_name(str): The resulting image's file name.
         """
-        panel_image = panel.grab(
-            rectangle=QRect(QPoint(0, 0), QPoint(panel.width, image_height))
-        )
-        meter_image = self.meter.grab(
-            rectangle=QRect(
-                QPoint(0, 0), QPoint(self.meter.width(), panel_image.height())
+        panel_renderer = panel.renderer()
+        if panel_renderer is None:
+            # panels have nothing to draw until their first load finishes
+            loading_message = Modal(
+                self.parent(), text=SavePanelWindow.title, size="sm"
             )
-        )
+            message = QLabel(
+                "The panel is still loading. It can be saved once it's loaded."
+            )
+            message.setAlignment(Qt.AlignCenter)
+            loading_message.add_content(message)
+            return
+
         save_panel_window = SavePanelWindow(
-            self.parent(), panel_image, meter_image, image_name
+            self.parent(),
+            panel_renderer,
+            MeterRenderer(panel_renderer.depth),
+            image_name,
+            round(self.resolution),
         )
         save_panel_window.show()
+
+    def save_strip_log(self) -> None:
+        """Allows the user to export every loaded panel with its header, the
+        meter and the mineral legend as a single strip log.
+        """
+        columns = []
+        for i in range(self.data_container.layout.count() - 2):
+            panel = self.data_container.layout.itemAt(i).widget()
+            header = self.header_container.layout.itemAt(i).widget()
+            panel_renderer = panel.renderer()
+            if panel_renderer is not None:
+                columns.append((panel_renderer, header.paint_header))
+
+        if not columns:
+            return
+
+        depth = max(panel_renderer.depth for panel_renderer, _ in columns)
+        save_strip_log_window = SaveStripLogWindow(
+            self.parent(),
+            columns,
+            MeterRenderer(depth),
+            LegendRenderer(dict(self.mineral_legend.colormap)),
+            "strip_log.png",
+            round(self.resolution),
+        )
+        save_strip_log_window.show()
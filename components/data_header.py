@@ -1,6 +1,6 @@
 from typing import Callable
 
-from PySide6.QtCore import Qt, QMimeData, QPoint, Signal, Slot
+from PySide6.QtCore import Qt, QMimeData, QPoint, QRect, Signal, Slot
 from PySide6.QtGui import (
     QAction,
     QDrag,
@@ -22,6 +22,39 @@ from PySide6.QtWidgets import (
 
 from data.dataset import Dataset
 
+# height of a data header in pixels
+HEADER_HEIGHT = 80
+
+
+def paint_axis_scale(
+    qp: QPainter, width: int, axis_limits: list, axis_unit: str
+) -> None:
+    """Paints a panel's 20 pixel high axis scale.
+
+    Args:
+        qp(QPainter): The painter, its origin is the top left of the scale.
+        width(int): The width of the scale in pixels.
+        axis_limits(list): The minimum and maximum values of the axis.
+        axis_unit(str): The unit of the axis values.
+    """
+    qp.setBrush(QColor(0, 0, 0))  # paint meter background black
+    qp.drawRect(0, 0, width, 20)
+    qp.setBrush(QColor(222, 222, 222))  # set color for ticks and text
+    qp.setPen(QColor(222, 222, 222))
+    qp.drawRect(0, 0, 1, 20)
+    qp.drawRect(width - 2, 0, 1, 20)
+    qp.drawRect(int(width / 2), 10, 0.5, 10)
+
+    if axis_limits[0] is not None and axis_limits[1] is not None:
+        font_metric = QFontMetrics(qp.font())
+        axis_limit_str = [f"{limit:.2f} {axis_unit}" for limit in axis_limits]
+        right_label_width = font_metric.size(
+            Qt.TextSingleLine, axis_limit_str[1]
+        ).width()
+
+        qp.drawText(5, 15, axis_limit_str[0])
+        qp.drawText(width - right_label_width - 5, 15, axis_limit_str[1])
+
 
 class DataHeader(QWidget):
     """Header component for data panels.
@@ -51,7 +84,7 @@ class DataHeader(QWidget):
         """
         super().__init__(parent=parent)
 
-        dataset_name = kwargs.get("dataset_name")
+        self.dataset_name = kwargs.get("dataset_name")
         self.data_type = kwargs.get("data_type")
         self.data_subtype = kwargs.get("data_subtype")
         self.data_name = kwargs.get("data_name")
@@ -74,7 +107,7 @@ class DataHeader(QWidget):
 
         dataset_label = QLabel(title_container)
         dataset_label.setFixedHeight(20)
-        dataset_label.setText(dataset_name)
+        dataset_label.setText(self.dataset_name)
         dataset_label.setStyleSheet(
             "background-color: transparent; \
                 font: bold 10pt; border: transparent"
@@ -174,7 +207,7 @@ class DataHeader(QWidget):
         self.layout.addWidget(dataname_label)
         self.layout.addWidget(self.axis_limits_label)
 
-        self.setFixedSize(width, 80)
+        self.setFixedSize(width, HEADER_HEIGHT)
 
     def mouseMoveEvent(self, event) -> None:
         """Event triggered on mouse movement. Used for drag/drop
@@ -266,30 +299,48 @@ class DataHeader(QWidget):
         pixmap = QPixmap(width, 20)
 
         qp = QPainter(pixmap)  # initiate painter
-        qp.setBrush(QColor(0, 0, 0))  # paint meter background black
-        qp.drawRect(0, 0, width, 20)
-        qp.setBrush(QColor(222, 222, 222))  # set color for ticks and text
-        qp.setPen(QColor(222, 222, 222))
-        qp.drawRect(0, 0, 1, 20)
-        qp.drawRect(width - 2, 0, 1, 20)
-        qp.drawRect(int(width / 2), 10, 0.5, 10)
-
-        if self.axis_limits[0] is not None and self.axis_limits[1] is not None:
-            font_metric = QFontMetrics(QFont())
-            axis_limit_str = [
-                f"{limit:.2f} {self.axis_unit}" for limit in self.axis_limits
-            ]
-            right_label_width = font_metric.size(
-                Qt.TextSingleLine, axis_limit_str[1]
-            ).width()
-
-            qp.drawText(5, 15, axis_limit_str[0])
-            qp.drawText(width - right_label_width - 5, 15, axis_limit_str[1])
-
+        paint_axis_scale(qp, width, self.axis_limits, self.axis_unit)
         qp.end()
 
         self.axis_limits_label.setPixmap(pixmap)
 
+    def paint_header(self, qp: QPainter, width: int) -> None:
+        """Paints the header's labels and axis scale, used to draw the header
+        in exported images.
+
+        Args:
+            qp(QPainter): The painter, its origin is the top left of the
+                header.
+            width(int): The width of the header in pixels.
+        """
+        if isinstance(self.data_name, list):
+            data_name = " ".join(self.data_name)
+        else:
+            data_name = self.data_name
+
+        qp.save()
+        qp.fillRect(0, 0, width, 20, QColor(100, 100, 100, 150))
+        font = QFont(qp.font())
+        font.setBold(True)
+        font.setPointSize(10)
+        qp.setFont(font)
+        qp.setPen(QColor(222, 222, 222))
+        qp.drawText(QRect(0, 0, width, 20), Qt.AlignCenter, self.dataset_name)
+        for line, text in enumerate(
+            [f"{self.data_type}: {self.data_subtype}", data_name], start=1
+        ):
+            qp.drawText(
+                QRect(0, 20 * line, width, 20),
+                Qt.AlignLeft | Qt.AlignVCenter,
+                text,
+            )
+        qp.restore()
+
+        qp.save()
+        qp.translate(0, 60)
+        paint_axis_scale(qp, width, self.axis_limits, self.axis_unit)
+        qp.restore()
+
     def _get_other_panel_options(self, dataset: Dataset) -> dict:
         """Returns a list of other panels for the selected mineral.
 
@@ -1,15 +1,18 @@
 from PySide6.QtCore import Signal, Slot
-from PySide6.QtGui import QResizeEvent
-from PySide6.QtWidgets import (
-    QSpacerItem,
-    QVBoxLayout,
-    QWidget,
-)
+from PySide6.QtGui import QColor, QImage, QPixmap, QResizeEvent
+from PySide6.QtWidgets import QVBoxLayout, QWidget
 
 import numpy as np
 
 from data.dataset import Dataset
 from components.loading_panel import LoadingPanel
+from components.panel_renderer import PanelRenderer
+from hsu_viewer.memory_budget import memory_budget
+from hsu_viewer.profiler import profiler
+from hsu_viewer.worker import Worker
+
+# number of row images loaded between each partial update of image panels
+ROW_BATCH_SIZE = 16
 
 
 class DataPanel(QWidget):
@@ -18,16 +21,26 @@ class DataPanel(QWidget):
     Signals:
         resize_header(int): Resizes a panel's header when its width chagnes.
         loading(bool): Triggers loading display during panel operations.
+
+    Attributes:
+        load_cost(str): The type of load job used to prioritise this panel in
+            the PanelScheduler ("plot", "image" or "composite").
+        memory_kind(str): The kind of rendered images the panel keeps, as
+            recorded in the memory budget ("Images", "Composites" or
+            "Plots").
     """
 
     resize_header = Signal(int)
     loading = Signal(bool)
 
+    load_cost = "plot"
+    memory_kind = "Plots"
+
     def __init__(
         self,
         parent=None,
-        threadpool=None,
-        resolution: int = 0,
+        scheduler=None,
+        resolution: float = 0,
         dataset: Dataset = None,
         **kwargs
     ) -> None:
@@ -35,14 +48,14 @@ class DataPanel(QWidget):
 
         Args:
             parent(None/QWidget): The parent widget.
-            threadpool(None/QThreadpool): The threadpool used to handle async
+            scheduler(None/PanelScheduler): The scheduler used to handle async
                 operations.
-            resolution(int): The curently selected resolution (px/m)
+            resolution(float): The curently selected resolution (px/m)
             dataset(Dataset): The dataset object for the selected mineral data.
         """
         super().__init__(parent=parent)
 
-        self.threadpool = threadpool
+        self.scheduler = scheduler
         self.resolution = resolution
         self.dataset = dataset
         self.dataset_name = kwargs.get("dataset_name")
@@ -54,6 +67,18 @@ class DataPanel(QWidget):
         )
         self.csv_data = self.dataset.config.get("csv_data")
 
+        # id of the latest load and of the load that created the image tiles
+        self._load_id = 0
+        self._row_tiles_load_id = None
+
+        # True while the panel is scrolled far enough out of view that its
+        # rendered images have been released
+        self.released = False
+
+        # depth (m) and direction (1 down, -1 up) row loads are pointed at
+        # while the dashboard is scrolled, see set_scroll_hint
+        self.scroll_hint = None
+
         self.loading_panel = LoadingPanel(self)
         self.loading_panel.raise_()
         self.loading.connect(self.set_loading)
@@ -67,8 +92,75 @@ class DataPanel(QWidget):
     @Slot()
     def close_panel(self) -> None:
         """Deletes the panel on close."""
+        if self.scheduler:
+            self.scheduler.cancel(self)
+        memory_budget.remove(self)
         self.deleteLater()
 
+    def set_released(self, released: bool) -> None:
+        """Releases the panel's rendered images while it's scrolled out of
+        view, or renders them again once it's back in view. The panel's
+        loaded data is kept so it can be rendered again without reading it.
+
+        Args:
+            released(bool): Whether the panel is out of view.
+        """
+        if not released:
+            memory_budget.touch(self)
+        if released == self.released:
+            return
+
+        self.released = released
+        if released:
+            if self.scheduler:
+                self.scheduler.cancel(self)
+            # results of loads that have already started are discarded
+            self._load_id = self._load_id + 1
+            self._release_images()
+            # compact copies kept by released image panels are a small
+            # fraction of their images and aren't counted
+            memory_budget.remove(self, self.memory_kind)
+        else:
+            self._restore_images()
+
+    def _release_images(self) -> None:
+        """Frees the panel's rendered images. See set_released."""
+
+    def _restore_images(self) -> None:
+        """Renders the panel's images again at the current resolution. See
+        set_released.
+        """
+
+    def image_bytes(self) -> int:
+        """Returns the memory (bytes) used by the panel's rendered images."""
+        return 0
+
+    def data_bytes(self) -> int:
+        """Returns the memory (bytes) used by the panel's loaded data."""
+        return 0
+
+    def _update_memory(self) -> None:
+        """Records the memory used by the panel's rendered images and loaded
+        data in the memory budget, which may evict other panels' images and
+        data to make room for them.
+        """
+        memory_budget.set(
+            self, self.memory_kind, self.image_bytes(), self._evict_images
+        )
+        memory_budget.set(self, "Data", self.data_bytes(), self._evict_data)
+
+    def _evict_images(self) -> None:
+        """Releases the panel's rendered images when they're evicted from
+        the memory budget. They're rendered again once the dashboard finds the
+        panel in view.
+        """
+        self.set_released(True)
+
+    def _evict_data(self) -> None:
+        """Frees the panel's loaded data when it's evicted from the memory
+        budget. Data is read again when it's next needed.
+        """
+
     @Slot(bool)
     def set_loading(self, show_loading: bool) -> None:
         """Displays the loading image during data operations.
@@ -96,6 +188,16 @@ class DataPanel(QWidget):
         """
         self.resize_header.emit(self.geometry().width())
 
+    @Slot(float)
+    def preview_zoom(self, resolution: float) -> None:
+        """Shows the panel at a new resolution while zooming, before it is
+        rendered at it by zoom_changed. Panels without a preview keep their
+        current size until then.
+
+        Args:
+            resolution(float): The new resolution (px/m).
+        """
+
     def hex_to_rgb(self, hex):
         """Converts hex color codes to rgb
 
@@ -104,6 +206,47 @@ class DataPanel(QWidget):
         """
         return np.array([int(hex[i : i + 2], 16) for i in (0, 2, 4)])
 
+    def array_to_image(self, image_array: np.ndarray) -> QImage:
+        """Converts a (height, width, 3) uint8 array to an image.
+
+        Args:
+            image_array(np.ndarray): The RGB image.
+        """
+        height, width, _ = image_array.shape
+        image = QImage(
+            np.ascontiguousarray(image_array).data,
+            width,
+            height,
+            3 * width,
+            QImage.Format_RGB888,
+        )
+        # the image shares the array's memory until it is copied
+        return image.copy()
+
+    def scaled_row_image(
+        self, image_array: np.ndarray, height: float
+    ) -> QImage:
+        """Converts a row image to an image scaled to the height of its tile.
+        Only a QImage is created so this can be called from worker threads,
+        images are converted to pixmaps when they're displayed.
+
+        Args:
+            image_array(np.ndarray): The (height, width, 3) uint8 RGB image.
+            height(float): The height of the row's tile in pixels.
+        """
+        return self.array_to_image(image_array).scaledToHeight(int(height))
+
+    def blank_row_image(self, width: int, height: float) -> QImage:
+        """Returns a black image used to fill the tile above the first row.
+
+        Args:
+            width(int): The width of the image in pixels.
+            height(float): The height of the image in pixels.
+        """
+        image = QImage(int(width), int(height), QImage.Format_RGB32)
+        image.fill(QColor(0, 0, 0))
+        return image
+
     def composite_tooltip(self, plot_colors: dict) -> str:
         """Creates the legend tooltip for composit plots with one or more
         mineral.
@@ -124,13 +267,184 @@ class DataPanel(QWidget):
                 tag = tag + "<br>"
         return tag
 
-    def clear_image_tiles(self) -> None:
-        """Removes all image tiles in a panel."""
-        for i in reversed(range(self.image_frame_layout.count())):
-            item = self.image_frame_layout.itemAt(i)
-            if not isinstance(item, QSpacerItem):
-                item.widget().setVisible(False)
-                item.widget().deleteLater()
+    def visible_depth(self) -> float:
+        """Returns the depth (m) at the top of the panel's visible area."""
+        visible_rect = self.visibleRegion().boundingRect()
+        if visible_rect.isEmpty() or not self.resolution:
+            return 0
+        return visible_rect.top() / self.resolution
+
+    def set_scroll_hint(self, depth: float, direction: int) -> None:
+        """Points the panel's row loads at the depth the dashboard is being
+        scrolled towards. Loads that are running switch to the rows ahead of
+        the hint before their next batch, so rows queued in the previous
+        direction wait until the rest have been loaded.
+
+        Args:
+            depth(float): The depth (m) of the first row to load next.
+            direction(int): 1 to load downwards from depth first, -1 to
+                load upwards.
+        """
+        # replaced rather than changed so loads can tell it's been updated
+        self.scroll_hint = (depth, direction)
+
+    def row_load_order(
+        self, meter: np.ndarray, start_depth: float, direction: int = 1
+    ) -> list:
+        """Returns the order in which row images should be loaded. Rows from
+        start_depth in the direction of scrolling are loaded first, followed
+        by the rows behind it.
+
+        Args:
+            meter(np.ndarray): The start and end depth of each row.
+            start_depth(float): The depth (m) of the first row to be loaded.
+            direction(int): 1 to load downwards first, -1 to load upwards.
+        """
+        n_rows = meter.shape[0]
+        start_row = int(np.searchsorted(meter[:, 1], start_depth, "right"))
+        start_row = min(start_row, n_rows - 1)
+        if direction < 0:
+            return [
+                *reversed(range(start_row + 1)),
+                *range(start_row + 1, n_rows),
+            ]
+        return [*range(start_row, n_rows), *reversed(range(start_row))]
+
+    def row_batches(self, meter: np.ndarray, start_depth: float):
+        """Yields the rows to be loaded in batches of ROW_BATCH_SIZE. Rows
+        are loaded from start_depth downwards until the panel is given a new
+        scroll hint, after which the remaining rows are loaded from the
+        hint. Can be called from worker threads.
+
+        Args:
+            meter(np.ndarray): The start and end depth of each row.
+            start_depth(float): The depth (m) of the first row to be loaded.
+        """
+        hint = self.scroll_hint
+        order = self.row_load_order(meter, start_depth)
+        loaded = np.zeros(meter.shape[0], dtype=bool)
+        while order:
+            if self.scroll_hint is not hint:
+                hint = self.scroll_hint
+                order = [
+                    row_idx
+                    for row_idx in self.row_load_order(meter, *hint)
+                    if not loaded[row_idx]
+                ]
+            batch_rows = order[:ROW_BATCH_SIZE]
+            order = order[ROW_BATCH_SIZE:]
+            loaded[batch_rows] = True
+            yield batch_rows
+
+    def stream_rows(self, worker: Worker) -> None:
+        """Connects a row image loading job to the panel so that rows are
+        displayed in batches as they are loaded.
+
+        Args:
+            worker(Worker): The job loading the panel's row images. Its
+                function must accept a partial_callback keyword argument.
+        """
+        self._load_id = self._load_id + 1
+        load_id = self._load_id
+        worker.kwargs["partial_callback"] = worker.signals.partial_result.emit
+        worker.signals.partial_result.connect(
+            lambda batch: self._display_row_batch(load_id, batch)
+        )
+        worker.signals.result.connect(
+            lambda result: self._display_core_images(result, load_id)
+        )
+        worker.signals.finished.connect(self._on_finish)
+
+    @profiler.phase("widget build")
+    def _display_row_batch(self, load_id: int, batch: tuple) -> None:
+        """Displays a batch of row images while the rest are loading.
+
+        Args:
+            load_id(int): The id of the load that produced the batch.
+            batch(tuple): The start and end depth (m) of every tile and a list
+                of (tile index, QImage) pairs for the rows in this batch.
+        """
+        if load_id != self._load_id:
+            return
+
+        tile_meter, rows = batch
+
+        if self._row_tiles_load_id != load_id:
+            self.image_frame.set_tiles(tile_meter)
+            self._row_tiles_load_id = load_id
+
+        # pixmaps can only be made on the gui thread, the whole batch is
+        # converted here
+        self.image_frame.set_pixmaps(
+            [(idx, QPixmap.fromImage(image)) for idx, image in rows]
+        )
+        self._update_width()
+        self._update_memory()
+
+    @profiler.phase("widget build")
+    def _display_core_images(self, result: tuple, load_id: int = None) -> None:
+        """Displays the row images in the image_frame canvas.
+
+        Args:
+            result(tuple): The start and end depth (m) and QImage of every
+                tile.
+            load_id(int): The id of the load that produced the images.
+        """
+        if load_id is not None and load_id != self._load_id:
+            return
+
+        tile_meter, images = result
+
+        # tiles already filled by batches of this load are kept
+        streamed = load_id is not None and self._row_tiles_load_id == load_id
+        if not streamed:
+            self.image_frame.set_tiles(tile_meter)
+            self._row_tiles_load_id = load_id
+
+        self.image_frame.set_pixmaps(
+            [
+                (idx, QPixmap.fromImage(image))
+                for idx, image in enumerate(images)
+                if not streamed or not self.image_frame.is_current(idx)
+            ]
+        )
+        self._update_width()
+        self._update_memory()
+
+    def _update_width(self) -> None:
+        """Resizes the panel to the width of its image_frame canvas."""
+        frame_width = self.image_frame.width()
+        if frame_width and frame_width != self.width:
+            self.width = frame_width
+            self.setFixedWidth(self.width)
+
+    def overview(self, width: int, height: int, depth: float) -> QImage | None:
+        """Returns the panel's data drawn into a small image of the whole
+        hole for the dashboard's minimap, using only the images and data
+        already in memory. None if there's nothing to draw it from.
+
+        Args:
+            width(int): The width of the overview (px).
+            height(int): The height of the overview (px).
+            depth(float): The depth (m) at the bottom of the overview.
+        """
+        return None
+
+    def renderer(self) -> PanelRenderer | None:
+        """Returns a renderer that draws the panel's data at any resolution,
+        or None if the panel hasn't loaded its data yet.
+        """
+        return None
+
+    def has_mineral(self, mineral: str) -> bool:
+        """Returns True if the panel displays the given mineral.
+
+        Args:
+            mineral(str): The name of the mineral.
+        """
+        if isinstance(self.data_name, list):
+            return mineral in self.data_name
+        return mineral == self.data_name
 
     def update_plot_colors(self, mineral: str, color: str) -> None:
         """Updates the mineral colors used in plots and composite images"""
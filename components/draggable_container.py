@@ -147,12 +147,13 @@ class DraggableContainer(QWidget):
         self.depth_marker.show()
 
     def update_mineral_colors(self, mineral: str, color: str) -> None:
-        """Updates the colormap ofeach panel.
+        """Updates the colormap of each panel that displays the mineral.
 
         Args:
             mineral(str): The name of the mineral to be updated.
             color(str): The new color (hex).
-        """        
+        """
         for i in range(self.layout.count() - 2):
             panel = self.layout.itemAt(i).widget()
-            panel.update_plot_colors(mineral, color)
+            if panel.has_mineral(mineral):
+                panel.update_plot_colors(mineral, color)
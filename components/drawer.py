@@ -8,7 +8,11 @@ from PySide6.QtWidgets import (
 )
 
 from components.mineral_colorbars import MineralColorbars
+from components.memory_usage import MemoryUsage
 from components.mineral_legend import MineralLegend
+from components.profiler_overlay import ProfilerOverlay
+from hsu_viewer.memory_budget import memory_budget
+from hsu_viewer.profiler import profiler
 
 
 class Drawer(QWidget):
@@ -23,15 +27,25 @@ class Drawer(QWidget):
         self.add_dataset_button = QPushButton("Add Data")
         self.add_dataset_button.setStyleSheet("background-color: green;")
 
-        self.mineral_colorbars = MineralColorbars(self)
-        self.mineral_legend = MineralLegend(self)
+        self.save_strip_log_button = QPushButton("Export Strip Log")
+        self.save_strip_log_button.setStyleSheet("border: 1px solid white;")
 
-        content_panel_layout = QVBoxLayout(self.content_panel)
-        content_panel_layout.setContentsMargins(5, 20, 5, 20)
-        content_panel_layout.addWidget(self.add_dataset_button)
-        content_panel_layout.addWidget(self.mineral_legend)
-        content_panel_layout.addStretch()
-        content_panel_layout.addWidget(self.mineral_colorbars)
+        # the colorbars aren't visible until the drawer is opened so they're
+        # created then rather than at startup
+        self.mineral_colorbars = None
+        self.mineral_legend = MineralLegend(self)
+        self.memory_usage = MemoryUsage(self, memory_budget)
+
+        self.content_panel_layout = QVBoxLayout(self.content_panel)
+        self.content_panel_layout.setContentsMargins(5, 20, 5, 20)
+        self.content_panel_layout.addWidget(self.add_dataset_button)
+        self.content_panel_layout.addWidget(self.save_strip_log_button)
+        self.content_panel_layout.addWidget(self.mineral_legend)
+        self.content_panel_layout.addWidget(self.memory_usage)
+        if profiler.enabled:
+            self.profiler_overlay = ProfilerOverlay(self, profiler)
+            self.content_panel_layout.addWidget(self.profiler_overlay)
+        self.content_panel_layout.addStretch()
         self.content_panel.hide()
 
         self.button_panel = QWidget(self)
@@ -90,6 +104,9 @@ class Drawer(QWidget):
             )
             self._expanded = False
         else:
+            if self.mineral_colorbars is None:
+                self.mineral_colorbars = MineralColorbars(self)
+                self.content_panel_layout.addWidget(self.mineral_colorbars)
             self.content_panel.show()
             self.drawer_button.setIcon(
                 QIcon(QPixmap(":/caret_left.svg").scaledToWidth(12))
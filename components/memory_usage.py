@@ -0,0 +1,98 @@
+from PySide6.QtCore import QTimer
+from PySide6.QtGui import QHideEvent, QShowEvent
+from PySide6.QtWidgets import (
+    QHBoxLayout,
+    QLabel,
+    QProgressBar,
+    QSpinBox,
+    QVBoxLayout,
+    QWidget,
+)
+
+from hsu_viewer.memory_budget import KINDS, MemoryBudget
+
+# how often the usage is refreshed while visible (ms)
+REFRESH_INTERVAL = 1000
+
+# range and step of the budget that can be selected (MB)
+MIN_BUDGET = 256
+MAX_BUDGET = 65536
+BUDGET_STEP = 256
+
+
+class MemoryUsage(QWidget):
+    """Shows the memory used by the images and data cached by the panels and
+    sets the memory budget they're limited to.
+    """
+
+    def __init__(
+        self, parent=None, memory_budget: MemoryBudget = None
+    ) -> None:
+        """Initialize component
+
+        Args:
+            parent(None/QWidget): The parent widget.
+            memory_budget(MemoryBudget): The budget whose usage is displayed.
+        """
+        super().__init__(parent=parent)
+
+        self.memory_budget = memory_budget
+
+        title = QLabel("Memory", self)
+
+        self.usage_bar = QProgressBar(self)
+        self.usage_bar.setFormat("%v / %m MB")
+
+        self.kinds_label = QLabel(self)
+
+        budget_label = QLabel("Budget (MB)", self)
+        self.budget_box = QSpinBox(self)
+        self.budget_box.setRange(MIN_BUDGET, MAX_BUDGET)
+        self.budget_box.setSingleStep(BUDGET_STEP)
+        self.budget_box.setValue(memory_budget.budget // 1024**2)
+        self.budget_box.valueChanged.connect(self.set_budget)
+
+        budget_layout = QHBoxLayout()
+        budget_layout.addWidget(budget_label)
+        budget_layout.addWidget(self.budget_box)
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(title)
+        layout.addWidget(self.usage_bar)
+        layout.addWidget(self.kinds_label)
+        layout.addLayout(budget_layout)
+
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setInterval(REFRESH_INTERVAL)
+        self.refresh_timer.timeout.connect(self.refresh)
+
+    def showEvent(self, event: QShowEvent) -> None:
+        self.refresh()
+        self.refresh_timer.start()
+
+    def hideEvent(self, event: QHideEvent) -> None:
+        self.refresh_timer.stop()
+
+    def refresh(self) -> None:
+        """Updates the displayed usage with the budget's current totals."""
+        usage = self.memory_budget.usage()
+        self.usage_bar.setMaximum(self.memory_budget.budget // 1024**2)
+        self.usage_bar.setValue(
+            min(sum(usage.values()), self.memory_budget.budget) // 1024**2
+        )
+        self.kinds_label.setText(
+            "  ".join(
+                f"{kind}: {usage[kind] / 1024**2:.1f} MB" for kind in KINDS
+            )
+        )
+
+    def set_budget(self, budget: int) -> None:
+        """Changes the memory budget, evicting cached images and data if they
+        no longer fit.
+
+        Args:
+            budget(int): The new budget (MB).
+        """
+        self.memory_budget.set_budget(budget * 1024**2)
+        self.refresh()
@@ -3,6 +3,44 @@ from PySide6.QtCore import Qt, QPoint, Signal, Slot
 from PySide6.QtGui import QColor, QCursor, QPainter, QPixmap
 from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel, QSpacerItem
 
+# width of the meter in pixels
+METER_WIDTH = 60
+
+
+def paint_meter(
+    qp: QPainter,
+    top: int,
+    height: int,
+    resolution: int | float,
+    max_tick: float,
+) -> None:
+    """Paints the section of the meter between two pixel rows.
+
+    Args:
+        qp(QPainter): The painter, its origin is the top of the section.
+        top(int): The first pixel row of the section.
+        height(int): The height of the section in pixels.
+        resolution(int | float): The resolution of the meter (px/m).
+        max_tick(float): The maximum depth (m) a tick can be drawn at.
+    """
+    tick_values = np.arange(0, max_tick + 1, 10)
+    tick_pos = [int(value * resolution) for value in tick_values]
+    tile_ticks = [
+        (pos, value)
+        for pos, value in zip(tick_pos, tick_values)
+        if pos >= top and pos <= top + height
+    ]
+
+    qp.setBrush(QColor(0, 0, 0))  # paint meter background black
+    qp.drawRect(0, 0, METER_WIDTH, height)
+    qp.setBrush(QColor(222, 222, 222))  # set color for ticks and text
+    qp.setPen(QColor(222, 222, 222))
+
+    for pos, value in tile_ticks:
+        tick_pos = pos - top
+        qp.drawRect(15, tick_pos, 45, 1)
+        qp.drawText(QPoint(2, tick_pos + 17), "{:.1f}".format(value) + " m")
+
 
 class Meter(QWidget):
     depth_marker_toggled = Signal(bool, int)
@@ -11,7 +49,7 @@ class Meter(QWidget):
     def __init__(
         self,
         parent=None,
-        resolution: int = 0,
+        resolution: float = 0,
         height: int = 669,
         depth: int | float = 100,
     ) -> None:
@@ -19,7 +57,7 @@ class Meter(QWidget):
 
         Args:
             parent(None/QWidget): The parent widget.
-            resolution(int): The current resolution (px/m).
+            resolution(float): The current resolution (px/m).
             height(int): The height of the display area.
             depth(int): The maximum depth of the meter.
         """
@@ -58,14 +96,16 @@ class Meter(QWidget):
     def mousePressEvent(self, event):
         self.toggle_depth_marker()
 
-    @Slot(int)
-    def zoom_changed(self, resolution: int) -> None:
+    @Slot(float)
+    def zoom_changed(self, resolution: float) -> None:
         """Updates meter when resoltuion changes.
 
         Args:
-            resolution(int): New resolution (px/m).
+            resolution(float): New resolution (px/m).
         """
-        new_marker_pos = resolution * self.depth_marker.y() / self.resolution
+        new_marker_pos = int(
+            resolution * self.depth_marker.y() / self.resolution
+        )
         self.resolution = resolution
         self.add_meter_tiles()
         if self.show_depth_marker:
@@ -130,10 +170,6 @@ class Meter(QWidget):
         if total_height % tile_height != 0:
             stub_height = total_height % tile_height
 
-        tick_values = np.arange(0, max_tick + 1, 10)
-        tick_pos = [int(value * self.resolution) for value in tick_values]
-        ticks = dict(zip(tick_pos, tick_values))
-
         pixmaps = []
         for n in range(n_tiles):
             if stub_height and n == n_tiles - 1:
@@ -141,26 +177,13 @@ class Meter(QWidget):
             else:
                 pm_height = tile_height
 
-            start_px = n * tile_height
-            end_px = start_px + pm_height
-            tile_ticks = [
-                t for t in ticks.items() if t[0] >= start_px and t[0] <= end_px
-            ]
-
-            pixmap = QPixmap(60, pm_height)
+            pixmap = QPixmap(METER_WIDTH, pm_height)
 
             qp = QPainter(pixmap)  # initiate painter
-            qp.setBrush(QColor(0, 0, 0))  # paint meter background black
-            qp.drawRect(0, 0, 60, pm_height)
-            qp.setBrush(QColor(222, 222, 222))  # set color for ticks and text
-            qp.setPen(QColor(222, 222, 222))
-
-            for tick in tile_ticks:
-                tick_pos = tick[0] - n * tile_height
-                qp.drawRect(15, tick_pos, 45, 1)
-                qp.drawText(
-                    QPoint(2, tick_pos + 17), "{:.1f}".format(tick[1]) + " m"
-                )
+            paint_meter(
+                qp, n * tile_height, pm_height, self.resolution, max_tick
+            )
+            qp.end()
 
             pixmaps.append(pixmap)
 
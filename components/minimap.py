@@ -0,0 +1,129 @@
+from PySide6.QtCore import QRectF, Qt, Signal
+from PySide6.QtGui import QColor, QImage, QMouseEvent, QPainter, QPaintEvent
+from PySide6.QtWidgets import QWidget
+
+# width (px) of each panel's column in the minimap
+COLUMN_WIDTH = 12
+
+# number of panels, from the left of the dashboard, shown in the minimap
+MAX_COLUMNS = 4
+
+
+class Minimap(QWidget):
+    """Overview of the whole hole that jumps to a depth when clicked.
+
+    The minimap shows a narrow column for each of the leftmost panels, drawn
+    from the images and data the panels already hold, with the part of the
+    hole in view outlined. Columns are kept once drawn, so panels that have
+    released their images are still shown.
+
+    Signals:
+        depth_selected(float): The depth (m) clicked or dragged to.
+    """
+
+    depth_selected = Signal(float)
+
+    def __init__(self, parent=None) -> None:
+        """Initialize component
+
+        Args:
+            parent(None/QWidget): The parent widget.
+        """
+        super().__init__(parent=parent)
+
+        # depth (m) covered by the minimap, the overview of each column and
+        # the depths (m) at the top and bottom of the viewport
+        self.depth = 0
+        self.columns = []
+        self.view = (0, 0)
+
+        self.setFixedWidth(COLUMN_WIDTH * MAX_COLUMNS)
+        self.setCursor(Qt.PointingHandCursor)
+        self.setToolTip("Click to jump to a depth")
+
+    def set_columns(self, depth: float, columns: list) -> None:
+        """Replaces the columns shown in the minimap.
+
+        Args:
+            depth(float): The depth (m) covered by the minimap.
+            columns(list): A QImage, or None for an empty column, for each
+                panel shown.
+        """
+        self.depth = depth
+        self.columns = columns[:MAX_COLUMNS]
+        self.update()
+
+    def set_view(self, top: float, bottom: float) -> None:
+        """Outlines the part of the hole in view.
+
+        Args:
+            top(float): The depth (m) at the top of the viewport.
+            bottom(float): The depth (m) at the bottom of the viewport.
+        """
+        if (top, bottom) != self.view:
+            self.view = (top, bottom)
+            self.update()
+
+    def depth_at(self, y: float) -> float:
+        """Returns the depth (m) at a position in the minimap.
+
+        Args:
+            y(float): The position (px) from the top of the minimap.
+        """
+        if not self.height():
+            return 0
+        return min(max(y, 0), self.height()) * self.depth / self.height()
+
+    def mousePressEvent(self, event: QMouseEvent) -> None:
+        if event.button() == Qt.LeftButton and self.depth:
+            self.depth_selected.emit(self.depth_at(event.position().y()))
+
+    def mouseMoveEvent(self, event: QMouseEvent) -> None:
+        if event.buttons() & Qt.LeftButton and self.depth:
+            self.depth_selected.emit(self.depth_at(event.position().y()))
+
+    def paintEvent(self, event: QPaintEvent) -> None:
+        qp = QPainter(self)
+        qp.fillRect(self.rect(), QColor(0, 0, 0))
+        if not self.depth:
+            qp.end()
+            return
+
+        for column_idx, column in enumerate(self.columns):
+            if column is None:
+                continue
+            qp.drawImage(
+                QRectF(
+                    column_idx * COLUMN_WIDTH,
+                    0,
+                    COLUMN_WIDTH - 1,
+                    self.height(),
+                ),
+                column,
+                QRectF(column.rect()),
+            )
+
+        scale = self.height() / self.depth
+        top, bottom = self.view
+        qp.setPen(QColor(255, 255, 255))
+        qp.drawRect(
+            QRectF(
+                0,
+                top * scale,
+                self.width() - 1,
+                max((bottom - top) * scale, 2),
+            )
+        )
+        qp.end()
+
+
+def overview_image(width: int, height: int) -> QImage:
+    """Returns a black image that a panel's overview is drawn on.
+
+    Args:
+        width(int): The width of the overview (px).
+        height(int): The height of the overview (px).
+    """
+    image = QImage(width, height, QImage.Format_RGB32)
+    image.fill(QColor(0, 0, 0))
+    return image
@@ -0,0 +1,542 @@
+import json
+from pathlib import Path
+
+import numpy as np
+from PySide6.QtCore import QMarginsF, QPointF, QRect, QSize, QSizeF
+from PySide6.QtGui import (
+    QColor,
+    QImage,
+    QPageSize,
+    QPainter,
+    QPainterPath,
+    QPdfWriter,
+    QPolygonF,
+)
+from PySide6.QtSvg import QSvgGenerator
+
+from components.meter import METER_WIDTH, paint_meter
+
+# tallest image written in a single file, taller exports are split into
+# tiles of this height
+MAX_TILE_HEIGHT = 16384
+
+GRID_COLOR = "#323232"
+
+# precision (px) of plot outlines
+PATH_PRECISION = 0.25
+
+# file types panels with a vector renderer can be exported to
+VECTOR_FORMATS = [".svg", ".pdf"]
+
+# pdfs are drawn at screen resolution so fonts match exported images
+PDF_RESOLUTION = 96
+
+# tallest pdf page, taller exports are split into pages of this height. Some
+# viewers can't open pages taller than 200 inches.
+MAX_PDF_PAGE_HEIGHT = 150 * PDF_RESOLUTION
+
+
+def simplify_outline(points: np.ndarray) -> np.ndarray:
+    """Rounds the points of an outline made of horizontal and vertical lines
+    to PATH_PRECISION and removes points that don't change its shape.
+
+    Args:
+        points(np.ndarray): (n, 2) x and y positions of the outline.
+    """
+    points = np.round(points / PATH_PRECISION) * PATH_PRECISION
+
+    # repeated points
+    keep = np.any(points != np.roll(points, 1, axis=0), axis=1)
+    keep[0] = True
+    points = points[keep]
+    if points.shape[0] < 3:
+        return points
+
+    # points in the middle of a straight line
+    previous_points = np.roll(points, 1, axis=0)
+    next_points = np.roll(points, -1, axis=0)
+    straight = np.any(
+        (previous_points == points) & (points == next_points), axis=1
+    )
+    return points[~straight]
+
+
+class PanelRenderer:
+    """Base class for drawing a panel's data at any resolution.
+
+    Renderers draw straight from a panel's data instead of its widgets, so a
+    panel can be exported at resolutions other than the one on screen and one
+    depth window (tile) at a time without building a single image of the
+    whole hole.
+
+    Attributes:
+        depth(float): The depth (m) at the bottom of the panel.
+        vector(bool): True if the renderer only draws shapes and text, so it
+            can be exported to vector formats.
+    """
+
+    vector = False
+
+    def __init__(self, depth: float) -> None:
+        """Initialize renderer
+
+        Args:
+            depth(float): The depth (m) at the bottom of the panel.
+        """
+        self.depth = depth
+
+    def width(self, resolution: float) -> int:
+        """Returns the width of the panel in pixels.
+
+        Args:
+            resolution(float): The resolution of the render (px/m).
+        """
+        raise NotImplementedError
+
+    def height(self, resolution: float) -> int:
+        """Returns the height of the panel in pixels.
+
+        Args:
+            resolution(float): The resolution of the render (px/m).
+        """
+        return int(self.depth * resolution)
+
+    def render(self, top: int, height: int, resolution: float) -> QImage:
+        """Renders the section of the panel between two pixel rows.
+
+        Args:
+            top(int): The first pixel row of the section.
+            height(int): The height of the section in pixels.
+            resolution(float): The resolution of the render (px/m).
+        """
+        image = QImage(self.width(resolution), height, QImage.Format_RGB32)
+        image.fill(QColor(0, 0, 0))
+        qp = QPainter(image)
+        self.paint(qp, top, height, resolution)
+        qp.end()
+        return image
+
+    def paint(
+        self, qp: QPainter, top: int, height: int, resolution: float
+    ) -> None:
+        """Paints the section of the panel between two pixel rows onto a black
+        background.
+
+        Args:
+            qp(QPainter): The painter, its origin is the top left of the
+                section.
+            top(int): The first pixel row of the section.
+            height(int): The height of the section in pixels.
+            resolution(float): The resolution of the render (px/m).
+        """
+        raise NotImplementedError
+
+
+class RowImageRenderer(PanelRenderer):
+    """Draws panels made up of a row image for each meter interval."""
+
+    def __init__(self, meter: np.ndarray, row_sizes: list, load_row) -> None:
+        """Initialize renderer
+
+        Args:
+            meter(np.ndarray): The start and end depth (m) of each row.
+            row_sizes(list): The (width, height) of each source row image.
+            load_row(function): Called with a row index and the height the row
+                will be drawn at, returns the row's QImage.
+        """
+        super().__init__(meter[-1, 1])
+        self.meter = meter
+        self.row_sizes = np.array(row_sizes, dtype=float).reshape(-1, 2)
+        self.load_row = load_row
+
+    def row_bounds(self, resolution: float) -> tuple:
+        """Returns the first and last pixel row of each row image.
+
+        Args:
+            resolution(float): The resolution of the render (px/m).
+        """
+        tops = np.rint(self.meter[:, 0] * resolution).astype(int)
+        bottoms = np.rint(self.meter[:, 1] * resolution).astype(int)
+        return tops, bottoms
+
+    def width(self, resolution: float) -> int:
+        tops, bottoms = self.row_bounds(resolution)
+        widths, heights = self.row_sizes.transpose()
+        scaled_widths = widths * (bottoms - tops) / np.maximum(heights, 1)
+        return max(int(np.rint(scaled_widths.max(initial=0))), 1)
+
+    def paint(
+        self, qp: QPainter, top: int, height: int, resolution: float
+    ) -> None:
+        qp.setRenderHint(QPainter.SmoothPixmapTransform)
+
+        tops, bottoms = self.row_bounds(resolution)
+        widths, heights = self.row_sizes.transpose()
+        visible_rows = np.flatnonzero((bottoms > top) & (tops < top + height))
+        for row_idx in visible_rows:
+            row_height = bottoms[row_idx] - tops[row_idx]
+            if row_height <= 0 or heights[row_idx] == 0:
+                continue
+            row_width = int(
+                np.rint(widths[row_idx] * row_height / heights[row_idx])
+            )
+            qp.drawImage(
+                QRect(0, tops[row_idx] - top, row_width, row_height),
+                self.load_row(row_idx, row_height),
+            )
+
+
+class BarPlotRenderer(PanelRenderer):
+    """Draws horizontal bar plots with one or more stacked series."""
+
+    vector = True
+
+    def __init__(
+        self,
+        meter: np.ndarray,
+        values: np.ndarray,
+        colors: list,
+        axis_limits: list,
+        width: int = 180,
+    ) -> None:
+        """Initialize renderer
+
+        Args:
+            meter(np.ndarray): The start and end depth (m) of each bar.
+            values(np.ndarray): The value of each bar, with a column for each
+                stacked series.
+            colors(list): The hex colour of each series.
+            axis_limits(list): The values at the left and right of the plot.
+            width(int): The width of the plot in pixels.
+        """
+        super().__init__(meter[-1, 1])
+        self.meter = meter
+        self.values = np.nan_to_num(values.reshape(values.shape[0], -1))
+        self.colors = [QColor(color) for color in colors]
+        self.axis_limits = axis_limits
+        self.plot_width = width
+
+    def width(self, resolution: float) -> int:
+        return self.plot_width
+
+    def x_position(self, value: float | np.ndarray) -> float | np.ndarray:
+        """Converts data values to horizontal positions in pixels.
+
+        Args:
+            value(float | np.ndarray): The values to convert.
+        """
+        axis_min, axis_max = self.axis_limits
+        if axis_max == axis_min:
+            return np.zeros_like(value, dtype=float)
+        return (value - axis_min) / (axis_max - axis_min) * self.plot_width
+
+    def series_paths(self, top: int, height: int, resolution: float) -> list:
+        """Returns a simplified outline of each series' bars in a depth
+        section.
+
+        Bars starting in the same pixel row are merged into a single bar
+        spanning the range of their values, so a section never has more bars
+        than pixel rows. Each run of touching bars is then outlined as one
+        polygon with positions rounded to PATH_PRECISION pixels and redundant
+        points dropped. This keeps vector exports of long holes compact.
+
+        Args:
+            top(int): The first pixel row of the section.
+            height(int): The height of the section in pixels.
+            resolution(float): The resolution of the render (px/m).
+        """
+        bar_tops = self.meter[:, 0] * resolution - top
+        bar_bottoms = self.meter[:, 1] * resolution - top
+        visible_bars = np.flatnonzero((bar_bottoms > 0) & (bar_tops < height))
+        if visible_bars.size == 0:
+            return [QPainterPath() for _ in self.colors]
+
+        bar_tops = bar_tops[visible_bars]
+        bar_bottoms = bar_bottoms[visible_bars]
+        pixel_rows = np.floor(bar_tops).astype(int)
+        group_starts = np.flatnonzero(
+            np.diff(pixel_rows, prepend=pixel_rows[0] - 1)
+        )
+        group_tops = bar_tops[group_starts]
+        group_bottoms = np.maximum.reduceat(bar_bottoms, group_starts)
+
+        # gaps in the meter split the outline into separate polygons
+        run_starts = np.flatnonzero(
+            np.abs(group_tops[1:] - group_bottoms[:-1]) > PATH_PRECISION
+        )
+        runs = np.split(np.arange(group_tops.size), run_starts + 1)
+
+        paths = []
+        lefts = np.zeros(self.values.shape[0])
+        for series in range(len(self.colors)):
+            rights = lefts + self.values[:, series]
+            x_lefts = self.x_position(lefts[visible_bars])
+            x_rights = self.x_position(rights[visible_bars])
+            group_lefts = np.minimum.reduceat(x_lefts, group_starts)
+            group_rights = np.maximum.reduceat(x_rights, group_starts)
+
+            path = QPainterPath()
+            for run in runs:
+                # down the right edge of the bars, then back up the left edge
+                ys = np.column_stack([group_tops[run], group_bottoms[run]])
+                right_edge = np.column_stack(
+                    [np.repeat(group_rights[run], 2), ys.ravel()]
+                )
+                left_edge = np.column_stack(
+                    [np.repeat(group_lefts[run], 2), ys.ravel()]
+                )[::-1]
+                points = simplify_outline(
+                    np.concatenate([right_edge, left_edge])
+                )
+                path.addPolygon(QPolygonF([QPointF(x, y) for x, y in points]))
+                path.closeSubpath()
+            paths.append(path)
+            lefts = rights
+
+        return paths
+
+    def paint(
+        self, qp: QPainter, top: int, height: int, resolution: float
+    ) -> None:
+        for path, color in zip(
+            self.series_paths(top, height, resolution), self.colors
+        ):
+            qp.fillPath(path, color)
+
+        # grid lines at the same ticks as the on screen plot
+        axis_min, axis_max = self.axis_limits
+        qp.setPen(QColor(GRID_COLOR))
+        for tick in [axis_min, (axis_min + axis_max) / 2, axis_max]:
+            x = min(int(self.x_position(tick)), self.plot_width - 1)
+            qp.drawLine(x, 0, x, height)
+
+
+class MeterRenderer(PanelRenderer):
+    """Draws the depth meter."""
+
+    vector = True
+
+    def width(self, resolution: float) -> int:
+        return METER_WIDTH
+
+    def paint(
+        self, qp: QPainter, top: int, height: int, resolution: float
+    ) -> None:
+        # matches the last tick drawn by the Meter component
+        total_height = np.floor(self.height(resolution) / 25) * 25
+        paint_meter(qp, top, height, resolution, total_height / resolution - 1)
+
+
+def strip_width(renderers: list, resolution: float, spacing: int = 0) -> int:
+    """Returns the width in pixels of several panels drawn side by side.
+
+    Args:
+        renderers(list): The PanelRenderer of each panel, from left to right.
+        resolution(float): The resolution of the render (px/m).
+        spacing(int): The gap between panels in pixels.
+    """
+    widths = [renderer.width(resolution) for renderer in renderers]
+    return sum(widths) + spacing * max(len(widths) - 1, 0)
+
+
+def paint_strip(
+    qp: QPainter,
+    renderers: list,
+    top: int,
+    height: int,
+    resolution: float,
+    spacing: int = 0,
+) -> None:
+    """Paints a depth section of several panels side by side.
+
+    Args:
+        qp(QPainter): The painter, its origin is the top left of the section.
+        renderers(list): The PanelRenderer of each panel, from left to right.
+        top(int): The first pixel row of the section.
+        height(int): The height of the section in pixels.
+        resolution(float): The resolution of the render (px/m).
+        spacing(int): The gap between panels in pixels.
+    """
+    left = 0
+    for renderer in renderers:
+        width = renderer.width(resolution)
+        qp.save()
+        qp.translate(left, 0)
+        qp.setClipRect(0, 0, width, height)
+        renderer.paint(qp, top, height, resolution)
+        qp.restore()
+        left = left + width + spacing
+
+
+def render_strip(
+    renderers: list,
+    top: int,
+    height: int,
+    resolution: float,
+    spacing: int = 0,
+) -> QImage:
+    """Renders a depth section of several panels side by side.
+
+    Args:
+        renderers(list): The PanelRenderer of each panel, from left to right.
+        top(int): The first pixel row of the section.
+        height(int): The height of the section in pixels.
+        resolution(float): The resolution of the render (px/m).
+        spacing(int): The gap between panels in pixels.
+    """
+    image = QImage(
+        strip_width(renderers, resolution, spacing),
+        height,
+        QImage.Format_RGB32,
+    )
+    image.fill(QColor(0, 0, 0))
+
+    qp = QPainter(image)
+    paint_strip(qp, renderers, top, height, resolution, spacing)
+    qp.end()
+
+    return image
+
+
+def export_tiles(
+    renderers: list,
+    image_path: Path | str,
+    resolution: float,
+    tile_height: int = MAX_TILE_HEIGHT,
+) -> list:
+    """Renders panels side by side and saves them one tile at a time.
+
+    Exports no taller than tile_height are saved to image_path. Taller exports
+    are saved as numbered tiles next to it (image_0000.png, image_0001.png,
+    ...) with an image.json index of each tile's pixel and depth range.
+
+    Args:
+        renderers(list): The PanelRenderer of each panel, from left to right.
+        image_path(Path | str): The path of the exported image.
+        resolution(float): The resolution of the export (px/m).
+        tile_height(int): The maximum height of each saved image.
+
+    Returns:
+        list: The paths of the saved images.
+    """
+    image_path = Path(image_path)
+    total_height = max(renderer.height(resolution) for renderer in renderers)
+
+    if total_height <= tile_height:
+        image = render_strip(renderers, 0, total_height, resolution)
+        if not image.save(image_path.as_posix()):
+            raise OSError(f"Could not save {image_path}")
+        return [image_path]
+
+    tile_paths = []
+    tiles = []
+    for n, top in enumerate(range(0, total_height, tile_height)):
+        height = min(tile_height, total_height - top)
+        tile_path = image_path.with_name(
+            f"{image_path.stem}_{n:04d}{image_path.suffix}"
+        )
+        # only one tile is held in memory at a time
+        image = render_strip(renderers, top, height, resolution)
+        if not image.save(tile_path.as_posix()):
+            raise OSError(f"Could not save {tile_path}")
+        tile_paths.append(tile_path)
+        tiles.append(
+            {
+                "file": tile_path.name,
+                "top": top,
+                "height": height,
+                "depth_from": top / resolution,
+                "depth_to": (top + height) / resolution,
+            }
+        )
+
+    with open(image_path.with_suffix(".json"), "w") as f:
+        json.dump(
+            {
+                "resolution": resolution,
+                "width": image.width(),
+                "height": total_height,
+                "tiles": tiles,
+            },
+            f,
+            indent=4,
+        )
+
+    return tile_paths
+
+
+def pdf_page_size(width: int, height: int) -> QPageSize:
+    """Returns the size of a pdf page that fits an image of the given size at
+    PDF_RESOLUTION.
+
+    Args:
+        width(int): The width of the page in pixels.
+        height(int): The height of the page in pixels.
+    """
+    # page sizes are set in points, 72 per inch
+    return QPageSize(
+        QSizeF(width, height) * 72 / PDF_RESOLUTION,
+        QPageSize.Point,
+        "Panel",
+        QPageSize.ExactMatch,
+    )
+
+
+def pdf_writer(path: Path | str) -> QPdfWriter:
+    """Returns a borderless pdf writer drawing at PDF_RESOLUTION.
+
+    Args:
+        path(Path | str): The path of the pdf.
+    """
+    writer = QPdfWriter(Path(path).as_posix())
+    writer.setResolution(PDF_RESOLUTION)
+    writer.setPageMargins(QMarginsF(0, 0, 0, 0))
+    return writer
+
+
+def export_vector(
+    renderers: list, path: Path | str, resolution: float
+) -> None:
+    """Exports panels side by side as an svg or pdf. Plots are saved as
+    simplified outlines rather than pixels, so the file stays small and sharp
+    at any print size. Pdfs taller than MAX_PDF_PAGE_HEIGHT are split into
+    pages.
+
+    Args:
+        renderers(list): The PanelRenderer of each panel, from left to right.
+        path(Path | str): The path of the .svg or .pdf to save.
+        resolution(float): The resolution of the export (px/m).
+    """
+    path = Path(path)
+    width = strip_width(renderers, resolution)
+    height = max(renderer.height(resolution) for renderer in renderers)
+
+    match path.suffix.lower():
+        case ".svg":
+            generator = QSvgGenerator()
+            generator.setFileName(path.as_posix())
+            generator.setSize(QSize(width, height))
+            generator.setViewBox(QRect(0, 0, width, height))
+            generator.setResolution(PDF_RESOLUTION)
+            qp = QPainter(generator)
+            qp.fillRect(0, 0, width, height, QColor(0, 0, 0))
+            paint_strip(qp, renderers, 0, height, resolution)
+            qp.end()
+        case ".pdf":
+            writer = pdf_writer(path)
+            qp = None
+            for top in range(0, height, MAX_PDF_PAGE_HEIGHT):
+                page_height = min(MAX_PDF_PAGE_HEIGHT, height - top)
+                writer.setPageSize(pdf_page_size(width, page_height))
+                if qp is None:
+                    qp = QPainter(writer)
+                else:
+                    writer.newPage()
+                qp.fillRect(0, 0, width, page_height, QColor(0, 0, 0))
+                paint_strip(qp, renderers, top, page_height, resolution)
+            if qp is not None:
+                qp.end()
+        case _:
+            raise ValueError(
+                f"Vector images can be saved as .svg or .pdf, not {path.name}"
+            )
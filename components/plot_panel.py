@@ -0,0 +1,231 @@
+import numpy as np
+from PySide6.QtCore import QTimer, Slot
+from PySide6.QtGui import QImage
+from PySide6.QtWidgets import QWidget
+
+from components.data_panel import DataPanel
+from components.panel_renderer import BarPlotRenderer
+from components.plot_preview import PlotPreview
+from data import products
+from data.dataset import Dataset
+from hsu_viewer.memory_budget import array_bytes
+from hsu_viewer.profiler import profiler
+from hsu_viewer.worker import Worker
+
+
+class PlotPanel(DataPanel):
+    """Base class for panels displaying a horizontal bar plot.
+
+    Handles loading the plot's bars, redrawing the plot when the resolution
+    changes and releasing or evicting it. Subclasses draw the plot in
+    _plot_spectral_data and set the colour of each series of bars.
+
+    While zooming, the drawn plot is stretched to the new resolution by a
+    PlotPreview until it's redrawn at it, so it stays lined up with the
+    other panels.
+    """
+
+    def __init__(
+        self,
+        parent=None,
+        scheduler=None,
+        resolution: float = 0,
+        dataset: Dataset = None,
+        plot_colors: dict = None,
+        **kwargs,
+    ) -> None:
+        """Initialize component
+
+        Args:
+            parent(None/QWidget): The parent widget.
+            scheduler(None/PanelScheduler): The scheduler used to handle async
+                operations.
+            resolution(float): The curently selected resolution (px/m)
+            dataset(Dataset): The dataset object for the selected mineral data.
+            plot_colors(dict): A dictionary of colors to be assigned to each
+                mineral.
+        """
+        super().__init__(
+            parent=parent,
+            resolution=resolution,
+            dataset=dataset,
+            scheduler=scheduler,
+            **kwargs,
+        )
+
+        self.width = 180
+        self.setFixedWidth(self.width)
+        self.image_resolution = resolution
+        self.depth = dataset.meter_end()
+
+        self.plot_colors = plot_colors
+
+        # loaded data and axis range of the plot
+        self.plot_data = None
+        self.axis_limits = None
+
+        # set once the loaded data has been evicted by the memory budget, it's
+        # read again when it's next needed
+        self.data_evicted = False
+
+        # the drawn plot's canvas and the resolution (px/m) it was drawn at
+        self.plot_canvas = None
+        self.plot_resolution = 0
+
+        self.plot_preview = PlotPreview(self)
+        self.layout.addWidget(self.plot_preview)
+        self.layout.addStretch()
+
+    def get_plot(self) -> None:
+        """Handles the process of loading data and displying the resulting
+        plot. Can be run asynchronously if a scheduler was assigned.
+        """
+        if self.released:
+            # loaded once the panel is scrolled back into view
+            return
+
+        if self.scheduler:
+            worker = Worker(self._load_plot_data)
+            worker.signals.result.connect(self._plot_spectral_data)
+            worker.signals.finished.connect(self._on_finish)
+            self.scheduler.schedule(worker, self)
+        else:
+            result = self._load_plot_data()
+            self._plot_spectral_data(result)
+            self.loading.emit(False)
+
+    @profiler.phase("parse")
+    def _load_plot_data(self) -> tuple:
+        """Loads the plot's bars. See data.products.plot_data."""
+        return products.plot_data(
+            self.dataset, self.data_type, self.data_subtype, self.data_name
+        )
+
+    def _plot_spectral_data(self, result: tuple) -> None:
+        """Draws the plot from its loaded bars.
+
+        Args:
+            result(tuple): A tuple containing spectral data and bar size
+                parameters.
+        """
+        raise NotImplementedError
+
+    def bar_colors(self) -> list:
+        """Returns the hex colour of each series of bars."""
+        raise NotImplementedError
+
+    def renderer(self) -> BarPlotRenderer | None:
+        """Returns a renderer that draws the plot at any resolution."""
+        plot_data = self.plot_data
+        if plot_data is None and self.data_evicted:
+            plot_data = self._load_plot_data()
+        if plot_data is None:
+            return None
+
+        bar_widths, bar_centers, _, _, spectral_data = plot_data
+        return BarPlotRenderer(
+            np.column_stack(
+                [bar_centers - bar_widths / 2, bar_centers + bar_widths / 2]
+            ),
+            spectral_data,
+            self.bar_colors(),
+            self.axis_limits,
+            self.width,
+        )
+
+    @Slot(float)
+    def preview_zoom(self, resolution: float) -> None:
+        """Stretches the drawn plot to a new resolution until it's redrawn at
+        it.
+
+        Args:
+            resolution(float): The new resolution (px/m).
+        """
+        if self.plot_canvas is None or not self.plot_resolution:
+            return
+
+        if self.plot_preview.pixmap is None:
+            self.plot_preview.set_pixmap(
+                self.plot_canvas.grab(), self.plot_resolution
+            )
+        self.plot_canvas.hide()
+        self.plot_preview.set_resolution(resolution)
+
+    @Slot(float)
+    def zoom_changed(self, resolution: float) -> None:
+        """Updates the image sizes when the resolution is changed.
+        Args:
+            resolution(float): The new resoltuion (px/m).
+
+        """
+        self.resolution = resolution
+        if self.plot_data is None:
+            self.loading.emit(True)
+            self.get_plot()
+        else:
+            # the bars don't depend on the resolution so only the plot is
+            # redrawn, once the image panels' previews have been painted
+            QTimer.singleShot(0, self._redraw_plot)
+
+    @Slot()
+    def _redraw_plot(self) -> None:
+        """Redraws the plot at the current resolution from its loaded data
+        rather than reading the data again.
+        """
+        if self.plot_data is not None and not self.released:
+            self._plot_spectral_data(self.plot_data)
+
+    def _remove_plot(self) -> None:
+        """Deletes the plot canvas, if one has been drawn."""
+        if self.plot_canvas is not None:
+            self.layout.removeWidget(self.plot_canvas)
+            self.plot_canvas.deleteLater()
+            self.plot_canvas = None
+        self.plot_preview.clear()
+
+    def image_bytes(self) -> int:
+        if self.plot_canvas is None:
+            return self.plot_preview.pixmap_bytes()
+        # the size of the canvas' rendered rgba buffer
+        return (
+            self.plot_canvas.buffer_rgba().nbytes
+            + self.plot_preview.pixmap_bytes()
+        )
+
+    def data_bytes(self) -> int:
+        return array_bytes(self.plot_data)
+
+    def overview(self, width: int, height: int, depth: float) -> QImage | None:
+        if self.plot_data is None or not depth:
+            return None
+        return (
+            self.renderer()
+            .render(0, height, height / depth)
+            .scaled(width, height)
+        )
+
+    def _evict_data(self) -> None:
+        self.plot_data = None
+        self.data_evicted = True
+
+    def _release_images(self) -> None:
+        self._remove_plot()
+
+    def _restore_images(self) -> None:
+        if self.plot_data is None:
+            self.loading.emit(True)
+            self.get_plot()
+        else:
+            self._plot_spectral_data(self.plot_data)
+
+    def insert_plot(self, plot: QWidget) -> None:
+        """Inserts the plot into the component layout, replacing its preview.
+
+        Args:
+            plot(QWidget): The plot canvas.
+
+        """
+        self.plot_canvas = plot
+        self.plot_resolution = self.resolution
+        self.layout.insertWidget(self.layout.count() - 1, plot)
+        self.plot_preview.clear()
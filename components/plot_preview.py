@@ -0,0 +1,75 @@
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QColor, QPainter, QPaintEvent, QPixmap, QTransform
+from PySide6.QtWidgets import QWidget
+
+
+class PlotPreview(QWidget):
+    """Shows a drawn plot stretched to a new resolution while zooming.
+
+    Plots are drawn by matplotlib, which is too slow to redraw on every zoom
+    step. The preview holds a pixmap of the plot as it was last drawn and
+    paints it through a QTransform that only scales its height, as the plot's
+    width doesn't depend on the resolution.
+    """
+
+    def __init__(self, parent=None) -> None:
+        """Initialize component
+
+        Args:
+            parent(None/QWidget): The parent widget.
+        """
+        super().__init__(parent=parent)
+
+        # pixmap of the plot and the resolution (px/m) it was drawn at
+        self.pixmap = None
+        self.pixmap_resolution = 0
+        self.scale = 1
+
+        self.setAttribute(Qt.WA_OpaquePaintEvent)
+        self.hide()
+
+    def set_pixmap(self, pixmap: QPixmap, resolution: float) -> None:
+        """Replaces the previewed plot.
+
+        Args:
+            pixmap(QPixmap): The plot as it was drawn.
+            resolution(float): The resolution (px/m) it was drawn at.
+        """
+        self.pixmap = pixmap
+        self.pixmap_resolution = resolution
+
+    def set_resolution(self, resolution: float) -> None:
+        """Resizes the preview to a new resolution and shows it.
+
+        Args:
+            resolution(float): The new resolution (px/m).
+        """
+        self.scale = resolution / self.pixmap_resolution
+        size = self.pixmap.deviceIndependentSize()
+        self.setFixedSize(
+            round(size.width()), round(size.height() * self.scale)
+        )
+        self.show()
+        self.update()
+
+    def clear(self) -> None:
+        """Hides the preview and frees its pixmap."""
+        self.pixmap = None
+        self.pixmap_resolution = 0
+        self.hide()
+
+    def pixmap_bytes(self) -> int:
+        """Returns the memory (bytes) used by the preview's pixmap."""
+        if self.pixmap is None:
+            return 0
+        return (
+            self.pixmap.width() * self.pixmap.height() * self.pixmap.depth()
+        ) // 8
+
+    def paintEvent(self, event: QPaintEvent) -> None:
+        qp = QPainter(self)
+        qp.fillRect(event.rect(), QColor(0, 0, 0))
+        if self.pixmap is not None:
+            qp.setTransform(QTransform.fromScale(1, self.scale))
+            qp.drawPixmap(0, 0, self.pixmap)
+        qp.end()
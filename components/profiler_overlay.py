@@ -0,0 +1,122 @@
+from pathlib import Path
+
+from PySide6.QtCore import QTimer
+from PySide6.QtGui import QHideEvent, QShowEvent
+from PySide6.QtWidgets import (
+    QFileDialog,
+    QHBoxLayout,
+    QHeaderView,
+    QLabel,
+    QPushButton,
+    QTableWidget,
+    QTableWidgetItem,
+    QVBoxLayout,
+    QWidget,
+)
+
+from hsu_viewer.profiler import Profiler
+
+COLUMNS = [
+    "Job / Phase",
+    "n",
+    "Wall (ms)",
+    "CPU (ms)",
+    "Read (MB)",
+    "RSS (MB)",
+]
+
+# how often the table is refreshed while visible (ms)
+REFRESH_INTERVAL = 1000
+
+
+class ProfilerOverlay(QWidget):
+    """Developer overlay showing the time, bytes read and memory used by each
+    job and load phase while profiling is enabled.
+    """
+
+    def __init__(self, parent=None, profiler: Profiler = None) -> None:
+        """Initialize component
+
+        Args:
+            parent(None/QWidget): The parent widget.
+            profiler(Profiler): The profiler whose spans are displayed.
+        """
+        super().__init__(parent=parent)
+
+        self.profiler = profiler
+
+        title = QLabel("Profiler", self)
+
+        self.table = QTableWidget(0, len(COLUMNS), self)
+        self.table.setHorizontalHeaderLabels(COLUMNS)
+        self.table.verticalHeader().hide()
+        self.table.horizontalHeader().setSectionResizeMode(
+            QHeaderView.ResizeToContents
+        )
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.setMinimumHeight(200)
+
+        clear_button = QPushButton("Clear", self)
+        clear_button.setStyleSheet("border: 1px solid white;")
+        clear_button.clicked.connect(self.clear)
+        save_button = QPushButton("Save Trace", self)
+        save_button.setStyleSheet("border: 1px solid white;")
+        save_button.clicked.connect(self.save_trace)
+
+        button_layout = QHBoxLayout()
+        button_layout.addWidget(clear_button)
+        button_layout.addWidget(save_button)
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(title)
+        layout.addWidget(self.table)
+        layout.addLayout(button_layout)
+
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setInterval(REFRESH_INTERVAL)
+        self.refresh_timer.timeout.connect(self.refresh)
+
+    def showEvent(self, event: QShowEvent) -> None:
+        self.refresh()
+        self.refresh_timer.start()
+
+    def hideEvent(self, event: QHideEvent) -> None:
+        self.refresh_timer.stop()
+
+    def refresh(self) -> None:
+        """Updates the table with the profiler's current totals."""
+        summary = self.profiler.summary()
+        self.table.setRowCount(len(summary))
+        for row, total in enumerate(summary):
+            values = [
+                total["name"],
+                str(total["count"]),
+                f"{total['wall'] * 1000:.0f}",
+                f"{total['cpu'] * 1000:.0f}",
+                f"{total['bytes_read'] / 2**20:.1f}",
+                f"{total['peak_rss'] / 2**20:.0f}",
+            ]
+            for column, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                if total["category"] == "job":
+                    font = item.font()
+                    font.setBold(True)
+                    item.setFont(font)
+                self.table.setItem(row, column, item)
+
+    def clear(self) -> None:
+        """Removes the recorded spans."""
+        self.profiler.clear()
+        self.refresh()
+
+    def save_trace(self) -> None:
+        """Saves the recorded spans as a Chrome trace."""
+        path, _ = QFileDialog.getSaveFileName(
+            self,
+            "Save Trace",
+            f"{Path().absolute().as_posix()}/hsu_trace.json",
+            "Chrome Trace (*.json)",
+        )
+        if path:
+            self.profiler.save_chrome_trace(path)
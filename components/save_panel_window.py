@@ -1,7 +1,8 @@
 from pathlib import Path
 
-from PySide6.QtGui import QPixmap
+from PySide6.QtCore import Qt
 from PySide6.QtWidgets import (
+    QApplication,
     QLabel,
     QLineEdit,
     QHBoxLayout,
@@ -10,32 +11,49 @@ from PySide6.QtWidgets import (
     QPushButton,
     QCheckBox,
     QFileDialog,
+    QSpinBox,
 )
 
 from components.modal import Modal
+from components.panel_renderer import (
+    VECTOR_FORMATS,
+    PanelRenderer,
+    export_tiles,
+    export_vector,
+)
 
 
 class SavePanelWindow(Modal):
     """Used to save a panel as an image and provide users with some basic
     options.
+
+    Images are drawn from the panel's data at the selected resolution rather
+    than grabbed from the screen. Images taller than MAX_TILE_HEIGHT are saved
+    as a set of numbered tiles. Plot panels can also be saved as svg or pdf.
     """
 
+    title = "Save Panel Image"
+    file_filter = "Images (*.png *.bmp *.jpg *.jpeg)"
+    vector_file_filter = "Images (*.png *.bmp *.jpg *.jpeg *.svg *.pdf)"
+
     def __init__(
         self,
         parent: QWidget,
-        panel_image: QPixmap,
-        meter_image: QPixmap,
+        panel_renderer: PanelRenderer,
+        meter_renderer: PanelRenderer,
         image_name: str,
+        resolution: int,
     ) -> None:
         """Initialize component
 
         Args:
             parent(None/QWidget): The parent widget.
-            panel_image(QPixmap): The panel pixmap to be saved.
-            meter_image(QPixmap): The meter pixmap to be saved.
+            panel_renderer(PanelRenderer): Draws the panel to be saved.
+            meter_renderer(PanelRenderer): Draws the meter to be saved.
             image_name(str): The file name for the image output.
+            resolution(int): The default image resolution (px/m).
         """
-        super().__init__(parent=parent, text="Save Panel Image", size="sm")
+        super().__init__(parent=parent, text=self.title, size="sm")
 
         layout = QVBoxLayout(self)
         layout.setSpacing(0)
@@ -46,8 +64,10 @@ class SavePanelWindow(Modal):
         self.default_image_path = (
             f"{Path().absolute().as_posix()}/{image_name}"
         )
-        self.meter_image = meter_image
-        self.panel_image = panel_image
+        self.meter_renderer = meter_renderer
+        self.panel_renderer = panel_renderer
+        if panel_renderer is not None and panel_renderer.vector:
+            self.file_filter = self.vector_file_filter
 
         fname_container = QWidget(self)
         fname_container_layout = QHBoxLayout(fname_container)
@@ -80,8 +100,16 @@ class SavePanelWindow(Modal):
         self.meter_checkbox = QCheckBox(button_container)
         meter_label = QLabel("Include Meter", button_container)
 
+        resolution_label = QLabel("Resolution (px/m)", button_container)
+        self.resolution_input = QSpinBox(button_container)
+        self.resolution_input.setRange(1, 10000)
+        self.resolution_input.setValue(resolution)
+        self.resolution_input.setStyleSheet("border: 1px solid white;")
+
         button_container_layout.addWidget(self.meter_checkbox)
         button_container_layout.addWidget(meter_label)
+        button_container_layout.addWidget(resolution_label)
+        button_container_layout.addWidget(self.resolution_input)
         button_container_layout.addStretch()
         button_container_layout.addWidget(save_button)
         button_container_layout.addWidget(close_button)
@@ -97,7 +125,7 @@ class SavePanelWindow(Modal):
             self,
             "Save As",
             self.default_image_path,
-            "Images (*.png *.bmp *.jpg *.jpeg)",
+            self.file_filter,
         )
 
         if new_path:
@@ -105,30 +133,39 @@ class SavePanelWindow(Modal):
 
     def save_image(self) -> None:
         """Saves the image with the specified parameters."""
+        renderers = [self.panel_renderer]
         if self.meter_checkbox.isChecked():
-            temp_widget = QWidget()
-            temp_layout = QHBoxLayout(temp_widget)
-            meter_label = QLabel(temp_widget)
-            meter_label.setPixmap(self.meter_image)
-            panel_label = QLabel(temp_widget)
-            panel_label.setPixmap(self.panel_image)
-            temp_layout.addWidget(meter_label)
-            temp_layout.addWidget(panel_label)
-
-            temp_widget.setFixedWidth(
-                self.meter_image.width() + self.panel_image.width()
-            )
-            temp_widget.setFixedHeight(self.panel_image.height())
-            temp_layout.setSpacing(0)
-            temp_layout.setContentsMargins(0, 0, 0, 0)
-            temp_widget.grab(temp_widget.rect()).save(
-                self.image_name_label.text()
-            )
+            renderers.insert(0, self.meter_renderer)
+
+        image_path = Path(self.image_name_label.text())
+        if image_path.suffix.lower() in VECTOR_FORMATS:
+            if not self.panel_renderer.vector:
+                self.show_error("Only plots can be saved as svg or pdf")
+                return
+            export = export_vector
         else:
-            self.panel_image.save(self.image_name_label.text())
+            export = export_tiles
+
+        QApplication.setOverrideCursor(Qt.WaitCursor)
+        try:
+            export(renderers, image_path, self.resolution_input.value())
+        except (OSError, ValueError) as e:
+            self.show_error(str(e))
+            return
+        finally:
+            QApplication.restoreOverrideCursor()
 
         self._close()
 
+    def show_error(self, message: str) -> None:
+        """Highlights the file name when the image can't be saved.
+
+        Args:
+            message(str): The reason the image wasn't saved.
+        """
+        self.image_name_label.setToolTip(message)
+        self.image_name_label.setStyleSheet("border: 1px solid red;")
+
     def _close(self) -> None:
         """Closes the window."""
         super()._close()
@@ -0,0 +1,61 @@
+from PySide6.QtCore import Qt
+from PySide6.QtWidgets import QApplication, QWidget
+
+from components.panel_renderer import PanelRenderer
+from components.save_panel_window import SavePanelWindow
+from components.strip_log import export_strip_log, paint_legend_header
+
+
+class SaveStripLogWindow(SavePanelWindow):
+    """Used to save several panels, their headers, the meter and the mineral
+    legend as a single strip log image or pdf.
+    """
+
+    title = "Save Strip Log"
+    file_filter = "Strip Logs (*.png *.pdf)"
+
+    def __init__(
+        self,
+        parent: QWidget,
+        columns: list,
+        meter_renderer: PanelRenderer,
+        legend_renderer: PanelRenderer,
+        image_name: str,
+        resolution: int,
+    ) -> None:
+        """Initialize component
+
+        Args:
+            parent(None/QWidget): The parent widget.
+            columns(list): (PanelRenderer, header painter) of each panel.
+            meter_renderer(PanelRenderer): Draws the meter.
+            legend_renderer(PanelRenderer): Draws the mineral legend.
+            image_name(str): The file name for the strip log.
+            resolution(int): The default strip log resolution (px/m).
+        """
+        super().__init__(parent, None, meter_renderer, image_name, resolution)
+        self.columns = columns
+        self.legend_renderer = legend_renderer
+
+    def save_image(self) -> None:
+        """Saves the strip log with the specified parameters."""
+        columns = list(self.columns)
+        if self.meter_checkbox.isChecked():
+            columns.insert(0, (self.meter_renderer, None))
+        if self.legend_renderer.plot_colors:
+            columns.append((self.legend_renderer, paint_legend_header))
+
+        QApplication.setOverrideCursor(Qt.WaitCursor)
+        try:
+            export_strip_log(
+                columns,
+                self.image_name_label.text(),
+                self.resolution_input.value(),
+            )
+        except (OSError, ValueError) as e:
+            self.show_error(str(e))
+            return
+        finally:
+            QApplication.restoreOverrideCursor()
+
+        self._close()
@@ -1,15 +1,6 @@
-from pathlib import Path
-
-import numpy as np
-from openpyxl import load_workbook
-from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg
-from matplotlib.figure import Figure
-from matplotlib.ticker import NullFormatter
-from PySide6.QtCore import Slot
-
-from components.data_panel import DataPanel
+from components.plot_panel import PlotPanel
 from data.dataset import Dataset
-from hsu_viewer.worker import Worker
+from hsu_viewer.profiler import profiler
 
 """
 TODO
@@ -17,7 +8,7 @@ TODO
 """
 
 
-class SpectralPlotPanel(DataPanel):
+class SpectralPlotPanel(PlotPanel):
     """Component for Plot Images
 
     Handles production, manipulation, and display of plot images.
@@ -26,8 +17,8 @@ class SpectralPlotPanel(DataPanel):
     def __init__(
         self,
         parent=None,
-        threadpool=None,
-        resolution: int = 0,
+        scheduler=None,
+        resolution: float = 0,
         dataset: Dataset = None,
         plot_colors: dict = None,
         **kwargs,
@@ -36,9 +27,9 @@ class SpectralPlotPanel(DataPanel):
 
         Args:
             parent(None/QWidget): The parent widget.
-            threadpool(None/QThreadpool): The threadpool used to handle async
+            scheduler(None/PanelScheduler): The scheduler used to handle async
                 operations.
-            resolution(int): The curently selected resolution (px/m)
+            resolution(float): The curently selected resolution (px/m)
             dataset(Dataset): The dataset object for the selected mineral data.
             plot_colors(dict): A dictionary of colors to be assigned to each
                 mineral.
@@ -47,129 +38,17 @@ class SpectralPlotPanel(DataPanel):
             parent=parent,
             resolution=resolution,
             dataset=dataset,
-            threadpool=threadpool,
+            scheduler=scheduler,
+            plot_colors=plot_colors,
             **kwargs,
         )
 
-        self.width = 180
-        self.setFixedWidth(self.width)
-        self.image_resolution = resolution
-        self.depth = dataset.meter_end()
-
         self.setToolTip(f"{self.dataset_name} {self.data_name}")
 
-        self.plot_colors = plot_colors
-
         self.loading.emit(True)
         self.get_plot()
 
-    def get_plot(self) -> None:
-        """Handles the process of loading data and displying the resulting
-        plot. Can be run asynchronously if a theadpool was assigned.
-
-        Args:
-            self: The object instance.
-        """
-        if self.threadpool:
-            if self.data_subtype == "Geochemistry":
-                worker = Worker(self._load_geochem_data)
-            else:
-                worker = Worker(self._load_spectral_data)
-            worker.signals.result.connect(self._plot_spectral_data)
-            worker.signals.finished.connect(self._on_finish)
-            self.threadpool.start(worker)
-        else:
-            if self.data_subtype == "Geochemistry":
-                result = self._load_geochem_data()
-            else:
-                result = self._load_spectral_data()
-            self._plot_spectral_data(result)
-            self.loading.emit(False)
-
-    def _load_spectral_data(self) -> None:
-        """Loads spectral data from csv.
-
-        Args:
-            self: The object instance.
-
-        """
-        csv_path = Path(self.csv_data.get("path"))
-
-        data = np.genfromtxt(
-            csv_path,
-            delimiter=",",
-            dtype="float",
-            comments=None,
-            skip_header=5,
-            usecols=[
-                self.dataset_info.get("meter_from"),
-                self.dataset_info.get("meter_to"),
-                self.dataset_info.get("column"),
-            ],
-        )
-
-        if data[-1, 1] >= 9999:
-            data[:, 0] = np.arange(0, data.shape[0], 1)
-            data[:, 1] = np.arange(1, data.shape[0] + 1, 1)
-
-        if data[0, 0] != 0:
-            data = np.insert(
-                data.astype(float), 0, [0, data[0, 0], np.nan], axis=0
-            )
-
-        bar_widths = data[:, 1] - data[:, 0]
-        bar_centers = (data[:, 0] + data[:, 1]) / 2
-        meter_start = data[0, 0]
-        meter_end = data[-1, 1]
-        spectral_data = data[:, 2]
-
-        return bar_widths, bar_centers, meter_start, meter_end, spectral_data
-
-    def _load_geochem_data(self) -> None:
-        """Loads geochemistry data from xlsx.
-
-        Args:
-            self: The object instance.
-
-        """
-        geochem_path = self.dataset.geochem_path(self.data_name)
-
-        wb = load_workbook(filename=geochem_path)
-        ws = wb["Geochemistry"]
-        meter_start = None
-        meter_end = None
-        mineral_unit = self.dataset.data(
-            self.data_type, self.data_subtype, self.data_name
-        ).get("unit")
-
-        for col in ws.iter_cols(min_row=2, min_col=2, values_only=True):
-            header = col[0]
-            col_data = [
-                c for c in col if isinstance(c, int) or isinstance(c, float)
-            ]
-            if header == "depth_start":
-                meter_start = np.array(col_data)
-            elif header == "depth_end":
-                meter_end = np.array(col_data)
-            elif header == f"{self.data_name}_{mineral_unit}":
-                data = np.array(col_data)
-
-        if meter_end[-1] >= 9999:
-            meter_start = np.arange(0, data.shape[0], 1)
-            meter_end = np.arange(1, data.shape[0] + 1, 1)
-
-        if meter_start[0] != 0:
-            meter_start = np.insert(meter_start, 0, 0)
-            meter_end = np.insert(meter_end, 0, meter_start[0])
-            data = np.insert(data.astype(float), 0, np.nan)
-
-        bar_widths = meter_end - meter_start
-        bar_centers = (meter_end + meter_start) / 2
-        meter_start = meter_start[0]
-        meter_end = meter_end[-1]
-
-        return bar_widths, bar_centers, meter_start, meter_end, data
-
+    @profiler.phase("widget build")
     def _plot_spectral_data(self, result: tuple) -> None:
         """Plots the data in a horiztonal bar plot.
 
@@ -179,11 +58,16 @@ class SpectralPlotPanel(DataPanel):
                 parameters.
 
         """
+        # matplotlib is slow to import so it isn't loaded until the first
+        # plot is drawn
+        from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg
+        from matplotlib.figure import Figure
+        from matplotlib.ticker import NullFormatter
+
         # create plot figure and canvas
         bar_widths, bar_centers, meter_start, meter_end, spectral_data = result
 
-        if self.layout.count() > 0:
-            self.layout.itemAt(0).widget().deleteLater()
+        self._remove_plot()
 
         plot_color = self.plot_colors.get(self.data_name)
         height = (meter_end - meter_start) * self.resolution
@@ -221,6 +105,9 @@ class SpectralPlotPanel(DataPanel):
                 axis_min = spectral_data.min()
                 axis_max = spectral_data.max()
 
+        self.plot_data = result
+        self.axis_limits = [axis_min, axis_max]
+
         plot_fig.clear()
         plot = plot_fig.add_axes([0, 0, 1, 1])
         plot.barh(
@@ -239,29 +126,7 @@ class SpectralPlotPanel(DataPanel):
         plotCanvas.draw()
 
         self.insert_plot(plotCanvas)
+        self._update_memory()
 
-    @Slot(int)
-    def zoom_changed(self, resolution: int) -> None:
-        """Updates the image sizes when the resolution is changed.
-        Args:
-            self: The object instance.
-            resolution(int): The new resoltuion (px/m).
-
-        """
-        self.loading.emit(True)
-        self.resolution = resolution
-        self.get_plot()
-
-    def insert_plot(self, plot: FigureCanvasQTAgg) -> None:
-        """Inserts the plot into the component layout.
-
-        Args:
-            self: The object instance.
-            plot(FigureCanvasQTAgg): The plot objects.
-
-        """
-        if self.layout.count() == 0:
-            self.layout.addWidget(plot)
-            self.layout.addStretch()
-        else:
-            self.layout.insertWidget(self.layout.count() - 1, plot)
+    def bar_colors(self) -> list:
+        return [self.plot_colors.get(self.data_name)]
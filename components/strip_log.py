@@ -0,0 +1,231 @@
+from pathlib import Path
+
+import numpy as np
+from PySide6.QtCore import QRect, Qt
+from PySide6.QtGui import (
+    QColor,
+    QFont,
+    QFontMetrics,
+    QImage,
+    QPainter,
+)
+
+from components.data_header import HEADER_HEIGHT
+from components.panel_renderer import (
+    PanelRenderer,
+    paint_strip,
+    pdf_page_size,
+    pdf_writer,
+    render_strip,
+    strip_width,
+)
+from data.png_writer import PngWriter
+
+# height of the depth sections a strip log is rendered in, and of each pdf
+# page below the headers
+STRIP_TILE_HEIGHT = 2048
+
+# gap between columns, matching the dashboard
+COLUMN_SPACING = 5
+
+# height of each mineral in the legend
+LEGEND_ENTRY_HEIGHT = 20
+
+
+class LegendRenderer(PanelRenderer):
+    """Draws the mineral legend as a strip log column."""
+
+    def __init__(self, plot_colors: dict) -> None:
+        """Initialize renderer
+
+        Args:
+            plot_colors(dict): The hex colour assigned to each mineral.
+        """
+        super().__init__(0)
+        self.plot_colors = plot_colors
+
+    def width(self, resolution: float) -> int:
+        font_metric = QFontMetrics(QFont())
+        label_widths = [
+            font_metric.horizontalAdvance(mineral)
+            for mineral in self.plot_colors
+        ]
+        return max([100, *label_widths]) + 30
+
+    def height(self, resolution: float) -> int:
+        return len(self.plot_colors) * LEGEND_ENTRY_HEIGHT
+
+    def paint(
+        self, qp: QPainter, top: int, height: int, resolution: float
+    ) -> None:
+        qp.setPen(QColor(222, 222, 222))
+        for idx, (mineral, color) in enumerate(self.plot_colors.items()):
+            y = idx * LEGEND_ENTRY_HEIGHT - top
+            if y + LEGEND_ENTRY_HEIGHT < 0 or y > height:
+                continue
+            qp.fillRect(5, y + 5, 10, 10, QColor(color))
+            qp.drawText(
+                QRect(20, y, self.width(resolution), LEGEND_ENTRY_HEIGHT),
+                Qt.AlignLeft | Qt.AlignVCenter,
+                mineral,
+            )
+
+
+def paint_legend_header(qp: QPainter, width: int) -> None:
+    """Paints the header of the legend column.
+
+    Args:
+        qp(QPainter): The painter, its origin is the top left of the header.
+        width(int): The width of the header in pixels.
+    """
+    qp.setPen(QColor(222, 222, 222))
+    qp.drawText(
+        QRect(5, 0, width, HEADER_HEIGHT),
+        Qt.AlignLeft | Qt.AlignBottom,
+        "Mineral Legend",
+    )
+
+
+def paint_headers(
+    qp: QPainter, columns: list, resolution: float, spacing: int
+) -> None:
+    """Paints the header of each column.
+
+    Args:
+        qp(QPainter): The painter, its origin is the top left of the strip
+            log.
+        columns(list): (PanelRenderer, header painter or None) of each
+            column. Header painters are called with a painter and the column
+            width.
+        resolution(float): The resolution of the strip log (px/m).
+        spacing(int): The gap between columns in pixels.
+    """
+    left = 0
+    for renderer, paint_header in columns:
+        width = renderer.width(resolution)
+        if paint_header is not None:
+            qp.save()
+            qp.translate(left, 0)
+            qp.setClipRect(0, 0, width, HEADER_HEIGHT)
+            paint_header(qp, width)
+            qp.restore()
+        left = left + width + spacing
+
+
+def export_strip_log(
+    columns: list,
+    path: Path | str,
+    resolution: float,
+    tile_height: int = STRIP_TILE_HEIGHT,
+    spacing: int = COLUMN_SPACING,
+) -> None:
+    """Exports columns of panels, each below its header, as a single strip
+    log image or pdf.
+
+    The strip log is rendered one depth section at a time so memory use
+    doesn't grow with the length of the hole. Pngs are written a section at a
+    time as a single image. Pdfs have a page for each section with the
+    headers repeated at the top of each page, plots are kept as vector
+    graphics.
+
+    Args:
+        columns(list): (PanelRenderer, header painter or None) of each column
+            from left to right. Header painters are called with a painter and
+            the column width.
+        path(Path | str): The path of the .png or .pdf to save.
+        resolution(float): The resolution of the strip log (px/m).
+        tile_height(int): The height of each rendered section in pixels.
+        spacing(int): The gap between columns in pixels.
+    """
+    path = Path(path)
+    match path.suffix.lower():
+        case ".png":
+            export_strip_log_png(
+                columns, path, resolution, tile_height, spacing
+            )
+        case ".pdf":
+            export_strip_log_pdf(
+                columns, path, resolution, tile_height, spacing
+            )
+        case _:
+            raise ValueError(
+                f"Strip logs can be saved as .png or .pdf, not {path.name}"
+            )
+
+
+def export_strip_log_png(
+    columns: list,
+    path: Path,
+    resolution: float,
+    tile_height: int,
+    spacing: int,
+) -> None:
+    """Streams a strip log to a png. See export_strip_log."""
+    renderers = [renderer for renderer, _ in columns]
+    width = strip_width(renderers, resolution, spacing)
+    body_height = max(renderer.height(resolution) for renderer in renderers)
+
+    header = QImage(width, HEADER_HEIGHT, QImage.Format_RGB32)
+    header.fill(QColor(0, 0, 0))
+    qp = QPainter(header)
+    paint_headers(qp, columns, resolution, spacing)
+    qp.end()
+
+    with PngWriter(path, width, HEADER_HEIGHT + body_height) as writer:
+        writer.write_rows(image_to_array(header))
+        for top in range(0, body_height, tile_height):
+            height = min(tile_height, body_height - top)
+            section = render_strip(renderers, top, height, resolution, spacing)
+            writer.write_rows(image_to_array(section))
+
+
+def export_strip_log_pdf(
+    columns: list,
+    path: Path,
+    resolution: float,
+    tile_height: int,
+    spacing: int,
+) -> None:
+    """Paints a strip log onto pdf pages. See export_strip_log."""
+    renderers = [renderer for renderer, _ in columns]
+    width = strip_width(renderers, resolution, spacing)
+    body_height = max(renderer.height(resolution) for renderer in renderers)
+
+    writer = pdf_writer(path)
+
+    qp = None
+    for top in range(0, body_height, tile_height):
+        height = min(tile_height, body_height - top)
+        writer.setPageSize(pdf_page_size(width, HEADER_HEIGHT + height))
+        if qp is None:
+            qp = QPainter(writer)
+        else:
+            writer.newPage()
+
+        qp.fillRect(0, 0, width, HEADER_HEIGHT + height, QColor(0, 0, 0))
+        paint_headers(qp, columns, resolution, spacing)
+        qp.save()
+        qp.translate(0, HEADER_HEIGHT)
+        paint_strip(qp, renderers, top, height, resolution, spacing)
+        qp.restore()
+
+    if qp is not None:
+        qp.end()
+
+
+def image_to_array(image: QImage) -> np.ndarray:
+    """Returns a (height, width, 3) uint8 copy of an image's pixels.
+
+    Args:
+        image(QImage): The image to convert.
+    """
+    image = image.convertToFormat(QImage.Format_RGB888)
+    rows = np.frombuffer(image.constBits(), np.uint8).reshape(
+        image.height(), image.bytesPerLine()
+    )
+    # copied as the rows share the converted image's memory
+    return (
+        rows[:, : image.width() * 3]
+        .reshape(image.height(), image.width(), 3)
+        .copy()
+    )
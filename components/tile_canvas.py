@@ -0,0 +1,250 @@
+import numpy as np
+from PySide6.QtCore import QRect, QRectF, Qt
+from PySide6.QtGui import QColor, QImage, QPainter, QPaintEvent, QTransform
+from PySide6.QtWidgets import QWidget
+
+from components.minimap import overview_image
+
+# factor the pixmaps of released tiles are shrunk by, their compact copies
+# are shown while the tiles are filled again
+RELEASED_SCALE = 1 / 8
+
+
+class TileCanvas(QWidget):
+    """Paints a column of tiles, each covering a depth interval, at any
+    resolution.
+
+    Tiles are positioned by their start and end depth rather than laid out as
+    widgets, so the canvas can be set to any resolution (px/m) and only the
+    tiles inside the area being repainted are drawn.
+
+    When the resolution changes, tiles rendered at the previous resolution
+    are kept as a preview. They are drawn through a QTransform that scales
+    them to the new resolution, so zooming is shown on the next repaint. Each
+    preview tile is replaced once its panel renders it at the new resolution.
+
+    Released tiles keep a compact copy of their pixmap, which is previewed
+    in the same way until the tiles are filled again.
+    """
+
+    def __init__(self, parent=None, resolution: float = 0) -> None:
+        """Initialize component
+
+        Args:
+            parent(None/QWidget): The parent widget.
+            resolution(float): The resolution of the canvas (px/m).
+        """
+        super().__init__(parent=parent)
+
+        self.resolution = resolution
+
+        # start and end depth (m), pixmap, pixmap (width, height) and the
+        # resolution (px/m) each tile was rendered at. Tiles have no pixmap
+        # and a size and resolution of 0 until they're loaded. Released tiles
+        # keep their size so the canvas keeps its width.
+        self.meter = np.zeros((0, 2))
+        self.pixmaps = []
+        self.pixmap_sizes = np.zeros((0, 2))
+        self.tile_resolutions = np.zeros(0)
+
+        # every pixel is painted so the background doesn't need to be
+        self.setAttribute(Qt.WA_OpaquePaintEvent)
+
+    def set_tiles(self, meter: np.ndarray) -> None:
+        """Replaces the canvas' tiles with empty tiles. Tiles covering the
+        same depths as the current tiles are kept as a preview until they're
+        replaced.
+
+        Args:
+            meter(np.ndarray): The start and end depth (m) of each tile.
+        """
+        meter = np.asarray(meter, dtype=float).reshape(-1, 2)
+        if np.array_equal(meter, self.meter):
+            return
+
+        self.meter = meter
+        self.pixmaps = [None] * meter.shape[0]
+        self.pixmap_sizes = np.zeros((meter.shape[0], 2))
+        self.tile_resolutions = np.zeros(meter.shape[0])
+        self._update_size()
+        self.update()
+
+    def set_pixmaps(self, pixmaps: list) -> None:
+        """Fills tiles with pixmaps rendered at the canvas' resolution.
+
+        Args:
+            pixmaps(list): (tile index, QPixmap) pairs.
+        """
+        for tile_idx, pixmap in pixmaps:
+            self.pixmaps[tile_idx] = pixmap
+            self.pixmap_sizes[tile_idx] = (pixmap.width(), pixmap.height())
+            self.tile_resolutions[tile_idx] = self.resolution
+        self._update_size()
+        self.update()
+
+    def has_pixmap(self, tile_idx: int) -> bool:
+        """Returns True if a tile has been filled.
+
+        Args:
+            tile_idx(int): The index of the tile.
+        """
+        return self.tile_resolutions[tile_idx] > 0
+
+    def is_current(self, tile_idx: int) -> bool:
+        """Returns True if a tile has been rendered at the canvas' resolution,
+        rather than being empty or a preview.
+
+        Args:
+            tile_idx(int): The index of the tile.
+        """
+        return (
+            self.has_pixmap(tile_idx)
+            and self.tile_resolutions[tile_idx] == self.resolution
+        )
+
+    def pixmap_bytes(self) -> int:
+        """Returns the memory (bytes) used by the tiles' pixmaps."""
+        return sum(
+            pixmap.width() * pixmap.height() * pixmap.depth() // 8
+            for pixmap in self.pixmaps
+            if pixmap is not None
+        )
+
+    def overview(self, width: int, height: int, depth: float) -> QImage | None:
+        """Returns the filled tiles squeezed into a small image covering the
+        whole hole, or None if no tiles have been filled.
+
+        Args:
+            width(int): The width of the overview (px).
+            height(int): The height of the overview (px).
+            depth(float): The depth (m) at the bottom of the overview.
+        """
+        filled = np.flatnonzero(self.tile_resolutions > 0)
+        if filled.size == 0 or not depth:
+            return None
+
+        image = overview_image(width, height)
+        scale = height / depth
+        qp = QPainter(image)
+        for tile_idx in filled:
+            top, bottom = self.meter[tile_idx] * scale
+            pixmap = self.pixmaps[tile_idx]
+            qp.drawPixmap(
+                QRectF(0, top, width, max(bottom - top, 1)),
+                pixmap,
+                QRectF(pixmap.rect()),
+            )
+        qp.end()
+        return image
+
+    def release(self) -> None:
+        """Shrinks the tiles' pixmaps to compact copies RELEASED_SCALE of
+        their size. The canvas keeps its size and previews the copies until
+        its tiles are filled again.
+        """
+        # tiles still holding a compact copy aren't shrunk again
+        for tile_idx in np.flatnonzero(
+            self.tile_resolutions > self.resolution * RELEASED_SCALE
+        ):
+            pixmap = self.pixmaps[tile_idx]
+            compact = pixmap.scaled(
+                max(round(pixmap.width() * RELEASED_SCALE), 1),
+                max(round(pixmap.height() * RELEASED_SCALE), 1),
+                Qt.IgnoreAspectRatio,
+                Qt.SmoothTransformation,
+            )
+            # the copy's exact scale, so it's previewed at the tile's height
+            scale = compact.height() / max(pixmap.height(), 1)
+            self.pixmaps[tile_idx] = compact
+            self.tile_resolutions[tile_idx] *= scale
+        self.update()
+
+    def set_resolution(self, resolution: float) -> None:
+        """Resizes the canvas to a new resolution. The current tiles are
+        previewed at the new resolution until they are replaced.
+
+        Args:
+            resolution(float): The new resolution (px/m).
+        """
+        self.resolution = resolution
+        self._update_size()
+        self.update()
+
+    def tile_bounds(self, resolution: float = None) -> tuple:
+        """Returns the first and last pixel row of each tile.
+
+        Args:
+            resolution(float): The resolution (px/m), defaults to the canvas'
+                resolution.
+        """
+        if resolution is None:
+            resolution = self.resolution
+        tops = np.rint(self.meter[:, 0] * resolution).astype(int)
+        bottoms = np.rint(self.meter[:, 1] * resolution).astype(int)
+        return tops, bottoms
+
+    def tile_widths(self, tops: np.ndarray, bottoms: np.ndarray) -> np.ndarray:
+        """Returns the width of each tile drawn between its pixel rows,
+        keeping the aspect ratio of its pixmap. Empty tiles have a width of 0.
+
+        Args:
+            tops(np.ndarray): The first pixel row of each tile.
+            bottoms(np.ndarray): The last pixel row of each tile.
+        """
+        widths, heights = self.pixmap_sizes.transpose()
+        scaled_widths = widths * (bottoms - tops) / np.maximum(heights, 1)
+        return np.rint(scaled_widths).astype(int)
+
+    def canvas_width(self) -> int:
+        """Returns the width of the widest tile at the current resolution."""
+        return int(self.tile_widths(*self.tile_bounds()).max(initial=0))
+
+    def canvas_height(self) -> int:
+        """Returns the height of the canvas at the current resolution."""
+        if self.meter.shape[0] == 0:
+            return 0
+        return int(np.rint(self.meter[-1, 1] * self.resolution))
+
+    def _update_size(self) -> None:
+        """Resizes the canvas to fit its tiles."""
+        self.setFixedSize(self.canvas_width(), self.canvas_height())
+
+    def paintEvent(self, event: QPaintEvent) -> None:
+        rect = event.rect()
+        qp = QPainter(self)
+        qp.fillRect(rect, QColor(0, 0, 0))
+
+        tops, bottoms = self.tile_bounds()
+        visible = (
+            (bottoms > rect.top())
+            & (tops <= rect.bottom())
+            & (self.tile_resolutions > 0)
+        )
+        current = self.tile_resolutions == self.resolution
+
+        # previews are scaled from the resolution they were rendered at, one
+        # transform for all of the tiles rendered at each resolution
+        for resolution in np.unique(self.tile_resolutions[visible & ~current]):
+            scale = self.resolution / resolution
+            qp.setTransform(QTransform.fromScale(scale, scale))
+            preview_tops, _ = self.tile_bounds(resolution)
+            for tile_idx in np.flatnonzero(
+                visible & (self.tile_resolutions == resolution)
+            ):
+                qp.drawPixmap(
+                    0, preview_tops[tile_idx], self.pixmaps[tile_idx]
+                )
+        qp.resetTransform()
+
+        widths = self.tile_widths(tops, bottoms)
+        for tile_idx in np.flatnonzero(visible & current):
+            qp.drawPixmap(
+                QRect(
+                    0,
+                    tops[tile_idx],
+                    widths[tile_idx],
+                    bottoms[tile_idx] - tops[tile_idx],
+                ),
+                self.pixmaps[tile_idx],
+            )
+        qp.end()
@@ -10,6 +10,9 @@ TODO:
 - store meter data in cfg for quick access
 """
 
+# directory within each dataset used to store files generated by the viewer
+CACHE_DIR = "hsu_cache"
+
 SKIP_COLUMNS = [
     "filename",
     "path",
@@ -121,6 +124,18 @@ class Dataset:
             "path"
         ]
 
+    def cache_dir(self) -> Path:
+        """Returns the directory used for the dataset's cached files."""
+        return Path(self.config["path"]).joinpath(CACHE_DIR)
+
+    def image_stack_path(self, mineral: str) -> str | None:
+        """Returns the path of a mineral's packed image stack if the dataset
+        was imported with one.
+        """
+        return self.config["data"]["Spectral Images"]["Mineral"][mineral].get(
+            "stack"
+        )
+
     def meter(self) -> np.array:
         meter_from = self.config["meter_from"]
         meter_to = self.config["meter_to"]
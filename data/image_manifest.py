@@ -0,0 +1,93 @@
+import os
+from pathlib import Path
+
+from natsort import os_sorted
+
+from data.pil_loader import pil
+
+# columns of each file in a manifest
+NAME, SIZE, MTIME, WIDTH, HEIGHT = 0, 1, 2, 3, 4
+
+# file types of row and core box images, core box photos are often jpegs
+IMAGE_SUFFIXES = (".png", ".jpg", ".jpeg")
+
+
+def list_images(image_dir: Path | str) -> list:
+    """Returns the images in a folder of row or core box images in row
+    order.
+
+    Args:
+        image_dir(Path | str): The folder of images.
+    """
+    return os_sorted(
+        path
+        for path in Path(image_dir).iterdir()
+        if path.suffix.lower() in IMAGE_SUFFIXES
+    )
+
+
+def build_manifest(image_dir: Path | str) -> dict:
+    """Lists the images in a folder of row or core box images in row order
+    along with their size, modification time and dimensions.
+
+    Folders are listed and naturally sorted once when a dataset is imported
+    rather than every time a panel is loaded, which is slow for folders of
+    thousands of images on network drives.
+
+    Args:
+        image_dir(Path | str): The folder of images.
+
+    Returns:
+        dict: The folder's modification time (ns) and a [name, bytes,
+            modification time (ns), width, height] list for each image.
+    """
+    image_dir = Path(image_dir)
+    files = []
+    for path in list_images(image_dir):
+        stat = path.stat()
+        # opening an image only reads its header
+        with pil().open(path) as image:
+            width, height = image.size
+        files.append(
+            [path.name, stat.st_size, stat.st_mtime_ns, width, height]
+        )
+
+    return {"mtime": image_dir.stat().st_mtime_ns, "files": files}
+
+
+def manifest_is_current(manifest: dict | None, image_dir: Path | str) -> bool:
+    """Returns whether a manifest still matches its folder.
+
+    Adding, removing or renaming images changes the folder's modification
+    time, so only the folder itself is checked.
+
+    Args:
+        manifest(dict | None): The folder's manifest, if it has one.
+        image_dir(Path | str): The folder of images.
+    """
+    if not manifest:
+        return False
+    try:
+        return os.stat(image_dir).st_mtime_ns == manifest["mtime"]
+    except OSError:
+        return False
+
+
+def manifest_paths(manifest: dict, image_dir: Path | str) -> list:
+    """Returns the path of each image in a manifest in row order.
+
+    Args:
+        manifest(dict): The folder's manifest.
+        image_dir(Path | str): The folder of images.
+    """
+    image_dir = Path(image_dir)
+    return [image_dir.joinpath(file[NAME]) for file in manifest["files"]]
+
+
+def manifest_sizes(manifest: dict) -> list:
+    """Returns the (width, height) of each image in a manifest.
+
+    Args:
+        manifest(dict): The folder's manifest.
+    """
+    return [(file[WIDTH], file[HEIGHT]) for file in manifest["files"]]
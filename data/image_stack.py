@@ -0,0 +1,254 @@
+import json
+import math
+import os
+import shutil
+from pathlib import Path
+
+import numpy as np
+from natsort import os_sorted
+
+from data.pil_loader import pil
+
+# columns of an image stack's row index. Stacks of mineral images also
+# record the region of each image holding its nonzero pixels, only that
+# region is stored.
+OFFSET, HEIGHT, WIDTH = 0, 1, 2
+TOP, LEFT, BOTTOM, RIGHT = 3, 4, 5, 6
+
+
+def stack_paths(stack_path: Path | str) -> tuple:
+    """Returns the paths of an image stack's pixel data and row index.
+
+    Args:
+        stack_path(Path | str): The path of the stack's pixel data.
+    """
+    stack_path = Path(stack_path)
+    return stack_path, stack_path.with_suffix(".index.npy")
+
+
+def sources_path(stack_path: Path | str) -> Path:
+    """Returns the path of the record of the images a stack was packed from.
+
+    Args:
+        stack_path(Path | str): The path of the stack's pixel data.
+    """
+    return Path(stack_path).with_suffix(".sources.json")
+
+
+def source_signature(image_dir: Path | str) -> list:
+    """Returns the number of png images in a directory and the directory's
+    modification time (ns).
+
+    Adding, removing or renaming images changes the directory's modification
+    time, so the images themselves aren't checked. Images edited in place are
+    picked up when the dataset is imported again, which repacks its stacks.
+
+    Args:
+        image_dir(Path | str): The directory of the images.
+    """
+    with os.scandir(image_dir) as entries:
+        n_images = sum(
+            1 for entry in entries if entry.name.lower().endswith(".png")
+        )
+    return [n_images, os.stat(image_dir).st_mtime_ns]
+
+
+def stack_is_current(stack_path: Path | str, image_dir: Path | str) -> bool:
+    """Returns whether a packed stack still matches the images it was packed
+    from. Stacks are stale once images are added, removed or renamed, and
+    stacks packed without a record of their images are never current. See
+    source_signature.
+
+    Args:
+        stack_path(Path | str): The path of the stack's pixel data.
+        image_dir(Path | str): The directory of the row images.
+    """
+    try:
+        with open(sources_path(stack_path), "r") as f:
+            signature = json.load(f)
+        return Path(stack_path).is_file() and signature == source_signature(
+            image_dir
+        )
+    except (OSError, json.JSONDecodeError):
+        return False
+
+
+def pyramid_level(source_height: float, target_height: float) -> int:
+    """Returns the coarsest pyramid level (each level halves the size of the
+    one before it) that is still at least as tall as the target height.
+
+    Args:
+        source_height(float): The full resolution height of the image.
+        target_height(float): The height the image will be displayed at.
+    """
+    if target_height <= 0 or source_height <= target_height:
+        return 0
+    return int(math.floor(math.log2(source_height / target_height)))
+
+
+def nonzero_region(image_array: np.ndarray) -> tuple:
+    """Returns the (top, left, bottom, right) bounding box of an image's
+    nonzero pixels, (0, 0, 0, 0) if the image is empty.
+
+    Args:
+        image_array(np.ndarray): The (height, width, 3) image.
+    """
+    rows = np.flatnonzero(image_array.any(axis=(1, 2)))
+    if rows.size == 0:
+        return 0, 0, 0, 0
+    columns = np.flatnonzero(image_array.any(axis=(0, 2)))
+    return rows[0], columns[0], rows[-1] + 1, columns[-1] + 1
+
+
+def save_image_stack(images: list, stack_path: Path | str) -> None:
+    """Saves a list of (height, width, 3) uint8 arrays as an image stack.
+
+    Args:
+        images(list): The row images to save.
+        stack_path(Path | str): The path of the packed pixel data.
+    """
+    data_path, index_path = stack_paths(stack_path)
+    data_path.parent.mkdir(parents=True, exist_ok=True)
+
+    index = np.zeros((len(images), 3), dtype=np.int64)
+    offset = 0
+    for row_idx, image in enumerate(images):
+        index[row_idx] = [offset, image.shape[0], image.shape[1]]
+        offset = offset + image.size
+
+    np.save(data_path, np.concatenate([image.ravel() for image in images]))
+    np.save(index_path, index)
+
+
+def pack_image_stack(image_dir: Path | str, stack_path: Path | str) -> None:
+    """Packs the RGB pixels of every png in a directory into a single uint8
+    array that can be memory mapped, along with a row index holding the
+    offset, height, width and nonzero region of each image.
+
+    Most mineral images are empty or only partly filled, so only the region
+    of each image holding nonzero pixels is stored and empty images aren't
+    stored at all. The number of images and their directory's modification
+    time are recorded so stale stacks can be detected, see stack_is_current.
+
+    Args:
+        image_dir(Path | str): The directory containing the row images.
+        stack_path(Path | str): The path of the packed pixel data.
+    """
+    data_path, index_path = stack_paths(stack_path)
+    data_path.parent.mkdir(parents=True, exist_ok=True)
+    # a stack left partly packed is never mistaken for a current one
+    sources_path(stack_path).unlink(missing_ok=True)
+
+    # recorded before reading so images added while packing are repacked
+    signature = source_signature(image_dir)
+    image_paths = os_sorted(Path(image_dir).glob("*.png"))
+
+    # the size of the pixel data is only known once every image has been
+    # cropped, so regions are written to a raw file and copied into the
+    # stack after its header
+    raw_path = data_path.with_suffix(".raw")
+    index = np.zeros((len(image_paths), 7), dtype=np.int64)
+    offset = 0
+    try:
+        with open(raw_path, "wb") as raw_file:
+            for row_idx, path in enumerate(image_paths):
+                with pil().open(path) as image:
+                    image_array = np.asarray(image.convert("RGB"))
+                bbox = nonzero_region(image_array)
+                top, left, bottom, right = bbox
+                region = np.ascontiguousarray(
+                    image_array[top:bottom, left:right]
+                )
+                index[row_idx] = [offset, *image_array.shape[:2], *bbox]
+                raw_file.write(region.tobytes())
+                offset = offset + region.size
+
+        with open(data_path, "wb") as data_file:
+            np.lib.format.write_array_header_1_0(
+                data_file,
+                {"descr": "|u1", "fortran_order": False, "shape": (offset,)},
+            )
+            with open(raw_path, "rb") as raw_file:
+                shutil.copyfileobj(raw_file, data_file)
+    finally:
+        raw_path.unlink(missing_ok=True)
+
+    np.save(index_path, index)
+    with open(sources_path(stack_path), "w") as f:
+        json.dump(signature, f)
+
+
+class ImageStack:
+    """Read only, memory mapped access to a packed image stack.
+
+    Indexing the stack returns a (height, width, 3) view of a row's pixels
+    without copying or decoding them. Rows stored as a nonzero region are
+    placed on a black image of the row's full size, region returns just the
+    stored pixels.
+    """
+
+    def __init__(self, stack_path: Path | str) -> None:
+        """Opens the stack
+
+        Args:
+            stack_path(Path | str): The path of the stack's pixel data.
+        """
+        data_path, index_path = stack_paths(stack_path)
+        self.data = np.load(data_path, mmap_mode="r")
+        self.index = np.load(index_path)
+
+    def __len__(self) -> int:
+        return self.index.shape[0]
+
+    def __getitem__(self, row_idx: int) -> np.ndarray:
+        height, width = self.index[row_idx, HEIGHT : WIDTH + 1]
+        region = self.region(row_idx)
+        if region.shape[:2] == (height, width):
+            return region
+
+        top, left, bottom, right = self.bbox(row_idx)
+        image = np.zeros((height, width, 3), dtype=np.uint8)
+        image[top:bottom, left:right] = region
+        return image
+
+    def bbox(self, row_idx: int) -> tuple:
+        """Returns the (top, left, bottom, right) region of a row image that
+        is stored. Stacks packed without regions store the whole image.
+
+        Args:
+            row_idx(int): The index of the row.
+        """
+        if self.index.shape[1] <= RIGHT:
+            height, width = self.index[row_idx, HEIGHT : WIDTH + 1]
+            return 0, 0, height, width
+        return tuple(self.index[row_idx, TOP : RIGHT + 1])
+
+    def region(self, row_idx: int) -> np.ndarray:
+        """Returns a view of the stored region of a row image.
+
+        Args:
+            row_idx(int): The index of the row.
+        """
+        offset = self.index[row_idx, OFFSET]
+        top, left, bottom, right = self.bbox(row_idx)
+        height, width = bottom - top, right - left
+        return self.data[offset : offset + height * width * 3].reshape(
+            height, width, 3
+        )
+
+    def is_empty(self, row_idx: int) -> bool:
+        """Returns True if a row image has no nonzero pixels, without
+        reading it.
+
+        Args:
+            row_idx(int): The index of the row.
+        """
+        top, left, bottom, right = self.bbox(row_idx)
+        return bottom <= top or right <= left
+
+    def shapes(self) -> list:
+        """Returns the (height, width, 3) shape of each row image."""
+        return [
+            (height, width, 3)
+            for height, width in self.index[:, HEIGHT : WIDTH + 1]
+        ]
@@ -0,0 +1,16 @@
+import importlib
+
+"""
+PIL is slow to import and isn't needed to show the empty viewer, so modules
+that read or write images get it through pil, which imports it the first time
+an image is opened.
+"""
+
+
+def pil(module: str = "Image"):
+    """Returns a PIL module, importing it on first use.
+
+    Args:
+        module(str): The name of the module, e.g. "Image" or "ImageEnhance".
+    """
+    return importlib.import_module(f"PIL.{module}")
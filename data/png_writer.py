@@ -0,0 +1,93 @@
+import struct
+import zlib
+from pathlib import Path
+
+import numpy as np
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+class PngWriter:
+    """Writes an 8 bit RGB png one block of rows at a time.
+
+    Only the compressor's state is kept between blocks, so images far taller
+    than would fit in memory (or in a QImage) can be written.
+    """
+
+    def __init__(
+        self,
+        path: Path | str,
+        width: int,
+        height: int,
+        compression: int = 6,
+    ) -> None:
+        """Opens the image and writes its header
+
+        Args:
+            path(Path | str): The path of the png.
+            width(int): The width of the image in pixels.
+            height(int): The height of the image in pixels.
+            compression(int): The zlib compression level (0-9).
+        """
+        self.width = width
+        self.height = height
+        self.rows_written = 0
+
+        self._compressor = zlib.compressobj(compression)
+        self._file = open(path, "wb")
+        self._file.write(PNG_SIGNATURE)
+        # 8 bit depth, truecolour, default compression, filter and interlace
+        self._write_chunk(
+            b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+        )
+
+    def __enter__(self) -> "PngWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self._file.close()
+
+    def write_rows(self, rows: np.ndarray) -> None:
+        """Appends rows to the image.
+
+        Args:
+            rows(np.ndarray): (n rows, width, 3) uint8 pixels.
+        """
+        if rows.shape[1:] != (self.width, 3):
+            raise ValueError(
+                f"Expected rows {self.width} pixels wide, got {rows.shape[1]}"
+            )
+        if self.rows_written + rows.shape[0] > self.height:
+            raise ValueError("More rows written than the image height")
+
+        # each row starts with its filter type, 0 (none)
+        scanlines = np.zeros((rows.shape[0], self.width * 3 + 1), np.uint8)
+        scanlines[:, 1:] = rows.reshape(rows.shape[0], -1)
+        self._write_data(self._compressor.compress(scanlines.tobytes()))
+        self.rows_written = self.rows_written + rows.shape[0]
+
+    def close(self) -> None:
+        """Finishes the image. Every row must have been written."""
+        if self.rows_written != self.height:
+            self._file.close()
+            raise ValueError(
+                f"Image closed after {self.rows_written} of {self.height} rows"
+            )
+        self._write_data(self._compressor.flush())
+        self._write_chunk(b"IEND", b"")
+        self._file.close()
+
+    def _write_data(self, data: bytes) -> None:
+        if data:
+            self._write_chunk(b"IDAT", data)
+
+    def _write_chunk(self, chunk_type: bytes, data: bytes) -> None:
+        self._file.write(struct.pack(">I", len(data)))
+        self._file.write(chunk_type)
+        self._file.write(data)
+        self._file.write(
+            struct.pack(">I", zlib.crc32(data, zlib.crc32(chunk_type)))
+        )
@@ -0,0 +1,516 @@
+import functools
+from pathlib import Path
+
+import numpy as np
+
+from data.dataset import Dataset
+from data.image_manifest import (
+    list_images,
+    manifest_is_current,
+    manifest_paths,
+    manifest_sizes,
+)
+from data.image_stack import ImageStack, pyramid_level, stack_is_current
+from data.pil_loader import pil
+
+"""
+Loads the data displayed by each type of panel as NumPy arrays, without any
+Qt objects, so loads can run in worker threads, process pools and headless
+tools. Panels convert the results to images and plots when displaying them.
+"""
+
+# rows above the data in an HSU csv: info, headers, units, min and max
+CSV_HEADER_ROWS = 5
+
+# depths at or above this are placeholders for missing depths
+MISSING_DEPTH = 9999
+
+# factor composites are brightened by after their minerals are blended
+COMPOSITE_BRIGHTNESS = 5
+
+# offset of each channel's entries in a colour lookup table
+CHANNEL_OFFSETS = np.arange(3, dtype=np.uint16) * 256
+
+
+def plot_data(
+    dataset: Dataset,
+    data_type: str,
+    data_subtype: str,
+    data_name: str | list,
+) -> tuple:
+    """Returns the bars of a plot panel.
+
+    Args:
+        dataset(Dataset): The dataset the data belongs to.
+        data_type(str): The type of data e.g. "Spectral Data".
+        data_subtype(str): The subtype of data e.g. "Mineral Percent".
+        data_name(str | list): The name of the data, or the minerals of a
+            composite plot.
+
+    Returns:
+        tuple: The width and centre (m) of each bar, the start and end depth
+            (m) of the plot and the value of each bar. Composite plots have a
+            column of values for each mineral.
+    """
+    data_info = dataset.data(data_type, data_subtype, data_name)
+    if data_subtype == "Geochemistry":
+        return geochem_plot_data(
+            dataset.geochem_path(data_name), data_name, data_info.get("unit")
+        )
+
+    csv_path = Path(dataset.config["csv_data"]["path"])
+    if data_subtype == "Composite Plot":
+        return composite_plot_data(csv_path, data_info)
+    return spectral_plot_data(csv_path, data_info)
+
+
+def spectral_plot_data(csv_path: Path | str, data_info: dict) -> tuple:
+    """Returns the bars of a single column of spectral data. See plot_data.
+
+    Args:
+        csv_path(Path | str): The dataset's csv.
+        data_info(dict): The config entry of the data, with its column and
+            the columns of its depths.
+    """
+    data = np.genfromtxt(
+        csv_path,
+        delimiter=",",
+        dtype="float",
+        comments=None,
+        skip_header=CSV_HEADER_ROWS,
+        usecols=[
+            data_info.get("meter_from"),
+            data_info.get("meter_to"),
+            data_info.get("column"),
+        ],
+    )
+
+    if data[-1, 1] >= MISSING_DEPTH:
+        data[:, 0] = np.arange(0, data.shape[0], 1)
+        data[:, 1] = np.arange(1, data.shape[0] + 1, 1)
+
+    if data[0, 0] != 0:
+        data = np.insert(
+            data.astype(float), 0, [0, data[0, 0], np.nan], axis=0
+        )
+
+    bar_widths = data[:, 1] - data[:, 0]
+    bar_centers = (data[:, 0] + data[:, 1]) / 2
+    meter_start = data[0, 0]
+    meter_end = data[-1, 1]
+    spectral_data = data[:, 2]
+
+    return bar_widths, bar_centers, meter_start, meter_end, spectral_data
+
+
+def composite_plot_data(csv_path: Path | str, data_info: dict) -> tuple:
+    """Returns the bars of several minerals to be stacked. See plot_data.
+
+    Args:
+        csv_path(Path | str): The dataset's csv.
+        data_info(dict): The config entry of each mineral.
+    """
+    mineral_columns = [info["column"] for info in data_info.values()]
+    first_mineral = next(iter(data_info.values()))
+
+    data = np.genfromtxt(
+        csv_path,
+        delimiter=",",
+        dtype="float",
+        comments=None,
+        skip_header=CSV_HEADER_ROWS,
+        usecols=[
+            first_mineral["meter_from"],
+            first_mineral["meter_to"],
+            *mineral_columns,
+        ],
+    )
+
+    if data[-1, 1] >= MISSING_DEPTH:
+        data[:, 0] = np.arange(0, data.shape[0], 1)
+        data[:, 1] = np.arange(1, data.shape[0] + 1, 1)
+
+    if data[0, 0] != 0:
+        top_row = np.full([1, data.shape[1]], np.nan)
+        top_row[0, 0] = 0
+        top_row[0, 1] = data[0, 0]
+        data = np.insert(data.astype(float), 0, top_row, axis=0)
+
+    bar_widths = data[:, 1] - data[:, 0]
+    bar_centers = (data[:, 0] + data[:, 1]) / 2
+    meter_start = data[0, 0]
+    meter_end = data[-1, 1]
+    spectral_data = data[:, 2:]
+
+    return bar_widths, bar_centers, meter_start, meter_end, spectral_data
+
+
+def geochem_plot_data(
+    geochem_path: Path | str, data_name: str, unit: str
+) -> tuple:
+    """Returns the bars of a geochemistry assay. See plot_data.
+
+    Args:
+        geochem_path(Path | str): The geochemistry xlsx.
+        data_name(str): The name of the assay e.g. "Cu".
+        unit(str): The unit of the assay e.g. "ppm".
+    """
+    # openpyxl is slow to import so it isn't loaded until geochemistry data
+    # is plotted
+    from openpyxl import load_workbook
+
+    wb = load_workbook(filename=geochem_path)
+    ws = wb["Geochemistry"]
+    meter_start = None
+    meter_end = None
+
+    for col in ws.iter_cols(min_row=2, min_col=2, values_only=True):
+        header = col[0]
+        col_data = [
+            c for c in col if isinstance(c, int) or isinstance(c, float)
+        ]
+        if header == "depth_start":
+            meter_start = np.array(col_data)
+        elif header == "depth_end":
+            meter_end = np.array(col_data)
+        elif header == f"{data_name}_{unit}":
+            data = np.array(col_data)
+
+    if meter_end[-1] >= MISSING_DEPTH:
+        meter_start = np.arange(0, data.shape[0], 1)
+        meter_end = np.arange(1, data.shape[0] + 1, 1)
+
+    if meter_start[0] != 0:
+        meter_start = np.insert(meter_start, 0, 0)
+        meter_end = np.insert(meter_end, 0, meter_start[0])
+        data = np.insert(data.astype(float), 0, np.nan)
+
+    bar_widths = meter_end - meter_start
+    bar_centers = (meter_end + meter_start) / 2
+    meter_start = meter_start[0]
+    meter_end = meter_end[-1]
+
+    return bar_widths, bar_centers, meter_start, meter_end, data
+
+
+def image_meter(dataset: Dataset, data_type: str) -> np.ndarray:
+    """Returns the start and end depth (m) of each row or core box image.
+    Missing depths are replaced with evenly spaced rows.
+
+    Args:
+        dataset(Dataset): The dataset the images belong to.
+        data_type(str): "Spectral Images" for row images or "Corebox Images"
+            for core box images.
+    """
+    match data_type:
+        case "Spectral Images":
+            meter = dataset.get_row_meter()
+        case "Corebox Images":
+            meter = dataset.get_box_meter()
+
+    if meter.max() >= MISSING_DEPTH:
+        depth = dataset.n_rows() * 2
+        step = depth / (meter.shape[0])
+        meter[:, 0] = np.linspace(0, depth - step, meter.shape[0])
+        meter[:, 1] = np.linspace(step, depth, meter.shape[0])
+
+    return meter
+
+
+def composite_meter(dataset: Dataset) -> np.ndarray:
+    """Returns the start and end depth (m) of each composite row. Missing
+    depths are replaced with 1 m rows to line up with the plots.
+
+    Args:
+        dataset(Dataset): The dataset the images belong to.
+    """
+    meter = dataset.get_row_meter()
+
+    if meter.max() >= MISSING_DEPTH:
+        meter[:, 0] = np.arange(0, meter.shape[0], 1)
+        meter[:, 1] = np.arange(1, meter.shape[0] + 1, 1)
+
+    return meter
+
+
+def image_paths(image_dir: Path | str, manifest: dict | None = None) -> list:
+    """Returns the images in a folder of row or core box images in row order.
+    The folder's manifest is used unless the folder has changed since it was
+    recorded, in which case the folder is listed and sorted.
+
+    Args:
+        image_dir(Path | str): The folder of images.
+        manifest(dict | None): The folder's manifest, recorded on import.
+    """
+    if manifest_is_current(manifest, image_dir):
+        return manifest_paths(manifest, image_dir)
+    return list_images(image_dir)
+
+
+def image_sizes(image_paths: list) -> list:
+    """Returns the (width, height) of each image, reading only their headers.
+
+    Args:
+        image_paths(list): The paths of the images.
+    """
+    sizes = []
+    for path in image_paths:
+        with pil().open(path) as image:
+            sizes.append(image.size)
+    return sizes
+
+
+def load_image(path: Path | str, target_height: float = None) -> np.ndarray:
+    """Returns an image as a (height, width, 3) uint8 array.
+
+    Images displayed smaller than their full size are decoded at a reduced
+    size that is still at least target_height tall. Jpegs are decoded at a
+    half, quarter or eighth of their size straight from their compressed
+    data, pngs are decoded in full and reduced to the nearest pyramid level.
+
+    Args:
+        path(Path | str): The path of the image.
+        target_height(float): The height the image will be displayed at,
+            defaults to its full height.
+    """
+    with pil().open(path) as image:
+        if not target_height or target_height >= image.height:
+            return np.asarray(image.convert("RGB"))
+
+        target_width = image.width * target_height / image.height
+        # only has an effect on jpegs
+        image.draft("RGB", (int(target_width), int(target_height)))
+        level = pyramid_level(image.height, target_height)
+        reduced = image.convert("RGB")
+        if level:
+            reduced = reduced.reduce(2**level)
+        return np.asarray(reduced)
+
+
+def mineral_masks(dataset: Dataset, mineral: str) -> tuple:
+    """Returns the intensity of a mineral in every row and the shape of each
+    row image. Packed image stacks are memory mapped, unless the images have
+    changed since they were packed. Otherwise each png is decoded.
+
+    Args:
+        dataset(Dataset): The dataset the mineral images belong to.
+        mineral(str): The mineral.
+
+    Returns:
+        tuple: An ImageStack, or a list of (height, width, 3) uint8 arrays
+            with None for empty rows, and a list of the row image shapes.
+    """
+    mineral_info = dataset.data("Spectral Images", "Mineral", mineral)
+    stack_path = dataset.image_stack_path(mineral)
+    # stacks are ignored once their images have changed since import
+    if stack_path and stack_is_current(stack_path, mineral_info["path"]):
+        stack = ImageStack(stack_path)
+        return stack, stack.shapes()
+
+    masks = []
+    row_shapes = []
+    for path in image_paths(
+        mineral_info["path"], mineral_info.get("manifest")
+    ):
+        image_array = load_image(path)
+        row_shapes.append(image_array.shape)
+        masks.append(image_array if np.any(image_array) else None)
+    return masks, row_shapes
+
+
+def row_shapes(dataset: Dataset, mineral: str) -> list | None:
+    """Returns the shape of each of a mineral's row images from the folder's
+    manifest, without opening the images.
+
+    Args:
+        dataset(Dataset): The dataset the mineral images belong to.
+        mineral(str): The mineral.
+
+    Returns:
+        list | None: The (height, width, 3) shape of each row image, or None
+            if the folder has changed since its manifest was recorded.
+    """
+    mineral_info = dataset.data("Spectral Images", "Mineral", mineral)
+    manifest = mineral_info.get("manifest")
+    if not manifest_is_current(manifest, mineral_info["path"]):
+        return None
+    return [(height, width, 3) for width, height in manifest_sizes(manifest)]
+
+
+def row_mask(masks: ImageStack | list, row_idx: int) -> tuple:
+    """Returns a mineral's image in a row. Packed image stacks only store
+    the region of each image holding nonzero pixels, so empty images are
+    skipped without reading them.
+
+    Args:
+        masks(ImageStack | list): The mineral's images, see mineral_masks.
+        row_idx(int): The index of the row.
+
+    Returns:
+        tuple: The (height, width, 3) uint8 image, or None if it's empty,
+            and the (top, left, bottom, right) region of the row it covers,
+            or None if it covers the whole row.
+    """
+    if isinstance(masks, ImageStack):
+        if masks.is_empty(row_idx):
+            return None, None
+        return masks.region(row_idx), masks.bbox(row_idx)
+    return masks[row_idx], None
+
+
+def hex_to_rgb(color: str) -> np.ndarray:
+    """Converts a hex colour code e.g. "#ff0000" to an rgb array.
+
+    Args:
+        color(str): The hex colour, with or without the leading #.
+    """
+    color = color.lstrip("#")
+    return np.array([int(color[i : i + 2], 16) for i in (0, 2, 4)])
+
+
+@functools.lru_cache(maxsize=64)
+def color_lut(color: str) -> np.ndarray:
+    """Returns a lookup table of a mineral colour's red, green and blue
+    multiplied by each intensity (0-255). The entry for an intensity in a
+    channel is at CHANNEL_OFFSETS[channel] + intensity.
+
+    Tables only depend on the colour, so changing a mineral's colour only
+    builds a 768 entry table and the mineral images are used as they are.
+
+    Args:
+        color(str): The hex colour of the mineral.
+    """
+    rgb = hex_to_rgb(color).astype(np.uint16)
+    lut = (rgb[:, None] * np.arange(256, dtype=np.uint16)).ravel()
+    lut.setflags(write=False)
+    return lut
+
+
+@functools.lru_cache(maxsize=1)
+def brightness_lut() -> np.ndarray:
+    """Returns a lookup table of each value (0-255) brightened by
+    COMPOSITE_BRIGHTNESS, saturating at 255.
+    """
+    # built with the same enhancer composites were brightened with
+    ramp = pil().fromarray(np.arange(256, dtype=np.uint8)[None, :], "L")
+    enhancer = pil("ImageEnhance").Brightness(ramp)
+    lut = np.asarray(enhancer.enhance(COMPOSITE_BRIGHTNESS))[0].copy()
+    lut.setflags(write=False)
+    return lut
+
+
+@functools.lru_cache(maxsize=16)
+def blend_luts(n_ims: int) -> tuple:
+    """Returns lookup tables from the sum of the coloured intensities
+    (colour * intensity) of n_ims mineral images to a composite value.
+
+    The composite value is the average coloured intensity (sum / 255 /
+    n_ims, rounded down) brightened by brightness_lut, so averaging and
+    brightening are a single lookup.
+
+    Args:
+        n_ims(int): The number of mineral images blended.
+
+    Returns:
+        tuple: The uint8 composite value of each sum and whether each sum
+            averages to an exact nonzero integer, see composite_row.
+    """
+    sums = np.arange(255 * 255 * n_ims + 1, dtype=np.uint32)
+    values = brightness_lut()[sums // (255 * n_ims)]
+    exact = (sums % (255 * n_ims) == 0) & (sums > 0)
+    values.setflags(write=False)
+    exact.setflags(write=False)
+    return values, exact
+
+
+def composite_row(
+    masks: list,
+    colors: list,
+    row_shape: tuple,
+    level: int = 0,
+    bboxes: list = None,
+) -> np.ndarray:
+    """Stacks the mineral images of a single row into a composite image.
+
+    Each image is coloured through its colour's lookup table, the coloured
+    images are summed as integers and the sums are averaged and brightened
+    through a single lookup table, without converting any image to floats.
+
+    Args:
+        masks(list): The (height, width, 3) uint8 image of each mineral in
+            the row, None where a mineral isn't present.
+        colors(list): The hex colour of each mineral.
+        row_shape(tuple): The shape of the row image.
+        level(int): The pyramid level the composite is reduced to.
+        bboxes(list): The (top, left, bottom, right) region of the row each
+            image covers, None where it covers the whole row. Defaults to
+            every image covering the whole row. See row_mask.
+    """
+    if bboxes is None:
+        bboxes = [None] * len(masks)
+
+    sums = np.zeros(row_shape, dtype=np.uint32)
+    blended = []
+    for mask, color, bbox in zip(masks, colors, bboxes):
+        if mask is None:
+            continue
+        # only the region covered by the image is coloured and added
+        colored_image = np.take(color_lut(color), mask + CHANNEL_OFFSETS)
+
+        if np.any(colored_image):
+            if bbox is None:
+                sums += colored_image
+            else:
+                top, left, bottom, right = bbox
+                sums[top:bottom, left:right] += colored_image
+            blended.append((mask, color, bbox))
+
+    if blended:
+        values, exact = blend_luts(len(blended))
+        row_image = np.take(values, sums)
+        # composites used to be blended with floats, which can round an
+        # exact average down to the integer below. These pixels are blended
+        # the same way so composites don't change.
+        exact_pixels = np.flatnonzero(np.take(exact, sums))
+        if exact_pixels.size:
+            row_image.flat[exact_pixels] = brightness_lut()[
+                float_blend(blended, row_shape, exact_pixels)
+            ]
+    else:
+        row_image = np.zeros(row_shape, np.uint8)
+
+    if level:
+        row_image = np.asarray(
+            pil().fromarray(row_image, "RGB").reduce(2**level)
+        )
+    return row_image
+
+
+def float_blend(blended: list, row_shape: tuple, pixels: np.ndarray):
+    """Returns the average coloured intensity of some pixels of a row as
+    composites were blended before integer blending, in floating point and
+    rounded down.
+
+    Args:
+        blended(list): The (image, hex colour, region) of each mineral
+            blended, see composite_row.
+        row_shape(tuple): The shape of the row image.
+        pixels(np.ndarray): The flat indices of the pixels in the row image.
+    """
+    rows, columns, channels = np.unravel_index(pixels, row_shape)
+    total = np.zeros(pixels.size)
+    for mask, color, bbox in blended:
+        top, left = (0, 0) if bbox is None else bbox[:2]
+        inside = (
+            (rows >= top)
+            & (rows < top + mask.shape[0])
+            & (columns >= left)
+            & (columns < left + mask.shape[1])
+        )
+        colored = np.zeros(pixels.size)
+        colored[inside] = hex_to_rgb(color)[channels[inside]] * (
+            mask[rows[inside] - top, columns[inside] - left, channels[inside]]
+            / 255
+        )
+        total = total + colored
+    return (total / len(blended)).astype(np.uint8)
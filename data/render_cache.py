@@ -0,0 +1,189 @@
+import hashlib
+import json
+import os
+import uuid
+from pathlib import Path
+
+from data.image_stack import (
+    ImageStack,
+    save_image_stack,
+    source_signature,
+    stack_paths,
+)
+
+# default size limit of a dataset's render cache
+DEFAULT_MAX_BYTES = 1024**3
+
+
+class RenderCache:
+    """On-disk cache of rendered composite images for a single dataset.
+
+    Each entry holds every composite row of one set of minerals, colours and
+    pyramid level as an ImageStack. Entries record the number of source
+    images they were rendered from and the modification time of their
+    directories, and are ignored once those change. The least recently used entries are evicted
+    when the cache grows beyond its size limit.
+    """
+
+    def __init__(
+        self, cache_dir: Path | str, max_bytes: int = DEFAULT_MAX_BYTES
+    ) -> None:
+        """Initialize cache
+
+        Args:
+            cache_dir(Path | str): The directory entries are stored in.
+            max_bytes(int): The maximum total size of all entries.
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def key(minerals: list, colors: dict, level: int) -> str:
+        """Returns the cache key for a composite render.
+
+        Args:
+            minerals(list): The minerals in the composite.
+            colors(dict): The hex colour assigned to each mineral.
+            level(int): The pyramid level of the render.
+        """
+        minerals = sorted(minerals)
+        key_data = {
+            "minerals": minerals,
+            "colors": [colors.get(mineral).lower() for mineral in minerals],
+            "level": level,
+        }
+        return hashlib.sha1(json.dumps(key_data).encode("utf-8")).hexdigest()
+
+    def get(self, key: str, source_dirs: list) -> ImageStack | None:
+        """Returns a cached render, or None if there isn't a valid entry or
+        the cache can't be read.
+
+        Args:
+            key(str): The key of the render.
+            source_dirs(list): The directories of the source images.
+        """
+        meta_path = self._meta_path(key)
+        try:
+            with open(meta_path, "r") as f:
+                meta_data = json.load(f)
+            sources = self.source_signature(source_dirs)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+        if meta_data.get("sources") != sources:
+            self._remove(key)
+            return None
+
+        try:
+            stack = ImageStack(self._stack_path(key))
+        except (OSError, ValueError):
+            return None
+
+        # the meta file's modification time tracks when it was last used,
+        # read only caches are used without tracking it
+        try:
+            os.utime(meta_path)
+        except OSError:
+            pass
+
+        return stack
+
+    def put(self, key: str, source_dirs: list, images: list) -> None:
+        """Adds a render to the cache, evicting old entries if needed. Renders
+        that can't be written (e.g. the dataset is read only or the disk is
+        full) aren't cached.
+
+        Args:
+            key(str): The key of the render.
+            source_dirs(list): The directories of the source images.
+            images(list): The rendered (height, width, 3) uint8 row images.
+        """
+        # write under a unique name first so readers never see partial files
+        temp_path = self.cache_dir.joinpath(f"{key}.{uuid.uuid4().hex}.npy")
+        temp_meta_path = temp_path.with_suffix(".json")
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            save_image_stack(images, temp_path)
+            for temp_file, entry_file in zip(
+                stack_paths(temp_path), stack_paths(self._stack_path(key))
+            ):
+                os.replace(temp_file, entry_file)
+
+            with open(temp_meta_path, "w") as f:
+                json.dump({"sources": self.source_signature(source_dirs)}, f)
+            os.replace(temp_meta_path, self._meta_path(key))
+        except OSError:
+            self._remove_files([*stack_paths(temp_path), temp_meta_path])
+            return
+
+        self.evict()
+
+    def evict(self) -> None:
+        """Removes least recently used entries until the cache is within its
+        size limit.
+        """
+        entries = []
+        total_bytes = 0
+        try:
+            meta_paths = list(self.cache_dir.glob("*.json"))
+        except OSError:
+            return
+        for meta_path in meta_paths:
+            key = meta_path.stem
+            if "." in key:
+                # written by a put that hasn't finished, see put
+                continue
+            try:
+                last_used = meta_path.stat().st_mtime
+                size = sum(
+                    path.stat().st_size
+                    for path in stack_paths(self._stack_path(key))
+                )
+            except OSError:
+                continue
+            entries.append((last_used, key, size))
+            total_bytes = total_bytes + size
+
+        for _, key, size in sorted(entries):
+            if total_bytes <= self.max_bytes:
+                break
+            if self._remove(key):
+                total_bytes = total_bytes - size
+
+    @staticmethod
+    def source_signature(source_dirs: list) -> list:
+        """Returns the number of png images in each source directory and the
+        directory's modification time (ns).
+
+        Args:
+            source_dirs(list): The directories of the source images.
+        """
+        return [
+            [Path(source_dir).as_posix(), *source_signature(source_dir)]
+            for source_dir in sorted(source_dirs)
+        ]
+
+    def _stack_path(self, key: str) -> Path:
+        return self.cache_dir.joinpath(f"{key}.npy")
+
+    def _meta_path(self, key: str) -> Path:
+        return self.cache_dir.joinpath(f"{key}.json")
+
+    def _remove(self, key: str) -> bool:
+        """Deletes an entry. Entries still memory mapped by a panel can't be
+        deleted on some platforms and read only caches can't be changed,
+        these are left for a later eviction.
+        """
+        return self._remove_files(
+            [self._meta_path(key), *stack_paths(self._stack_path(key))]
+        )
+
+    @staticmethod
+    def _remove_files(paths: list) -> bool:
+        """Deletes files, returning False if any couldn't be deleted."""
+        try:
+            for path in paths:
+                path.unlink(missing_ok=True)
+        except OSError:
+            return False
+        return True
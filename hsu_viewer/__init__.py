@@ -1,6 +1,5 @@
 from pathlib import Path
 
-import matplotlib
 from PySide6.QtGui import QIcon, QResizeEvent
 from PySide6.QtWidgets import QMainWindow, QWidget, QHBoxLayout
 from PySide6.QtCore import Slot
@@ -22,8 +21,6 @@ from components.mineral_color_selector import MineralColorSelector
 from components.dataset_selector import DatasetSelector
 from components.drawer import Drawer
 
-matplotlib.use("QtAgg")
-
 HSU_STYLES = """
     QWidget{
         background-color: rgb(10,15,20);
@@ -110,6 +107,9 @@ class HSUViewer(QMainWindow):
         self.dashboard.add_dataset_button.clicked.connect(
             self._open_dataset_selector
         )
+        self.drawer.save_strip_log_button.clicked.connect(
+            self.dashboard.save_strip_log
+        )
 
         layout.addWidget(self.drawer)
         layout.addWidget(self.dashboard)
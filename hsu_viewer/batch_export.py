@@ -0,0 +1,306 @@
+import argparse
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from PySide6.QtWidgets import QApplication
+
+from components.data_header import DataHeader
+from components.dashboard import (
+    MIN_RESOLUTION,
+    create_data_panel,
+    panel_image_name,
+)
+from components.mineral_legend import MineralLegend
+from components.panel_renderer import (
+    MeterRenderer,
+    export_tiles,
+    export_vector,
+)
+from components.strip_log import (
+    LegendRenderer,
+    export_strip_log,
+    paint_legend_header,
+)
+from data.dataset import Dataset
+from hsu_viewer.hsu_config import HSUConfig
+
+"""
+Headless export of panel images for one or more datasets, e.g.
+
+    python main.py export --panel "Spectral Images:Mineral:Chlorite" \\
+        --panel "Spectral Data:Composite Plot:Chlorite+Muscovite" \\
+        --resolution 20 --output-dir strip_logs
+
+Panels are drawn from their data at the export resolution, holes too long
+for a single image are saved as tiles. With --strip-log png|pdf the panels of
+each hole are combined into a single strip log instead. Each dataset (hole)
+is exported in its own process.
+"""
+
+# separators used in panel specs ("Data Type:Subtype:Name+Name")
+SPEC_SEPARATOR = ":"
+MINERAL_SEPARATOR = "+"
+
+# resolution (px/m) panels are loaded at before being rendered for export
+LOAD_RESOLUTION = MIN_RESOLUTION
+
+
+def add_export_arguments(parser: argparse.ArgumentParser) -> None:
+    """Adds the batch export options to an argument parser.
+
+    Args:
+        parser(argparse.ArgumentParser): The parser for the export command.
+    """
+    parser.add_argument(
+        "--config",
+        default=Path.cwd().joinpath("hsu_datasets.cfg"),
+        type=Path,
+        help="HSU configuration file listing the imported datasets.",
+    )
+    parser.add_argument(
+        "--datasets",
+        nargs="+",
+        help="Datasets (holes) to export. Defaults to every dataset.",
+    )
+    parser.add_argument(
+        "--panel",
+        action="append",
+        required=True,
+        dest="panels",
+        help=(
+            'Panel to export as "Data Type:Subtype:Name", composites list '
+            'their minerals as "Name+Name". Can be repeated.'
+        ),
+    )
+    parser.add_argument(
+        "--resolution",
+        default=20,
+        type=float,
+        help="Export resolution in pixels per meter.",
+    )
+    parser.add_argument(
+        "--no-meter",
+        action="store_false",
+        dest="meter",
+        help="Don't include the depth meter beside each panel.",
+    )
+    parser.add_argument(
+        "--vector-format",
+        choices=["svg", "pdf"],
+        help="Save plot panels as vector graphics in this format.",
+    )
+    parser.add_argument(
+        "--strip-log",
+        choices=["png", "pdf"],
+        dest="strip_log_format",
+        help=(
+            "Combine each hole's panels, their headers and the mineral legend "
+            "into a single strip log saved in this format."
+        ),
+    )
+    parser.add_argument(
+        "--output-dir", default=Path.cwd(), type=Path, help="Output folder."
+    )
+    parser.add_argument(
+        "--workers",
+        default=None,
+        type=int,
+        help="Number of holes exported in parallel.",
+    )
+
+
+def parse_panel_spec(spec: str) -> tuple:
+    """Splits a panel spec into its data type, subtype and data name.
+
+    Args:
+        spec(str): The panel spec, e.g. "Spectral Data:Mineral Percent:Talc".
+    """
+    try:
+        data_type, data_subtype, data_name = spec.split(SPEC_SEPARATOR, 2)
+    except ValueError:
+        raise ValueError(
+            f'Invalid panel "{spec}", expected "Data Type:Subtype:Name".'
+        )
+
+    if data_subtype in ["Composite Images", "Composite Plot"]:
+        data_name = data_name.split(MINERAL_SEPARATOR)
+
+    return data_type, data_subtype, data_name
+
+
+def run_batch_export(args: argparse.Namespace) -> int:
+    """Exports the requested panels for each dataset in parallel.
+
+    Args:
+        args(argparse.Namespace): Parsed export command arguments.
+
+    Returns:
+        int: The exit status, 1 if any panel could not be exported or 2 if
+            the panel specs are invalid.
+    """
+    try:
+        panel_specs = [parse_panel_spec(spec) for spec in args.panels]
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 2
+
+    hsu_config = HSUConfig(args.config)
+    dataset_names = args.datasets or hsu_config.datasets()
+    args.output_dir.mkdir(parents=True, exist_ok=True)
+
+    tasks = []
+    for dataset_name in dataset_names:
+        if not hsu_config[dataset_name]:
+            print(f"Unknown dataset {dataset_name}", file=sys.stderr)
+            continue
+        tasks.append(
+            (
+                dataset_name,
+                hsu_config.dataset_path(dataset_name),
+                panel_specs,
+                args.resolution,
+                args.meter,
+                args.output_dir.as_posix(),
+                args.strip_log_format,
+                args.vector_format,
+            )
+        )
+
+    failed = len(tasks) != len(dataset_names)
+
+    # Qt can't be safely forked so each worker process starts fresh
+    with ProcessPoolExecutor(
+        max_workers=args.workers,
+        mp_context=multiprocessing.get_context("spawn"),
+    ) as executor:
+        futures = {
+            executor.submit(export_dataset, *task): task[0] for task in tasks
+        }
+        for future in as_completed(futures):
+            try:
+                saved, errors = future.result()
+            except Exception as e:
+                saved, errors = [], [f"{futures[future]}: {e}"]
+            for path in saved:
+                print(path)
+            for error in errors:
+                print(error, file=sys.stderr)
+            failed = failed or bool(errors)
+
+    return int(failed)
+
+
+def export_dataset(
+    dataset_name: str,
+    dataset_path: str,
+    panel_specs: list,
+    resolution: float,
+    include_meter: bool,
+    output_dir: str,
+    strip_log_format: str = None,
+    vector_format: str = None,
+) -> tuple:
+    """Renders and saves the panel images for a single dataset.
+
+    Args:
+        dataset_name(str): The name of the dataset.
+        dataset_path(str): The path of the dataset's configuration file.
+        panel_specs(list): (data type, subtype, data name) of each panel.
+        resolution(float): The export resolution (px/m).
+        include_meter(bool): Whether to draw the meter beside each panel.
+        output_dir(str): The folder images are saved to.
+        strip_log_format(str): "png" or "pdf" to save all panels in a single
+            strip log, otherwise each panel is saved as its own image.
+        vector_format(str): "svg" or "pdf" to save plot panels as vector
+            graphics instead of pngs.
+
+    Returns:
+        tuple: The paths of saved images and a list of error messages.
+    """
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    app = QApplication.instance() or QApplication([])
+
+    dataset = Dataset(dataset_path)
+    legend = MineralLegend()
+
+    saved = []
+    errors = []
+    columns = []
+    widgets = []
+    for data_type, data_subtype, data_name in panel_specs:
+        dataset_args = {
+            "config": dataset,
+            "dataset_name": dataset_name,
+            "data_type": data_type,
+            "data_subtype": data_subtype,
+            "data_name": data_name,
+        }
+        try:
+            dataset.data(data_type, data_subtype, data_name)
+        except KeyError:
+            errors.append(
+                f"{dataset_name}: no {data_type} {data_subtype} {data_name}"
+            )
+            continue
+
+        legend.add_minerals(data_name)
+        # panels only need to load their data, the renderer draws it at the
+        # export resolution
+        panel = create_data_panel(
+            None, None, LOAD_RESOLUTION, legend.color(data_name), dataset_args
+        )
+        widgets.append(panel)
+
+        if strip_log_format:
+            header = DataHeader(
+                None, panel.width, dataset, None, **dataset_args
+            )
+            if data_subtype == "Composite Plot":
+                header.update_axis_limits(panel.axis_limits)
+            widgets.append(header)
+            columns.append((panel.renderer(), header.paint_header))
+            continue
+
+        renderers = [panel.renderer()]
+        if include_meter:
+            renderers.insert(0, MeterRenderer(renderers[-1].depth))
+
+        image_path = Path(output_dir).joinpath(panel_image_name(dataset_args))
+        try:
+            if vector_format and renderers[-1].vector:
+                image_path = image_path.with_suffix(f".{vector_format}")
+                export_vector(renderers, image_path, resolution)
+                paths = [image_path]
+            else:
+                paths = export_tiles(renderers, image_path, resolution)
+        except OSError as e:
+            errors.append(f"{dataset_name}: {e}")
+        else:
+            saved.extend(path.as_posix() for path in paths)
+
+    if columns:
+        if include_meter:
+            depth = max(renderer.depth for renderer, _ in columns)
+            columns.insert(0, (MeterRenderer(depth), None))
+        columns.append(
+            (LegendRenderer(dict(legend.colormap)), paint_legend_header)
+        )
+
+        strip_log_path = Path(output_dir).joinpath(
+            f"{dataset_name}_strip_log.{strip_log_format}"
+        )
+        try:
+            export_strip_log(columns, strip_log_path, resolution)
+        except OSError as e:
+            errors.append(f"{dataset_name}: {e}")
+        else:
+            saved.append(strip_log_path.as_posix())
+
+    for widget in widgets:
+        widget.deleteLater()
+    app.processEvents()
+
+    return saved, errors
@@ -2,7 +2,10 @@ import json
 from pathlib import Path
 
 import numpy as np
-from openpyxl import load_workbook
+
+from data.dataset import CACHE_DIR
+from data.image_manifest import build_manifest
+from data.image_stack import pack_image_stack
 
 
 """
@@ -72,6 +75,9 @@ class HSUConfig:
         dataset_config_path = dataset_path.joinpath(f"{dataset_name}.cfg")
 
         spec_images = self._get_spec_image_data(dataset_path.joinpath("Core"))
+        self._pack_mineral_images(
+            spec_images, dataset_path.joinpath(CACHE_DIR, "stacks")
+        )
         core_images = self._get_core_image_data(dataset_path.joinpath("Photo"))
 
         csv_files = list(dataset_path.glob("*_DATA.csv"))
@@ -170,6 +176,10 @@ class HSUConfig:
         return dataset_name
 
     def _get_geochem_data(self, geochem_path: str) -> dict:
+        # openpyxl is slow to import so it is only loaded when geochemistry
+        # data is added
+        from openpyxl import load_workbook
+
         wb = load_workbook(filename=geochem_path)
         ws = wb["Geochemistry"]
         col_headers = []
@@ -232,6 +242,7 @@ class HSUConfig:
                         meta_data = {
                             "name": name,
                             "path": path.as_posix(),
+                            "manifest": build_manifest(path),
                         }
 
                         if spec_im_dict.get(image_type):
@@ -241,12 +252,36 @@ class HSUConfig:
 
         return spec_im_dict
 
+    def _pack_mineral_images(self, spec_images: dict, stack_dir: Path) -> None:
+        """Packs the row images of each mineral into a memory mappable stack
+        and records the stack's path in the mineral's metadata.
+
+        Stacks are optional, minerals whose stack can't be written (e.g. the
+        dataset is read only or the disk is full) are loaded from their pngs.
+
+        Args:
+            spec_images(dict): Spectral image metadata by type and name.
+            stack_dir(Path): The directory the stacks are written to.
+        """
+        for meta_data in spec_images.get("Mineral", {}).values():
+            image_dir = Path(meta_data["path"])
+            stack_path = stack_dir.joinpath(f"{image_dir.name}.npy")
+            try:
+                pack_image_stack(image_dir, stack_path)
+            except OSError:
+                continue
+            meta_data["stack"] = stack_path.as_posix()
+
     def _get_core_image_data(self, dataset_path: Path) -> list:
         core_im_dict = {}
         if dataset_path.is_dir():
             for path in dataset_path.iterdir():
                 if path.is_dir():
-                    meta_data = {"name": path.name, "path": path.as_posix()}
+                    meta_data = {
+                        "name": path.name,
+                        "path": path.as_posix(),
+                        "manifest": build_manifest(path),
+                    }
                     core_im_dict[path.name] = {path.name: meta_data}
         return core_im_dict
 
@@ -0,0 +1,171 @@
+import os
+from collections import OrderedDict
+
+import numpy as np
+
+# set to the memory budget (MB) to change it without the --memory-budget
+# option
+BUDGET_ENV_VAR = "HSU_MEMORY_BUDGET"
+
+# memory budget (bytes) used when one isn't set
+DEFAULT_BUDGET = 2 * 1024**3
+
+# kinds of cached data, in the order their usage is listed in the drawer
+KINDS = ["Images", "Composites", "Plots", "Data"]
+
+
+def array_bytes(value) -> int:
+    """Returns the bytes held in memory by the NumPy arrays in a value, which
+    may be nested in lists, tuples and dicts.
+
+    Args:
+        value: An array, or a list, tuple or dict of them.
+    """
+    # memory mapped arrays are paged in and out by the os
+    if isinstance(value, np.memmap):
+        return 0
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, dict):
+        value = list(value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(array_bytes(item) for item in value)
+    return 0
+
+
+class MemoryBudget:
+    """Limits the memory used by the images and data cached by every panel.
+
+    Each owner (usually a panel) records the cost in bytes of each kind of
+    data it keeps along with a function that frees it. Entries are kept in
+    least recently used order, owners are moved to the end whenever they
+    record a cost or are used. Once the total cost of all entries is over
+    the budget, the least recently used entries are evicted until it fits.
+
+    Pinned owners, usually the panels in view, are never evicted, so the
+    budget can be exceeded by the data on screen.
+
+    The budget is only used from the gui thread, so entries are always
+    evicted on it.
+    """
+
+    def __init__(self, budget: int = DEFAULT_BUDGET) -> None:
+        """Initialize budget
+
+        Args:
+            budget(int): The maximum total cost (bytes) of all entries.
+        """
+        self.budget = budget
+        self._entries = OrderedDict()
+        self._pinned = []
+
+    @property
+    def used(self) -> int:
+        """The total cost (bytes) of all entries."""
+        return sum(cost for _, cost, _ in self._entries.values())
+
+    def set(self, owner, kind: str, cost: int, evict) -> None:
+        """Records the cost of a kind of data kept by an owner, evicting
+        other owners' entries if the budget is exceeded. Entries with no cost
+        are removed.
+
+        Args:
+            owner: The object keeping the data.
+            kind(str): The kind of data, one of KINDS.
+            cost(int): The memory (bytes) used by the data.
+            evict(function): Called without arguments to free the data.
+        """
+        key = (owner, kind)
+        self._entries.pop(key, None)
+        if cost <= 0:
+            return
+
+        self._entries[key] = (kind, cost, evict)
+        self.evict(keep=owner)
+
+    def touch(self, owner) -> None:
+        """Marks an owner's entries as the most recently used.
+
+        Args:
+            owner: The object keeping the data.
+        """
+        for key in [key for key in self._entries if key[0] is owner]:
+            self._entries.move_to_end(key)
+
+    def remove(self, owner, kind: str = None) -> None:
+        """Removes an owner's entries without evicting them, used once the
+        owner has freed or deleted the data itself. Owners removed without a
+        kind are also unpinned.
+
+        Args:
+            owner: The object keeping the data.
+            kind(str): The kind of data removed, defaults to every kind.
+        """
+        for key in [key for key in self._entries if key[0] is owner]:
+            if kind is None or key[1] == kind:
+                del self._entries[key]
+        if kind is None:
+            self._pinned = [
+                pinned for pinned in self._pinned if pinned is not owner
+            ]
+
+    def set_pinned(self, owners: list) -> None:
+        """Replaces the owners whose entries aren't evicted and marks them as
+        the most recently used. Entries of owners that are no longer pinned
+        are evicted if the budget is exceeded.
+
+        Args:
+            owners(list): The pinned owners, usually the panels in view.
+        """
+        self._pinned = list(owners)
+        for owner in self._pinned:
+            self.touch(owner)
+        self.evict()
+
+    def set_budget(self, budget: int) -> None:
+        """Changes the budget, evicting entries if they no longer fit.
+
+        Args:
+            budget(int): The maximum total cost (bytes) of all entries.
+        """
+        self.budget = budget
+        self.evict()
+
+    def evict(self, keep=None) -> None:
+        """Evicts the least recently used entries of owners that aren't
+        pinned until the total cost is within the budget.
+
+        Args:
+            keep: An owner whose entries aren't evicted, usually the one
+                that just recorded a cost.
+        """
+        for key in list(self._entries):
+            if self.used <= self.budget:
+                break
+            # evicting an entry can free others
+            if key not in self._entries or self._is_kept(key[0], keep):
+                continue
+            _, _, evict = self._entries.pop(key)
+            evict()
+
+    def _is_kept(self, owner, keep) -> bool:
+        """Returns True if an owner's entries can't be evicted."""
+        return owner is keep or any(pinned is owner for pinned in self._pinned)
+
+    def usage(self) -> dict:
+        """Returns the total cost (bytes) of each kind of data."""
+        usage = dict.fromkeys(KINDS, 0)
+        for kind, cost, _ in self._entries.values():
+            usage[kind] = usage.get(kind, 0) + cost
+        return usage
+
+
+def budget_from_env() -> int:
+    """Returns the budget (bytes) set by BUDGET_ENV_VAR, or the default."""
+    try:
+        return int(float(os.environ[BUDGET_ENV_VAR]) * 1024**2)
+    except (KeyError, ValueError):
+        return DEFAULT_BUDGET
+
+
+memory_budget = MemoryBudget(budget_from_env())
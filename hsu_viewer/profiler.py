@@ -0,0 +1,230 @@
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+# set to profile the app without the --profile option
+PROFILE_ENV_VAR = "HSU_PROFILE"
+
+# the oldest spans are dropped once this many have been recorded
+MAX_SPANS = 100000
+
+
+def thread_bytes_read() -> int | None:
+    """Returns the bytes read by the current thread, or by the whole process
+    where per thread counts aren't available. None if neither is.
+    """
+    try:
+        with open("/proc/thread-self/io", "r") as f:
+            for line in f:
+                if line.startswith("rchar:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+
+    if psutil is not None:
+        try:
+            return psutil.Process().io_counters().read_bytes
+        except (AttributeError, psutil.Error):
+            pass
+    return None
+
+
+def peak_rss() -> int | None:
+    """Returns the peak resident memory of the process in bytes, or None if
+    it can't be measured.
+    """
+    if resource is not None:
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # bytes on macOS, kilobytes elsewhere
+        return max_rss if sys.platform == "darwin" else max_rss * 1024
+    if psutil is not None:
+        memory_info = psutil.Process().memory_info()
+        return getattr(memory_info, "peak_wset", memory_info.rss)
+    return None
+
+
+class Profiler:
+    """Records the wall time, CPU time, bytes read and peak memory of jobs and
+    the phases within them.
+
+    Profiling is off unless enabled, in which case each Worker job and each
+    phase of loading a panel (parse, decode, composite, scale and widget
+    build) is recorded as a span. Spans can be summarised for display or
+    saved as a Chrome trace (chrome://tracing or https://ui.perfetto.dev).
+    """
+
+    def __init__(self, enabled: bool = False) -> None:
+        """Initialize profiler
+
+        Args:
+            enabled(bool): Whether spans are recorded.
+        """
+        self.enabled = enabled
+        self._spans = []
+        self._thread_names = {}
+        self._lock = threading.Lock()
+        self._start = time.perf_counter()
+
+    def span(self, name: str, category: str = "phase"):
+        """Returns a context manager that records the code it wraps.
+
+        Args:
+            name(str): The name of the job or phase.
+            category(str): "job" or "phase".
+        """
+        if not self.enabled:
+            return nullcontext()
+        return self._record(name, category)
+
+    def phase(self, name: str):
+        """Returns a decorator that records each call of a function as a
+        phase.
+
+        Args:
+            name(str): The name of the phase.
+        """
+
+        def decorator(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                with self.span(name):
+                    return fn(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+    @contextmanager
+    def _record(self, name: str, category: str):
+        start_bytes = thread_bytes_read()
+        start_cpu = time.thread_time()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - start
+            cpu = time.thread_time() - start_cpu
+            end_bytes = thread_bytes_read()
+            bytes_read = (
+                end_bytes - start_bytes
+                if start_bytes is not None and end_bytes is not None
+                else None
+            )
+            thread = threading.current_thread()
+            span = {
+                "name": name,
+                "category": category,
+                "start": start - self._start,
+                "wall": wall,
+                "cpu": cpu,
+                "bytes_read": bytes_read,
+                "peak_rss": peak_rss(),
+                "thread": thread.ident,
+            }
+            with self._lock:
+                self._thread_names[thread.ident] = thread.name
+                self._spans.append(span)
+                if len(self._spans) > MAX_SPANS:
+                    del self._spans[: len(self._spans) - MAX_SPANS]
+
+    def spans(self) -> list:
+        """Returns a copy of the recorded spans."""
+        with self._lock:
+            return list(self._spans)
+
+    def clear(self) -> None:
+        """Removes all recorded spans."""
+        with self._lock:
+            self._spans = []
+
+    def summary(self) -> list:
+        """Returns the totals of each job and phase, slowest first.
+
+        Each entry has the name, category, count, total wall and CPU time (s),
+        total bytes read and the highest peak RSS (bytes).
+        """
+        totals = {}
+        for span in self.spans():
+            key = (span["category"], span["name"])
+            total = totals.setdefault(
+                key,
+                {
+                    "name": span["name"],
+                    "category": span["category"],
+                    "count": 0,
+                    "wall": 0,
+                    "cpu": 0,
+                    "bytes_read": 0,
+                    "peak_rss": 0,
+                },
+            )
+            total["count"] = total["count"] + 1
+            total["wall"] = total["wall"] + span["wall"]
+            total["cpu"] = total["cpu"] + span["cpu"]
+            total["bytes_read"] = total["bytes_read"] + (
+                span["bytes_read"] or 0
+            )
+            total["peak_rss"] = max(total["peak_rss"], span["peak_rss"] or 0)
+        return sorted(totals.values(), key=lambda t: t["wall"], reverse=True)
+
+    def chrome_trace(self) -> dict:
+        """Returns the recorded spans in the Chrome trace event format."""
+        pid = os.getpid()
+        events = [
+            {
+                "name": span["name"],
+                "cat": span["category"],
+                "ph": "X",
+                "ts": span["start"] * 1e6,
+                "dur": span["wall"] * 1e6,
+                "pid": pid,
+                "tid": span["thread"],
+                "args": {
+                    "cpu_ms": span["cpu"] * 1000,
+                    "bytes_read": span["bytes_read"],
+                    "peak_rss": span["peak_rss"],
+                },
+            }
+            for span in self.spans()
+        ]
+        with self._lock:
+            thread_names = dict(self._thread_names)
+        events.extend(
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": pid,
+                "tid": tid,
+                "args": {"name": thread_name},
+            }
+            for tid, thread_name in thread_names.items()
+        )
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def save_chrome_trace(self, path: Path | str) -> None:
+        """Saves the recorded spans as a Chrome trace json file.
+
+        Args:
+            path(Path | str): The path of the json file.
+        """
+        with open(path, "w") as f:
+            json.dump(self.chrome_trace(), f)
+
+
+# shared by the app's components, enabled with --profile or HSU_PROFILE=1
+profiler = Profiler(enabled=bool(os.environ.get(PROFILE_ENV_VAR)))
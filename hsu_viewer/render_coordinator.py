@@ -0,0 +1,103 @@
+from PySide6.QtCore import QObject, QTimer, Signal
+
+# shortest time between two updates of the dashboard (ms), about one frame
+FRAME_INTERVAL = 16
+
+# time without zooming before panels are rendered at the new resolution (ms)
+SETTLE_INTERVAL = 150
+
+
+class RenderCoordinator(QObject):
+    """Merges bursts of zoom and resize requests so that only the latest
+    resolution and size are rendered.
+
+    Requests are collected and flushed at most once per frame, so any number
+    of zoom steps or resize events between two frames cause a single update.
+    Zoom previews and the meter follow every flush. Panels are only rendered
+    at the new resolution once zooming has stopped for SETTLE_INTERVAL.
+
+    Signals:
+        zoom_previewed(float): The latest resolution (px/m), at most once per
+            frame.
+        zoom_settled(float): The resolution (px/m) once zooming has stopped.
+        meter_changed(float, int): The latest max depth (m) and height of the
+            display area (px), at most once per frame.
+    """
+
+    zoom_previewed = Signal(float)
+    zoom_settled = Signal(float)
+    meter_changed = Signal(float, int)
+
+    def __init__(self, parent=None, resolution: float = 0) -> None:
+        """Initialize coordinator
+
+        Args:
+            parent(None/QObject): The parent object.
+            resolution(float): The resolution (px/m) currently displayed.
+        """
+        super().__init__(parent)
+
+        # latest requests and the values last sent
+        self._resolution = resolution
+        self._previewed_resolution = resolution
+        self._settled_resolution = resolution
+        self._meter = None
+        self._flushed_meter = None
+
+        self._frame_timer = QTimer(self)
+        self._frame_timer.setSingleShot(True)
+        self._frame_timer.setInterval(FRAME_INTERVAL)
+        self._frame_timer.timeout.connect(self.flush)
+
+        self._settle_timer = QTimer(self)
+        self._settle_timer.setSingleShot(True)
+        self._settle_timer.setInterval(SETTLE_INTERVAL)
+        self._settle_timer.timeout.connect(self._settle)
+
+    def request_zoom(self, resolution: float) -> None:
+        """Requests that the dashboard is displayed at a resolution.
+
+        Args:
+            resolution(float): The new resolution (px/m).
+        """
+        self._resolution = resolution
+        self._request_frame()
+        self._settle_timer.start()
+
+    def request_meter(self, depth: float, height: int) -> None:
+        """Requests that the meter is resized.
+
+        Args:
+            depth(float): The max depth (m) of the displayed data.
+            height(int): The height of the display area (px).
+        """
+        self._meter = (depth, height)
+        self._request_frame()
+
+    def _request_frame(self) -> None:
+        """Flushes the requests on the next frame. Requests made before then
+        are merged into the same flush.
+        """
+        if not self._frame_timer.isActive():
+            self._frame_timer.start()
+
+    def flush(self) -> None:
+        """Sends the latest requested resolution and meter size if they've
+        changed since they were last sent.
+        """
+        self._frame_timer.stop()
+        if self._resolution != self._previewed_resolution:
+            self._previewed_resolution = self._resolution
+            self.zoom_previewed.emit(self._resolution)
+        if self._meter is not None and self._meter != self._flushed_meter:
+            self._flushed_meter = self._meter
+            self.meter_changed.emit(*self._meter)
+
+    def _settle(self) -> None:
+        """Sends the resolution panels should be rendered at once zooming has
+        stopped.
+        """
+        self.flush()
+        if self._resolution != self._settled_resolution:
+            self._settled_resolution = self._resolution
+            self.zoom_settled.emit(self._resolution)
@@ -0,0 +1,124 @@
+from PySide6.QtCore import QObject, QThread, QThreadPool, QTimer, Slot
+from PySide6.QtWidgets import QWidget
+from shiboken6 import isValid
+
+from hsu_viewer.worker import Worker
+
+# resource class and base priority for each type of panel load. Higher
+# priorities are started first within a resource class.
+LOAD_COSTS = {
+    "plot": ("io", 2),
+    "image": ("io", 1),
+    "composite": ("cpu", 0),
+}
+
+# added to the base priority of panels inside the dashboard viewport
+VISIBLE_PRIORITY = 10
+
+
+class PanelScheduler(QObject):
+    """Schedules panel load jobs on bounded thread pools.
+
+    Jobs are split between a disk I/O pool and a CPU pool so that heavy
+    composites cannot starve image and plot loads. Within each pool, jobs for
+    panels in the viewport run first, followed by cheap plots and then image
+    composites. Each panel has at most one queued job; scheduling a new job
+    replaces any job that has not started yet.
+    """
+
+    def __init__(
+        self,
+        parent=None,
+        max_io_threads: int = 4,
+        max_cpu_threads: int = None,
+    ) -> None:
+        """Initialize scheduler
+
+        Args:
+            parent(None/QObject): The parent object.
+            max_io_threads(int): Maximum number of concurrent disk bound jobs.
+            max_cpu_threads(int): Maximum number of concurrent CPU bound jobs.
+                Defaults to one less than the number of available cores.
+        """
+        super().__init__(parent)
+
+        if max_cpu_threads is None:
+            max_cpu_threads = max(1, QThread.idealThreadCount() - 1)
+
+        self.pools = {"io": QThreadPool(self), "cpu": QThreadPool(self)}
+        self.pools["io"].setMaxThreadCount(max_io_threads)
+        self.pools["cpu"].setMaxThreadCount(max_cpu_threads)
+
+        self._pending = {}
+
+        # scroll events arrive in bursts, only reprioritise once they settle
+        self._reprioritise_timer = QTimer(self)
+        self._reprioritise_timer.setSingleShot(True)
+        self._reprioritise_timer.setInterval(100)
+        self._reprioritise_timer.timeout.connect(self.reprioritise)
+
+    def schedule(self, worker: Worker, panel: QWidget) -> None:
+        """Queues a panel's load job, replacing any job it has waiting.
+
+        Args:
+            worker(Worker): The job to run.
+            panel(QWidget): The panel that requested the job.
+        """
+        self.cancel(panel)
+        self._pending[panel] = worker
+        worker.signals.finished.connect(
+            lambda panel=panel, worker=worker: self._on_finished(panel, worker)
+        )
+        self._pool(panel).start(worker, self.priority(panel))
+
+    def cancel(self, panel: QWidget) -> bool:
+        """Removes a panel's job from the queue if it has not started.
+
+        Args:
+            panel(QWidget): The panel whose job will be cancelled.
+
+        Returns:
+            bool: True if a queued job was removed.
+        """
+        worker = self._pending.pop(panel, None)
+        if worker is None or not isValid(worker):
+            return False
+        return self._pool(panel).tryTake(worker)
+
+    def priority(self, panel: QWidget) -> int:
+        """Returns the queue priority for a panel's job.
+
+        Args:
+            panel(QWidget): The panel to prioritise.
+        """
+        _, priority = LOAD_COSTS[panel.load_cost]
+        if not panel.visibleRegion().isEmpty():
+            priority = priority + VISIBLE_PRIORITY
+        return priority
+
+    @Slot()
+    def request_reprioritise(self) -> None:
+        """Reprioritises queued jobs once the viewport stops moving."""
+        self._reprioritise_timer.start()
+
+    @Slot()
+    def reprioritise(self) -> None:
+        """Requeues jobs that have not started with their current priority."""
+        for panel, worker in list(self._pending.items()):
+            # finished jobs are deleted by their pool
+            if not isValid(worker):
+                self._pending.pop(panel)
+                continue
+            pool = self._pool(panel)
+            if pool.tryTake(worker):
+                pool.start(worker, self.priority(panel))
+
+    def _pool(self, panel: QWidget) -> QThreadPool:
+        """Returns the thread pool for a panel's resource class."""
+        resource, _ = LOAD_COSTS[panel.load_cost]
+        return self.pools[resource]
+
+    def _on_finished(self, panel: QWidget, worker: Worker) -> None:
+        """Forgets a job once it has completed."""
+        if self._pending.get(panel) is worker:
+            self._pending.pop(panel)
@@ -2,6 +2,8 @@ import sys
 import traceback
 from PySide6.QtCore import QObject, QRunnable, Signal, Slot
 
+from hsu_viewer.profiler import profiler
+
 
 class WorkerSignals(QObject):
     """
@@ -21,12 +23,16 @@ class WorkerSignals(QObject):
     progress
         int indicating % progress
 
+    partial_result
+        object data produced before processing is complete, anything
+
     """
 
     finished = Signal()
     error = Signal(tuple)
     result = Signal(object)
     progress = Signal(int)
+    partial_result = Signal(object)
 
 
 class Worker(QRunnable):
@@ -51,6 +57,8 @@ class Worker(QRunnable):
         self.args = args
         self.kwargs = kwargs
         self.signals = WorkerSignals()
+        # the job's name when profiling
+        self.name = getattr(fn, "__qualname__", repr(fn))
 
     @Slot()  # QtCore.Slot
     def run(self):
@@ -59,7 +67,8 @@ class Worker(QRunnable):
         """
         # Retrieve args/kwargs here; and fire processing using them
         try:
-            result = self.fn(*self.args, **self.kwargs)
+            with profiler.span(self.name, "job"):
+                result = self.fn(*self.args, **self.kwargs)
         except:
             traceback.print_exc()
             exctype, value = sys.exc_info()[:2]
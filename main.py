@@ -1,10 +1,45 @@
+import argparse
 import sys
 
 from PySide6.QtWidgets import QApplication
 
 from hsu_viewer import HSUViewer
+from hsu_viewer.batch_export import add_export_arguments, run_batch_export
+from hsu_viewer.memory_budget import memory_budget
+from hsu_viewer.profiler import profiler
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="CNA HSU Viewer")
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Record the time and memory used loading panels, shown in the "
+        "drawer and saved as a Chrome trace.",
+    )
+    parser.add_argument(
+        "--memory-budget",
+        type=int,
+        metavar="MB",
+        help="Memory used by the images and data cached by panels before the "
+        "least recently used are freed. Defaults to 2048 MB.",
+    )
+    subparsers = parser.add_subparsers(dest="command")
+    add_export_arguments(
+        subparsers.add_parser(
+            "export", help="Export panel images without opening a window."
+        )
+    )
+    args = parser.parse_args()
+
+    if args.profile:
+        profiler.enabled = True
+
+    if args.memory_budget:
+        memory_budget.set_budget(args.memory_budget * 1024**2)
+
+    if args.command == "export":
+        sys.exit(run_batch_export(args))
+
     app = QApplication(sys.argv)
     ex = HSUViewer()
     app.exec()